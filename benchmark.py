@@ -0,0 +1,381 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR
+from clustering import FEATURES
+from ingest import ALIASES, REGION_KEYS, aggregate_counts, build_pivot
+from store import KEY_COLUMN
+
+# =====================
+# BENCHMARK PER TAHAP PIPELINE
+# =====================
+# Setiap tahap diukur terpisah (median waktu beberapa ulangan + puncak memori)
+# pada data sintetis berskema BPS dengan beberapa ukuran (jumlah kelurahan,
+# masing-masing 18 periode; ukuran terkecil = 151 kelurahan Kota Bandung,
+# terbesar ~1 juta kelurahan-periode). Memori dicatat dua kali: puncak alokasi
+# Python (tracemalloc) dan puncak kenaikan RSS proses, yang juga melihat
+# alokasi di luar heap Python (Arrow/Parquet, buffer C). Hasil dibandingkan
+# dengan baseline tersimpan; tahap yang melambat / membengkak melewati
+# toleransi ditandai sebagai regresi (exit code 1).
+#
+#   python benchmark.py                      # bandingkan dengan baseline
+#   python benchmark.py --save-baseline      # simpan hasil sebagai baseline baru
+#   python benchmark.py --sizes 151 50000    # ukuran lain (jumlah kelurahan)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DATA_DIR = os.path.join(CACHE_DIR, "bench")
+
+# Jumlah kelurahan; 151 = beban nyata aplikasi, 55.556 x 18 periode = 1 juta kelurahan-periode
+DEFAULT_SIZES = [151, 1_000, 10_000, 55_556]
+LARGE_SIZE = 10_000     # ukuran di atas ini cukup diukur sekali
+TIME_TOLERANCE = 1.5    # median > 50% lebih lambat = regresi
+MEMORY_TOLERANCE = 1.25
+MIN_TIME_DELTA = 0.02   # abaikan selisih < 20 ms (derau)
+MIN_MEMORY_DELTA = 1_000_000
+MIN_RSS_DELTA = 5_000_000  # RSS berderau oleh allocator (halaman bebas tidak selalu dikembalikan)
+# Render matplotlib berderau besar (min..maks ulangan bisa 2,5x pada mesin yang
+# sama): tahap grafik baru dianggap regresi bila median > 2x dan > 100 ms
+FIGURE_PREFIX = "fig_"
+FIGURE_TIME_TOLERANCE = 2.0
+MIN_FIGURE_DELTA = 0.1
+
+
+# =====================
+# DATA UJI
+# =====================
+def synthetic_raw(n_kelurahan, seed=42):
+    """Path CSV sintetis untuk `n_kelurahan` kelurahan x 18 periode (dibuat sekali, lalu dipakai ulang)."""
+    from synthetic import generate
+
+    path = os.path.join(DATA_DIR, f"raw_{n_kelurahan}_{seed}.csv")
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        tmp = path + ".tmp"
+        generate(tmp, n_kelurahan, seed=seed)
+        os.replace(tmp, path)
+    return path
+
+
+def prepare(size):
+    """Input tiap tahap disiapkan di luar pengukuran."""
+    from storage import ensure_parquet
+
+    raw_path = synthetic_raw(size)
+    features_path = os.path.join(DATA_DIR, f"features_{os.path.basename(raw_path)}")
+    if not os.path.exists(features_path):
+        # Per kode BPS (nama kelurahan sintetis sengaja kembar); label = kode kelurahan
+        counts, _ = aggregate_counts(raw_path, keys=REGION_KEYS)
+        features = build_pivot(counts)[FEATURES]
+        features.index = pd.Index(features.index.get_level_values(-1).astype(str), name=KEY_COLUMN)
+        features.to_csv(features_path)
+    ensure_parquet(features_path)
+
+    # Hanya kolom yang dipakai tahap normalize_pivot: data terbesar ~10 juta baris
+    raw = pd.read_csv(
+        raw_path, usecols=list(REGION_KEYS) + ["jenis_pendidikan", "jumlah_penduduk"],
+        dtype={"jenis_pendidikan": "category"},
+    )
+    counts, _ = aggregate_counts(raw_path, keys=REGION_KEYS)
+    dfp = pd.read_csv(features_path, index_col=0)
+    df_eda = dfp.reset_index()
+
+    from sklearn.preprocessing import StandardScaler
+
+    return {
+        "raw": raw,
+        "counts": counts,
+        "features_path": features_path,
+        "dfp": dfp,
+        "df_eda": df_eda,
+        "X_scaled": StandardScaler().fit_transform(dfp[FEATURES]),
+    }
+
+
+# =====================
+# TAHAP-TAHAP
+# =====================
+def stage_load_data(ctx):
+    # Pemuatan pertama per proses seperti views.common.get_store: Parquet ->
+    # FeatureStore -> frame halaman. Loader dipanggil langsung, bukan load_data,
+    # yang bisa menjalankan ingest dan menulis ulang CSV di folder kerja.
+    from cache import file_hash
+    from storage import read_columns
+    from store import build_store
+
+    path = ctx["features_path"]
+    store = build_store(read_columns(path, [KEY_COLUMN] + FEATURES), FEATURES, file_hash(path))
+    store.flat_frame(), store.frame()
+
+
+def stage_load_data_warm(ctx):
+    # Setiap rerun berikutnya: hash file (diingat per mtime) + ambil store dari cache
+    from cache import file_hash
+    from views.common import get_store
+
+    path = ctx["features_path"]
+    store = get_store(tuple(FEATURES), file_hash(path), path)
+    store.flat_frame(), store.frame()
+
+
+def stage_normalize_pivot(ctx):
+    df = ctx["raw"].copy()
+    df["jenis_pendidikan"] = df["jenis_pendidikan"].replace(ALIASES)
+    df.pivot_table(
+        index=list(REGION_KEYS),
+        columns="jenis_pendidikan",
+        values="jumlah_penduduk",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,  # jenis_pendidikan kategorikal: tanpa ini hasilnya perkalian silang semua kode
+    )
+
+
+def stage_percentages(ctx):
+    build_pivot(ctx["counts"])
+
+
+def stage_scaler(ctx):
+    from sklearn.preprocessing import StandardScaler
+
+    StandardScaler().fit_transform(ctx["dfp"][FEATURES])
+
+
+def stage_kmeans_fit(ctx):
+    from sklearn.cluster import KMeans
+
+    KMeans(n_clusters=3, random_state=42, n_init=10).fit(ctx["X_scaled"])
+
+
+def stage_elbow(ctx):
+    from sklearn.cluster import KMeans
+
+    for k in range(2, 8):
+        KMeans(n_clusters=k, random_state=42, n_init=10).fit(ctx["X_scaled"])
+
+
+def _figure_stage(draw, *arg_names):
+    def stage(ctx):
+        from figures import render_png
+
+        args = [a(ctx) if callable(a) else a for a in arg_names]
+        render_png(draw, *args)
+    return stage
+
+
+def _eda_figure_stages():
+    import figures
+
+    eda = lambda ctx: ctx["df_eda"]  # noqa: E731
+    return {
+        "fig_top10_rendah": _figure_stage(figures.top10_line, eda, "rendah_pct", "Proporsi Pendidikan Rendah"),
+        "fig_top10_tinggi": _figure_stage(figures.top10_line, eda, "tinggi_pct", "Proporsi Pendidikan Tinggi"),
+        "fig_box_rendah_tinggi": _figure_stage(
+            figures.boxplot, eda, ["rendah_pct", "tinggi_pct"], ["Rendah", "Tinggi"]
+        ),
+        "fig_box_semua": _figure_stage(figures.boxplot, eda, FEATURES, ["Rendah", "Menengah", "Tinggi"]),
+        "fig_scatter": _figure_stage(
+            figures.scatter, lambda ctx: ctx["df_eda"]["rendah_pct"], lambda ctx: ctx["df_eda"]["tinggi_pct"]
+        ),
+        "fig_corr_heatmap": _figure_stage(figures.corr_heatmap, eda, FEATURES),
+    }
+
+
+def all_stages():
+    stages = {
+        "load_data": stage_load_data,
+        "load_data_warm": stage_load_data_warm,
+        "normalize_pivot": stage_normalize_pivot,
+        "percentages": stage_percentages,
+        "scaler": stage_scaler,
+        "kmeans_fit": stage_kmeans_fit,
+        "elbow_k2_7": stage_elbow,
+    }
+    stages.update(_eda_figure_stages())
+    return stages
+
+
+# =====================
+# PENGUKURAN
+# =====================
+def _proc_status_bytes(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    raise OSError(field)
+
+
+def release_memory():
+    """Mengembalikan memori bebas ke OS agar kenaikan RSS tahap berikutnya terlihat."""
+    gc.collect()
+    try:
+        import ctypes
+
+        ctypes.CDLL("libc.so.6").malloc_trim(0)  # glibc menahan halaman heap yang sudah bebas
+    except (OSError, AttributeError):
+        pass
+    import pyarrow as pa
+
+    pa.default_memory_pool().release_unused()
+
+
+def peak_rss_delta(stage, ctx):
+    """Puncak kenaikan RSS selama satu eksekusi tahap.
+
+    Linux: puncak RSS (VmHWM) di-reset lewat /proc/self/clear_refs sebelum tahap.
+    Selain itu: selisih ru_maxrss, yang hanya naik bila melewati puncak proses sebelumnya.
+    """
+    release_memory()
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        before = _proc_status_bytes("VmRSS")
+        stage(ctx)
+        return max(0, _proc_status_bytes("VmHWM") - before)
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: byte (macOS) / KiB
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stage(ctx)
+        return max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) * scale
+
+
+def measure(stage, ctx, repeat):
+    # Memori diukur di putaran terpisah: tracemalloc memperlambat eksekusi
+    peak_rss = peak_rss_delta(stage, ctx)
+    gc.collect()
+    tracemalloc.start()
+    stage(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stage(ctx)
+        times.append(time.perf_counter() - start)
+    return {
+        "seconds": float(np.median(times)),
+        "best_seconds": min(times),
+        "peak_bytes": int(peak),
+        "peak_rss_bytes": int(peak_rss),
+    }
+
+
+def run(sizes, stages=None, repeat=9):
+    stage_funcs = all_stages()
+    if stages:
+        stage_funcs = {name: stage_funcs[name] for name in stages}
+
+    results = {}
+    for i, size in enumerate(sizes):
+        ctx = prepare(size)
+        if i == 0:
+            # Pemanasan sekali (import, thread pool BLAS/OpenMP, cache font
+            # matplotlib) agar biaya awal tidak tercatat pada tahap pertama
+            for stage in stage_funcs.values():
+                stage(ctx)
+        # Data besar cukup diukur sekali
+        n_repeat = repeat if size <= LARGE_SIZE else 1
+        results[str(size)] = {}
+        for name, stage in stage_funcs.items():
+            results[str(size)][name] = measure(stage, ctx, n_repeat)
+            r = results[str(size)][name]
+            print(
+                f"{size:>9,}  {name:<24} {r['seconds'] * 1000:10.1f} ms "
+                f"{r['peak_bytes'] / 1e6:10.1f} MB {r['peak_rss_bytes'] / 1e6:10.1f} MB RSS"
+            )
+    return results
+
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Daftar regresi terhadap baseline untuk pasangan (ukuran, tahap) yang ada di keduanya."""
+    regressions = []
+    for size, stages in results.items():
+        for name, now in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            tolerance, min_delta = time_tolerance, MIN_TIME_DELTA
+            if name.startswith(FIGURE_PREFIX):
+                tolerance = max(time_tolerance, FIGURE_TIME_TOLERANCE)
+                min_delta = MIN_FIGURE_DELTA
+            if (now["seconds"] > before["seconds"] * tolerance
+                    and now["seconds"] - before["seconds"] > min_delta):
+                regressions.append(
+                    f"{size} {name}: waktu {before['seconds'] * 1000:.1f} -> {now['seconds'] * 1000:.1f} ms"
+                )
+            for field, label, floor in (
+                ("peak_bytes", "memori", MIN_MEMORY_DELTA),
+                ("peak_rss_bytes", "RSS", MIN_RSS_DELTA),
+            ):
+                if field not in before:
+                    continue
+                if now[field] > before[field] * memory_tolerance and now[field] - before[field] > floor:
+                    regressions.append(
+                        f"{size} {name}: {label} {before[field] / 1e6:.1f} -> {now[field] / 1e6:.1f} MB"
+                    )
+    return regressions
+
+
+def environment():
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tiap tahap pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="ukuran data dalam jumlah kelurahan")
+    parser.add_argument("--stages", nargs="+", help="hanya tahap tertentu")
+    parser.add_argument("--repeat", type=int, default=9, help="ulangan per tahap (median)")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", help="simpan hasil mentah ke file JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.stages, args.repeat)
+    report = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline disimpan ke {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("\nBelum ada baseline; jalankan dengan --save-baseline.")
+        sys.exit(0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if baseline.get("environment") != report["environment"]:
+        print("\nCatatan: lingkungan berbeda dari baseline, perbandingan hanya indikatif.")
+    for line in regressions:
+        print(f"REGRESI: {line}")
+    print(f"\n{len(regressions)} regresi terdeteksi.")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+# =====================
+# LOKASI CACHE
+# =====================
+# Semua hasil komputasi yang mahal disimpan di folder ini agar bisa dipakai
+# bersama oleh beberapa proses Streamlit dan tetap ada setelah restart.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("TUBES_CACHE_DIR", os.path.join(BASE_DIR, ".cache"))
+
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+
+def file_hash(path):
+    """Hash SHA-256 isi file, diingat per (mtime, size) agar tidak dihitung ulang tiap rerun."""
+    st_ = os.stat(path)
+    memo_key = (os.path.abspath(path), st_.st_mtime_ns, st_.st_size)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+
+    with _hash_lock:
+        _hash_memo[memo_key] = digest
+    return digest
+
+
+def frame_hash(df):
+    """Hash isi DataFrame (index + nilai), dipakai bila file sumber tidak tersedia."""
+    import pandas as pd
+
+    values = pd.util.hash_pandas_object(df, index=True).values
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+def make_key(*parts):
+    """Menggabungkan beberapa komponen (versi data, parameter, dll.) menjadi satu kunci cache."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class DiskCache:
+    """Cache dua lapis: dictionary di memori proses dan file pickle di disk.
+
+    Penulisan ke disk bersifat atomik (tulis ke file sementara lalu `os.replace`),
+    sehingga beberapa worker yang menghitung kunci yang sama tidak saling merusak.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.directory = os.path.join(CACHE_DIR, namespace)
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+
+        try:
+            with open(self._path(key), "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+
+        with self._lock:
+            self._memory[key] = value
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Disk penuh / read-only: cache memori tetap berlaku
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
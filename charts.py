@@ -0,0 +1,131 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# =====================
+# GRAFIK SISI KLIEN (VEGA-LITE)
+# =====================
+# Server hanya mengirim tabel kecil (Streamlit mengirim DataFrame sebagai
+# Arrow, kolom per kolom) + spesifikasi Vega-Lite; browser yang menggambar.
+# Di atas MAX_POINTS titik, data direduksi lebih dulu sehingga ukuran payload
+# dan CPU server tetap terbatas berapa pun jumlah kelurahannya:
+#   - "sample": sampling berstrata per sel grid. Sel padat ditipiskan, sel
+#     jarang (termasuk titik ekstrem) tetap utuh, sehingga bentuk sebaran terjaga.
+#   - "bin": agregasi ke grid 2D (jumlah titik per sel + klaster dominan).
+MAX_POINTS = int(os.environ.get("TUBES_CHART_MAX_POINTS", "5000"))
+
+
+def grid_size(max_points, fill=0.5):
+    """Grid persegi dengan paling banyak fill * max_points sel, agar batas titik selalu terpenuhi."""
+    return max(int(np.sqrt(max_points * fill)), 1)
+
+
+def _cells(x, y, grid):
+    """Nomor sel grid (grid x grid) untuk tiap titik, dalam rentang data."""
+    def axis(v):
+        lo, hi = np.nanmin(v), np.nanmax(v)
+        span = hi - lo if hi > lo else 1.0
+        return np.clip(((v - lo) / span * grid).astype(np.int64), 0, grid - 1)
+    return axis(x) * grid + axis(y)
+
+
+def stratified_sample(x, y, max_points=MAX_POINTS, seed=0):
+    """Indeks titik terpilih: paling banyak `q` titik per sel, q sebesar mungkin agar total <= max_points."""
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    grid = grid_size(max_points)
+    cells = _cells(x, y, grid)
+    counts = np.bincount(cells, minlength=grid * grid)
+    occupied = np.sort(counts[counts > 0])
+
+    # total(q) = sum(min(count, q)) monoton naik -> cari q terbesar yang muat
+    lo, hi = 1, int(occupied[-1])
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if np.minimum(occupied, mid).sum() <= max_points:
+            lo = mid
+        else:
+            hi = mid - 1
+    quota = lo
+
+    # Peringkat acak tiap titik di dalam selnya (satu sort, tanpa loop per sel)
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n), cells))
+    sorted_cells = cells[order]
+    first = np.searchsorted(sorted_cells, sorted_cells, side="left")
+    rank = np.arange(n) - first
+    return np.sort(order[rank < quota])
+
+
+def binned(x, y, c=None, max_points=MAX_POINTS):
+    """Agregasi grid 2D: pusat sel, jumlah titik, dan klaster terbanyak (bila ada)."""
+    grid = grid_size(max_points, fill=1.0)
+    cells = _cells(x, y, grid)
+    counts = np.bincount(cells, minlength=grid * grid)
+    keep = np.flatnonzero(counts)
+
+    x_lo, x_hi = np.nanmin(x), np.nanmax(x)
+    y_lo, y_hi = np.nanmin(y), np.nanmax(y)
+    x_step = (x_hi - x_lo) / grid if x_hi > x_lo else 1.0 / grid
+    y_step = (y_hi - y_lo) / grid if y_hi > y_lo else 1.0 / grid
+
+    out = pd.DataFrame({
+        "x": x_lo + (keep // grid + 0.5) * x_step,
+        "y": y_lo + (keep % grid + 0.5) * y_step,
+        "jumlah": counts[keep],
+    })
+    if c is not None:
+        labels, codes = np.unique(np.asarray(c), return_inverse=True)
+        per_label = np.zeros((grid * grid, len(labels)), dtype=np.int64)
+        np.add.at(per_label, (cells, codes), 1)
+        out["klaster"] = labels[per_label[keep].argmax(axis=1)].astype(str)
+    return out
+
+
+def scatter_chart(x, y, c=None, labels=None, x_title="Proporsi Pendidikan Rendah",
+                  y_title="Proporsi Pendidikan Tinggi", mode="sample", max_points=MAX_POINTS):
+    """(data, spec Vega-Lite, info) untuk scatter x-y; data sudah direduksi bila perlu."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    info = {"n": n, "mode": "semua titik"}
+
+    if n > max_points and mode == "bin":
+        data = binned(x, y, c, max_points)
+        info.update(mode="agregasi grid", ditampilkan=len(data))
+        encoding = {
+            "x": {"field": "x", "type": "quantitative", "title": x_title, "scale": {"zero": False}},
+            "y": {"field": "y", "type": "quantitative", "title": y_title, "scale": {"zero": False}},
+            "opacity": {"field": "jumlah", "type": "quantitative", "scale": {"type": "log"}, "legend": None},
+            "tooltip": [{"field": "jumlah", "type": "quantitative", "title": "Jumlah kelurahan"}],
+        }
+        if c is not None:
+            encoding["color"] = {"field": "klaster", "type": "nominal", "title": "Klaster"}
+            encoding["tooltip"].append({"field": "klaster", "type": "nominal", "title": "Klaster dominan"})
+        return data, {"mark": {"type": "square", "size": 40}, "encoding": encoding}, info
+
+    idx = stratified_sample(x, y, max_points)
+    if len(idx) < n:
+        info.update(mode="sampling berstrata", ditampilkan=len(idx))
+
+    data = pd.DataFrame({"x": x[idx], "y": y[idx]})
+    tooltip = [
+        {"field": "x", "type": "quantitative", "title": x_title, "format": ".3f"},
+        {"field": "y", "type": "quantitative", "title": y_title, "format": ".3f"},
+    ]
+    encoding = {
+        "x": {"field": "x", "type": "quantitative", "title": x_title, "scale": {"zero": False}},
+        "y": {"field": "y", "type": "quantitative", "title": y_title, "scale": {"zero": False}},
+        "tooltip": tooltip,
+    }
+    if labels is not None:
+        data["kelurahan"] = np.asarray(labels, dtype=object)[idx]
+        tooltip.insert(0, {"field": "kelurahan", "type": "nominal", "title": "Kelurahan"})
+    if c is not None:
+        data["klaster"] = np.asarray(c)[idx].astype(str)
+        encoding["color"] = {"field": "klaster", "type": "nominal", "title": "Klaster"}
+        tooltip.append({"field": "klaster", "type": "nominal", "title": "Klaster"})
+    return data, {"mark": {"type": "circle", "opacity": 0.7}, "encoding": encoding}, info
@@ -0,0 +1,255 @@
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache import file_hash, frame_hash, make_key
+from tracing import traced
+
+FEATURES = ["rendah_pct", "menengah_pct", "tinggi_pct"]
+DATASET_PATH = "dataset_final.csv"
+FROZEN_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frozen_model.json")
+
+# Makna tiap klaster (dipakai panel "Cek Klaster", pencarian massal, dsb.)
+CLUSTER_INFO = {
+    0: {
+        "nama": "Ketimpangan Rendah",
+        "karakteristik": "Struktur pendidikan relatif seimbang dengan proporsi pendidikan tinggi yang cukup baik.",
+        "rekomendasi": "Pertahankan kualitas pendidikan dan perkuat keberlanjutan akses ke pendidikan tinggi.",
+    },
+    1: {
+        "nama": "Ketimpangan Menengah",
+        "karakteristik": "Didominasi pendidikan menengah dan berada pada fase transisi menuju pendidikan tinggi.",
+        "rekomendasi": "Dorong peningkatan akses ke pendidikan tinggi dan penguatan pendidikan vokasi.",
+    },
+    2: {
+        "nama": "Ketimpangan Tinggi",
+        "karakteristik": "Proporsi pendidikan rendah masih dominan dan pendidikan tinggi relatif rendah.",
+        "rekomendasi": "Prioritaskan penguatan pendidikan dasar dan menengah serta pencegahan putus sekolah.",
+    },
+}
+
+
+def data_version(dfp, path=DATASET_PATH):
+    """Versi data = hash isi `dataset_final.csv` (atau isi frame bila file tidak ada)."""
+    if os.path.exists(path):
+        return file_hash(path)
+    return frame_hash(dfp[FEATURES])
+
+
+def fit_kmeans(X, n_clusters=3, random_state=42, n_init=10):
+    from stats import StreamingStats
+
+    # Parameter scaler dibaca dari statistik streaming (mean & varians satu lintasan)
+    scaler = StreamingStats.from_frame(X, X.columns).to_scaler()
+    return fit_scaled(scaler.transform(X), scaler, n_clusters, random_state, n_init)
+
+
+@traced("kmeans_fit")
+def fit_scaled(X_scaled, scaler, n_clusters=3, random_state=42, n_init=10):
+    """K-Means pada fitur yang sudah distandardisasi oleh `scaler`."""
+    from sklearn.cluster import KMeans
+
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=n_init)
+    labels = kmeans.fit_predict(X_scaled)
+
+    # Nomor klaster mengikuti urutan semantik, bukan urutan acak hasil K-Means
+    order = order_centroids(kmeans.cluster_centers_, scaler)
+    relabel = np.empty_like(order)
+    relabel[order] = np.arange(len(order))
+
+    return {
+        "scaler": scaler,
+        "centroids": kmeans.cluster_centers_[order],
+        "labels": relabel[labels],
+        "inertia": float(kmeans.inertia_),
+        "n_clusters": n_clusters,
+    }
+
+
+def order_centroids(centroids_scaled, scaler):
+    """Urutan centroid: rendah_pct naik, lalu tinggi_pct turun.
+
+    Klaster 0 selalu yang proporsi pendidikan rendahnya paling kecil, sehingga
+    CLUSTER_INFO (0 = Ketimpangan Rendah ... 2 = Ketimpangan Tinggi) tetap
+    berlaku setelah fit ulang.
+    """
+    raw = scaler.inverse_transform(centroids_scaled)
+    rendah = raw[:, FEATURES.index("rendah_pct")]
+    tinggi = raw[:, FEATURES.index("tinggi_pct")]
+    return np.lexsort((-tinggi, rendah))
+
+
+def get_model(X, n_clusters=3, random_state=42, n_init=10):
+    """Scaler + K-Means yang sudah di-fit, dibaca dari tahap "model" pipeline.
+
+    X diberikan sebagai tahap "dataset", sehingga kunci cache = hash isi X +
+    parameter; n_clusters lain hanya menghitung ulang tahap model ke hilir.
+    """
+    import pipeline
+
+    return pipeline.run(
+        "model", given={"dataset": X},
+        n_clusters=n_clusters, random_state=random_state, n_init=n_init,
+    )
+
+
+# =====================
+# MODEL BEKU (CENTROID TETAP)
+# =====================
+# Centroid + parameter scaler disimpan sekali ke FROZEN_MODEL_PATH (JSON, tanpa
+# objek sklearn). Data baru (semester / kelurahan baru) cukup ditugaskan ke
+# centroid terdekat; fit ulang hanya lewat refit() secara eksplisit.
+def freeze(model, version, features=FEATURES):
+    scaler = model["scaler"]
+    return {
+        "features": list(features),
+        "mean": np.asarray(scaler.mean_, dtype=float),
+        "scale": np.asarray(scaler.scale_, dtype=float),
+        "centroids": np.asarray(model["centroids"], dtype=float),
+        "n_clusters": int(model["n_clusters"]),
+        "version": version,
+        "fitted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save_frozen(frozen, path=FROZEN_MODEL_PATH):
+    payload = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in frozen.items()}
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_frozen(path=FROZEN_MODEL_PATH):
+    with open(path) as f:
+        frozen = json.load(f)
+    for name in ("mean", "scale", "centroids"):
+        frozen[name] = np.asarray(frozen[name], dtype=float)
+    return frozen
+
+
+def transform(frozen, X):
+    """Standardisasi dengan parameter scaler yang dibekukan."""
+    return (np.asarray(X[frozen["features"]], dtype=float) - frozen["mean"]) / frozen["scale"]
+
+
+def scaler_digest(mean, scale):
+    """Hash parameter standardisasi; wajib ikut kunci cache hasil yang dihitung dari X_scaled."""
+    return make_key(
+        "scaler",
+        np.asarray(mean, dtype=float).tobytes(),
+        np.asarray(scale, dtype=float).tobytes(),
+    )
+
+
+def predict(frozen, X):
+    """Penugasan ke centroid terdekat untuk semua baris sekaligus (tanpa fit)."""
+    X_scaled = transform(frozen, X)
+    dist = ((X_scaled[:, None, :] - frozen["centroids"][None, :, :]) ** 2).sum(axis=2)
+    return dist.argmin(axis=1)
+
+
+def get_frozen(X, version, n_clusters=3, random_state=42, n_init=10, path=FROZEN_MODEL_PATH):
+    """Model beku dari file; bila belum ada, di-fit sekali lalu disimpan.
+
+    Jumlah klaster lain dari yang tersimpan tidak menimpa file (model sementara).
+    """
+    if path and os.path.exists(path):
+        frozen = load_frozen(path)
+        if frozen["n_clusters"] == n_clusters and frozen["features"] == list(X.columns):
+            return frozen
+
+    frozen = freeze(get_model(X, n_clusters, random_state, n_init), version, X.columns)
+    if path and not os.path.exists(path):
+        save_frozen(frozen, path)
+    return frozen
+
+
+def refit(path=DATASET_PATH, n_clusters=3, random_state=42, n_init=10, frozen_path=FROZEN_MODEL_PATH):
+    """Fit ulang eksplisit pada data terkini; melaporkan kelurahan yang berpindah klaster."""
+    dfp = load_features(path)
+    X = dfp[FEATURES]
+    version = data_version(dfp, path)
+    model = get_model(X, min(n_clusters, len(dfp)), random_state, n_init)
+    frozen = freeze(model, version)
+
+    changes = pd.DataFrame(index=dfp.index)
+    changes["sesudah"] = model["labels"]
+    if os.path.exists(frozen_path):
+        old = load_frozen(frozen_path)
+        changes["sebelum"] = predict(old, X) if old["features"] == FEATURES else -1
+    else:
+        changes["sebelum"] = changes["sesudah"]
+    changed = changes[changes["sebelum"] != changes["sesudah"]][["sebelum", "sesudah"]]
+
+    save_frozen(frozen, frozen_path)
+    return {"frozen": frozen, "changed": changed, "n_changed": len(changed)}
+
+
+# =====================
+# ENGINE TANPA UI: LOAD -> SCALE -> FIT -> SUMMARIZE
+# =====================
+def load_features(path=DATASET_PATH):
+    """Fitur per kelurahan (index = nama kelurahan) dari salinan Parquet dataset final."""
+    from storage import read_columns
+
+    return read_columns(path, ["bps_desa_kelurahan"] + FEATURES).set_index("bps_desa_kelurahan")
+
+
+def summarize(dfp, labels):
+    """Rata-rata fitur dan jumlah kelurahan per klaster."""
+    summary = dfp[FEATURES].groupby(labels).mean()
+    summary.index.name = "cluster"
+    summary["jumlah_kelurahan"] = dfp.groupby(labels).size()
+    summary["nama"] = summary.index.map(lambda c: CLUSTER_INFO.get(c, {}).get("nama"))
+    return summary
+
+
+def run(path=DATASET_PATH, n_clusters=3, random_state=42, n_init=10, frozen_path=FROZEN_MODEL_PATH):
+    """Seluruh alur clustering halaman K-Means, tanpa Streamlit.
+
+    Penugasan memakai model beku (predict saja); fit hanya terjadi bila model
+    beku belum ada atau jumlah klasternya berbeda.
+    """
+    dfp = load_features(path)
+    n_clusters = min(n_clusters, len(dfp))
+    version = data_version(dfp, path)
+    model = get_frozen(dfp[FEATURES], version, n_clusters, random_state, n_init, frozen_path)
+    labels = predict(model, dfp[FEATURES])
+
+    assignments = dfp[FEATURES].copy()
+    assignments["cluster"] = labels
+    assignments["nama_klaster"] = assignments["cluster"].map(
+        lambda c: CLUSTER_INFO.get(c, {}).get("nama")
+    )
+    assignments["rekomendasi"] = assignments["cluster"].map(
+        lambda c: CLUSTER_INFO.get(c, {}).get("rekomendasi")
+    )
+
+    return {
+        "version": version,
+        "model": model,
+        "assignments": assignments,
+        "summary": summarize(dfp, labels),
+    }
+
+
+def save_result(result, path):
+    """Menyimpan model + penugasan klaster sebagai satu artefak pickle (dipakai serve.py)."""
+    import pickle
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_result(path):
+    import pickle
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,173 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from ingest import LEVEL_GROUPS, LEVELS, PCT_COLUMNS, RAW_PATH, normalize_jenis
+from tracing import traced
+
+# =====================
+# DATA CUBE KELURAHAN x PERIODE x JENJANG
+# =====================
+# counts[k, p, l] = jumlah penduduk kelurahan k, periode p (tahun, semester),
+# jenjang l (10 jenjang yang sudah dinormalisasi). Semua irisan (per tahun,
+# per semester, jendela bergulir, roll-up rendah/menengah/tinggi) cukup berupa
+# reduksi NumPy, tanpa groupby ulang di tabel panjang.
+#
+# Satu baris sumbu 0 = satu pasangan (bps_kode_kecamatan, bps_kode_desa_kelurahan),
+# bukan nama kelurahan: di data BPS sebuah kode/nama kelurahan bisa tercatat di
+# dua kecamatan (mis. SINDANG JAYA di ARCAMANIK dan MANDALAJATI, 2017-2021), dan
+# penduduknya harus tetap dihitung di kecamatan masing-masing.
+CUBE_VERSION = 2  # naikkan bila susunan cube berubah (ikut kunci cache turunan)
+
+_cube_cache = DiskCache("cube")
+
+CUBE_COLUMNS = [
+    "bps_kode_kecamatan",
+    "bps_kode_desa_kelurahan",
+    "bps_desa_kelurahan",
+    "bps_nama_kecamatan",
+    "tahun",
+    "semester",
+    "jenis_pendidikan",
+    "jumlah_penduduk",
+]
+
+GROUPS = list(LEVEL_GROUPS)
+
+# Matriks (jenjang x kelompok) untuk roll-up rendah / menengah / tinggi
+GROUP_MATRIX = np.array(
+    [[lvl in LEVEL_GROUPS[g] for g in GROUPS] for lvl in LEVELS],
+    dtype=np.int64,
+)
+
+
+@dataclass
+class DataCube:
+    counts: np.ndarray        # (kelurahan, periode, jenjang), int64
+    kelurahan: np.ndarray     # label unik sumbu 0 (lihat unit_labels)
+    kecamatan: np.ndarray     # kecamatan tiap kelurahan (sejajar sumbu 0)
+    periods: np.ndarray       # (n_periode, 2): kolom tahun, semester
+    levels: list = field(default_factory=lambda: list(LEVELS))
+    codes: np.ndarray = None  # (kelurahan, 2): bps_kode_kecamatan, bps_kode_desa_kelurahan
+
+    def __post_init__(self):
+        self.kel_index = {name: i for i, name in enumerate(self.kelurahan)}
+        self.period_index = {(int(t), int(s)): i for i, (t, s) in enumerate(self.periods)}
+        self.present = self.counts.sum(axis=2) > 0
+
+    # -------- pemilihan periode --------
+    def period_mask(self, tahun=None, semester=None):
+        mask = np.ones(len(self.periods), dtype=bool)
+        if tahun is not None:
+            mask &= np.isin(self.periods[:, 0], np.atleast_1d(tahun))
+        if semester is not None:
+            mask &= np.isin(self.periods[:, 1], np.atleast_1d(semester))
+        return mask
+
+    def period_labels(self):
+        return [f"{t}-S{s}" for t, s in self.periods]
+
+    # -------- reduksi --------
+    def total(self, tahun=None, semester=None):
+        """Jumlah per (kelurahan, jenjang) untuk periode terpilih."""
+        mask = self.period_mask(tahun, semester)
+        return self.counts[:, mask, :].sum(axis=1)
+
+    def rolling(self, window):
+        """Jumlah bergulir sepanjang `window` periode: (kelurahan, n_periode - window + 1, jenjang)."""
+        csum = np.cumsum(self.counts, axis=1)
+        csum = np.concatenate([np.zeros_like(csum[:, :1, :]), csum], axis=1)
+        return csum[:, window:, :] - csum[:, :-window, :]
+
+    @staticmethod
+    def rollup(counts):
+        """Sumbu jenjang terakhir (10) -> rendah / menengah / tinggi (3)."""
+        return counts @ GROUP_MATRIX
+
+    @staticmethod
+    def shares(counts):
+        """Proporsi per sumbu terakhir; baris tanpa penduduk menghasilkan NaN."""
+        counts = np.asarray(counts, dtype=np.float64)
+        total = counts.sum(axis=-1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return counts / total
+
+    def pct_frame(self, tahun=None, semester=None):
+        """Setara `dataset_final.csv`, tetapi untuk periode terpilih."""
+        pct = self.shares(self.rollup(self.total(tahun, semester)))
+        df = pd.DataFrame(pct, index=pd.Index(self.kelurahan, name="bps_desa_kelurahan"),
+                          columns=[PCT_COLUMNS[g] for g in GROUPS])
+        return df.dropna()
+
+
+def unit_labels(names, kecamatan, kode_kecamatan, kode_kelurahan):
+    """Label unik per unit (kecamatan, kelurahan).
+
+    Nama kelurahan dipakai apa adanya. Bila satu nama dimiliki beberapa unit,
+    unit yang kode kelurahannya bukan turunan kode kecamatannya (kode BPS
+    kelurahan = kode kecamatan + 3 digit) diberi akhiran "(KECAMATAN)"; bila
+    masih kembar, semua unit bernama sama diberi akhiran.
+    """
+    labels = pd.Series(np.asarray(names, dtype=object))
+    suffixed = labels + " (" + pd.Series(np.asarray(kecamatan, dtype=object)) + ")"
+    foreign = np.asarray(kode_kelurahan) // 1000 != np.asarray(kode_kecamatan)
+    labels = labels.where(~(labels.duplicated(keep=False) & foreign), suffixed)
+    labels = labels.where(~labels.duplicated(keep=False), suffixed)
+    return labels.to_numpy(dtype=object)
+
+
+@traced("build_cube")
+def build_cube(raw_path=RAW_PATH):
+    from storage import read_columns
+
+    df = read_columns(raw_path, CUBE_COLUMNS, raw=True)
+    jenis = normalize_jenis(df["jenis_pendidikan"])
+
+    # Unit = pasangan kode (kecamatan, kelurahan)
+    unit_codes = df.groupby(
+        ["bps_kode_kecamatan", "bps_kode_desa_kelurahan"], sort=True, observed=True
+    ).ngroup().to_numpy()
+    units = df.groupby(unit_codes, sort=True).agg(
+        kode_kecamatan=("bps_kode_kecamatan", "first"),
+        kode_kelurahan=("bps_kode_desa_kelurahan", "first"),
+        kelurahan=("bps_desa_kelurahan", "first"),
+        kecamatan=("bps_nama_kecamatan", "first"),
+    )
+    labels = unit_labels(units["kelurahan"].astype(str), units["kecamatan"].astype(str),
+                         units["kode_kecamatan"], units["kode_kelurahan"])
+
+    # Sumbu 0 diurutkan menurut label (seperti urutan nama kelurahan sebelumnya)
+    order = np.argsort(labels, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    kel_codes = rank[unit_codes]
+    kel_labels = labels[order]
+
+    period_key = df["tahun"].to_numpy(np.int32) * 10 + df["semester"].to_numpy(np.int32)
+    period_values, period_codes = np.unique(period_key, return_inverse=True)
+    periods = np.column_stack([period_values // 10, period_values % 10])
+
+    level_codes = jenis.cat.set_categories(LEVELS).cat.codes.to_numpy()
+    valid = level_codes >= 0  # jenjang di luar 10 jenjang baku diabaikan
+
+    shape = (len(kel_labels), len(periods), len(LEVELS))
+    flat = np.ravel_multi_index(
+        (kel_codes[valid], period_codes[valid], level_codes[valid]), shape
+    )
+    counts = np.bincount(
+        flat,
+        weights=df["jumlah_penduduk"].to_numpy(np.float64)[valid],
+        minlength=int(np.prod(shape)),
+    ).round().astype(np.int64).reshape(shape)
+
+    kecamatan = units["kecamatan"].astype(str).to_numpy(dtype=object)[order]
+    codes = units[["kode_kecamatan", "kode_kelurahan"]].to_numpy(np.int64)[order]
+    return DataCube(counts, kel_labels, kecamatan, periods, codes=codes)
+
+
+def get_cube(raw_path=RAW_PATH):
+    """Cube dibangun sekali per versi data mentah lalu diambil dari cache."""
+    key = make_key(file_hash(raw_path), "cube", CUBE_VERSION, LEVELS)
+    return _cube_cache.get_or_compute(key, lambda: build_cube(raw_path))
@@ -0,0 +1,228 @@
+import html
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from cache import BASE_DIR, make_key
+from clustering import CLUSTER_INFO, FEATURES
+
+# =====================
+# EKSPOR LAPORAN SEMUA KELURAHAN
+# =====================
+# Satu laporan per kelurahan (klaster, keyakinan, komposisi vs rata-rata
+# klaster, rekomendasi) sebagai HTML + PNG, ditambah laporan.csv, index.html
+# dan laporan.zip. Rendering berjalan di process pool (spawn) yang dikelola
+# thread latar belakang, sehingga sesi Streamlit cukup membaca progresnya.
+# manifest.json menyimpan hash isi tiap laporan: laporan yang datanya tidak
+# berubah sejak ekspor sebelumnya tidak dirender ulang.
+EXPORT_DIR = os.path.join(BASE_DIR, "hasil", "laporan")
+TEMPLATE_VERSION = 1
+FEATURE_LABELS = ["Rendah", "Menengah", "Tinggi"]
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(name)).strip("_").lower()
+
+
+def build_reports(dfp, clusters, confidence=None):
+    """Isi laporan seluruh kelurahan dalam satu tabel (satu baris per kelurahan)."""
+    reports = dfp[FEATURES].copy()
+    reports["cluster"] = np.asarray(clusters, dtype=np.int64)
+    means = reports.groupby("cluster")[FEATURES].transform("mean")
+    for col in FEATURES:
+        reports[f"{col}_klaster"] = means[col]
+        reports[f"{col}_selisih"] = reports[col] - means[col]
+    reports["keyakinan"] = np.nan if confidence is None else np.asarray(confidence, dtype=float)
+    for field in ("nama", "karakteristik", "rekomendasi"):
+        reports[field] = reports["cluster"].map(lambda c: CLUSTER_INFO.get(int(c), {}).get(field, ""))
+    reports.index.name = "bps_desa_kelurahan"
+    return reports
+
+
+def _html(name, row, image):
+    rows = "".join(
+        f"<tr><td>{label}</td><td>{row[col]:.1%}</td><td>{row[col + '_klaster']:.1%}</td>"
+        f"<td>{row[col + '_selisih']:+.1%}</td></tr>"
+        for label, col in zip(FEATURE_LABELS, FEATURES)
+    )
+    keyakinan = "-" if pd.isna(row["keyakinan"]) else f"{row['keyakinan']:.0%}"
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>Laporan {html.escape(name)}</title></head>
+<body>
+<h1>Kelurahan {html.escape(name)}</h1>
+<p>Masuk ke <b>Klaster {int(row["cluster"])} ({html.escape(row["nama"])})</b>,
+keyakinan penugasan {keyakinan}.</p>
+<p>{html.escape(row["karakteristik"])}</p>
+<table border="1" cellpadding="4">
+<tr><th>Pendidikan</th><th>Kelurahan</th><th>Rata-rata klaster</th><th>Selisih</th></tr>
+{rows}
+</table>
+<p><img src="../img/{image}" width="480"></p>
+<h2>Rekomendasi</h2>
+<p>{html.escape(row["rekomendasi"])}</p>
+</body></html>
+"""
+
+
+def _render_chunk(out_dir, items):
+    """Worker: menulis HTML + PNG untuk sekelompok (nama, baris) laporan."""
+    import figures
+
+    for name, row in items:
+        s = slug(name)
+        png = figures.render_png(
+            figures.composition_bars,
+            [row[c] for c in FEATURES], [row[c + "_klaster"] for c in FEATURES], FEATURE_LABELS,
+            figsize=(5, 3.5),
+        )
+        with open(os.path.join(out_dir, "img", f"{s}.png"), "wb") as f:
+            f.write(png)
+        with open(os.path.join(out_dir, "html", f"{s}.html"), "w", encoding="utf-8") as f:
+            f.write(_html(name, row, f"{s}.png"))
+    return len(items)
+
+
+def _index_html(reports):
+    rows = "".join(
+        f"<tr><td><a href=\"html/{slug(name)}.html\">{html.escape(str(name))}</a></td>"
+        f"<td>{int(row['cluster'])}</td><td>{html.escape(row['nama'])}</td></tr>"
+        for name, row in reports.iterrows()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="id"><head><meta charset="utf-8"><title>Laporan Klaster Kelurahan</title></head>
+<body>
+<h1>Laporan Klaster Kelurahan</h1>
+<table border="1" cellpadding="4"><tr><th>Kelurahan</th><th>Klaster</th><th>Nama klaster</th></tr>
+{rows}
+</table>
+</body></html>
+"""
+
+
+def _write_atomic(path, text):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class ExportJob:
+    """Satu ekspor di thread latar belakang; atribut progres dibaca oleh UI."""
+
+    def __init__(self, reports, out_dir=EXPORT_DIR, max_workers=None):
+        self.reports = reports
+        self.out_dir = out_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.total = len(reports)
+        self.rendered = 0
+        self.skipped = 0
+        self.status = "menunggu"
+        self.error = None
+        self.seconds = 0.0
+        self.zip_path = os.path.join(out_dir, "laporan.zip")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def done(self):
+        return self.rendered + self.skipped
+
+    @property
+    def running(self):
+        return self.status in ("menunggu", "berjalan")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        self.status = "berjalan"
+        try:
+            self._export()
+            self.status = "selesai"
+        except Exception as e:  # ditampilkan di UI, thread tidak boleh mati diam-diam
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = "gagal"
+        self.seconds = time.perf_counter() - start
+
+    def _export(self):
+        for sub in ("html", "img"):
+            os.makedirs(os.path.join(self.out_dir, sub), exist_ok=True)
+
+        manifest_path = os.path.join(self.out_dir, "manifest.json")
+        try:
+            with open(manifest_path) as f:
+                old = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            old = {}
+
+        manifest, todo = {}, []
+        for name, row in self.reports.iterrows():
+            s = slug(name)
+            digest = make_key(TEMPLATE_VERSION, s, sorted(row.items()))
+            manifest[s] = digest
+            exists = all(
+                os.path.exists(os.path.join(self.out_dir, sub, f"{s}.{ext}"))
+                for sub, ext in (("html", "html"), ("img", "png"))
+            )
+            if old.get(s) == digest and exists:
+                self.skipped += 1
+            else:
+                todo.append((name, row.to_dict()))
+
+        if todo:
+            # Potongan kecil agar progres bergerak halus, tetapi tetap sedikit pesan antar-proses
+            n_chunks = min(len(todo), self.max_workers * 4)
+            chunks = [list(c) for c in np.array_split(np.arange(len(todo)), n_chunks)]
+            # Selalu di proses terpisah (juga untuk 1 worker): rendering matplotlib
+            # memegang GIL, dan di thread server akan memperlambat semua sesi.
+            # "spawn" agar aman dijalankan dari thread server Streamlit.
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_render_chunk, self.out_dir, [todo[i] for i in idx]) for idx in chunks]
+                for future in as_completed(futures):
+                    self.rendered += future.result()
+
+        _write_atomic(os.path.join(self.out_dir, "laporan.csv"), self.reports.to_csv())
+        _write_atomic(os.path.join(self.out_dir, "index.html"), _index_html(self.reports))
+        _write_atomic(manifest_path, json.dumps(manifest, indent=2))
+
+        tmp = self.zip_path + ".tmp"
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for name in ("laporan.csv", "index.html"):
+                bundle.write(os.path.join(self.out_dir, name), name)
+            for s in manifest:
+                bundle.write(os.path.join(self.out_dir, "html", f"{s}.html"), f"html/{s}.html")
+                bundle.write(os.path.join(self.out_dir, "img", f"{s}.png"), f"img/{s}.png")
+        os.replace(tmp, self.zip_path)
+
+
+def start_export(reports, out_dir=EXPORT_DIR, max_workers=None):
+    """Memulai ekspor di latar belakang; bila ekspor ke folder yang sama masih berjalan, job itu dipakai."""
+    with _jobs_lock:
+        job = _jobs.get(out_dir)
+        if job is None or not job.running:
+            job = ExportJob(reports, out_dir, max_workers).start()
+            _jobs[out_dir] = job
+        return job
+
+
+def get_job(out_dir=EXPORT_DIR):
+    with _jobs_lock:
+        return _jobs.get(out_dir)
@@ -0,0 +1,143 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from cache import make_key
+from tracing import span
+
+# =====================
+# CACHE GAMBAR (PNG)
+# =====================
+# Rasterisasi matplotlib adalah biaya CPU terbesar per sesi. Gambar disimpan
+# sebagai bytes PNG dengan kunci (versi data, spesifikasi grafik) dan dibuang
+# secara LRU bila total ukurannya melewati batas.
+FIGURE_CACHE_MB = int(os.environ.get("TUBES_FIGURE_CACHE_MB", "64"))
+DPI = 200  # sama dengan default st.pyplot
+
+
+class FigureCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            if len(data) > self.max_bytes:
+                return
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self._size -= len(old)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_figure_cache = FigureCache(FIGURE_CACHE_MB * 1024 * 1024)
+
+
+def render_png(draw, *args, figsize=None):
+    """Menggambar `draw(fig, ax, *args)` lalu mengembalikan bytes PNG."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize)
+    try:
+        draw(fig, ax, *args)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=DPI, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buf.getvalue()
+
+
+def cached_png(version, spec, draw, *args, figsize=None):
+    """PNG untuk grafik `spec` pada versi data `version`; dirender hanya saat belum ada di cache."""
+    key = make_key(version, spec, figsize)
+    data = _figure_cache.get(key)
+    if data is None:
+        with span("render_png", grafik=spec[0]):
+            data = render_png(draw, *args, figsize=figsize)
+        _figure_cache.put(key, data)
+    return data
+
+
+def cache_stats():
+    return _figure_cache.stats()
+
+
+# =====================
+# DEFINISI GRAFIK
+# =====================
+def top10_line(fig, ax, df, column, ylabel):
+    top10 = df.sort_values(column, ascending=False).head(10)
+    ax.plot(top10["bps_desa_kelurahan"], top10[column], marker="o")
+    ax.tick_params(axis="x", rotation=45)
+    ax.set_ylabel(ylabel)
+
+
+def boxplot(fig, ax, df, columns, labels):
+    ax.boxplot([df[c] for c in columns], labels=labels)
+
+
+def scatter(fig, ax, x, y, c=None):
+    ax.scatter(x, y, c=c)
+    ax.set_xlabel("Proporsi Pendidikan Rendah")
+    ax.set_ylabel("Proporsi Pendidikan Tinggi")
+
+
+def corr_heatmap(fig, ax, df, columns):
+    import seaborn as sns
+
+    sns.heatmap(df[columns].corr(), annot=True, ax=ax)
+
+
+def period_lines(fig, ax, labels, shares, names, ylabel="Proporsi"):
+    for j, name in enumerate(names):
+        ax.plot(labels, shares[:, j], marker="o", label=name)
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+
+
+def metric_line(fig, ax, k, values, ylabel, errors=None):
+    if errors is None:
+        ax.plot(k, values, marker="o")
+    else:
+        ax.errorbar(k, values, yerr=errors, marker="o")
+    ax.set_xlabel("Jumlah Klaster (k)")
+    ax.set_ylabel(ylabel)
+
+
+def composition_bars(fig, ax, values, cluster_mean, labels):
+    import numpy as np
+
+    x = np.arange(len(labels))
+    ax.bar(x - 0.2, values, width=0.4, label="Kelurahan")
+    ax.bar(x + 0.2, cluster_mean, width=0.4, label="Rata-rata klaster")
+    ax.set_xticks(x, labels)
+    ax.set_ylabel("Proporsi")
+    ax.legend()
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from cube import CUBE_VERSION, GROUPS, DataCube, get_cube
+from ingest import LEVELS, PCT_COLUMNS, RAW_PATH
+from tracing import traced
+
+# =====================
+# HIERARKI KOTA -> KECAMATAN -> KELURAHAN
+# =====================
+# Dibangun sekali dari DataCube: jumlah per kecamatan diperoleh dalam satu
+# lintasan berkelompok (np.add.at atas kode kecamatan tiap kelurahan), kota =
+# jumlah seluruh kecamatan. Setiap tingkat menyimpan counts (node, periode,
+# jenjang) dan persentase rendah/menengah/tinggi seluruh periode yang sudah
+# jadi. Kelurahan diurutkan per kecamatan, sehingga anak sebuah kecamatan
+# adalah satu irisan [start:stop] (offset gaya CSR) -> drill-down dan roll-up
+# hanya pencarian indeks, tanpa groupby ulang di tabel panjang.
+LEVEL_NAMES = ("kota", "kecamatan", "kelurahan")
+INDEX_NAMES = {"kota": "kota", "kecamatan": "bps_nama_kecamatan", "kelurahan": "bps_desa_kelurahan"}
+UNIT_KEY = ["bps_kode_kecamatan", "bps_kode_desa_kelurahan"]
+KOTA = "KOTA BANDUNG"
+HIERARCHY_VERSION = 2  # naikkan bila susunan Level berubah (ikut kunci cache)
+
+_hierarchy_cache = DiskCache("hierarchy")
+
+
+@dataclass
+class Level:
+    name: str
+    names: np.ndarray      # label node (object)
+    counts: np.ndarray     # (node, periode, jenjang), int64
+    pct: pd.DataFrame      # persentase seluruh periode, ber-index nama node
+    parent: np.ndarray     # posisi node induk di tingkat atasnya (-1 untuk kota)
+    codes: np.ndarray = None  # (node, 2) kunci UNIT_KEY; hanya tingkat kelurahan
+
+    def __post_init__(self):
+        self.position = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _pct(names, counts, level):
+    """Tabel jumlah penduduk + proporsi rendah/menengah/tinggi untuk counts (node, jenjang)."""
+    grouped = DataCube.rollup(counts)
+    shares = DataCube.shares(grouped)
+    df = pd.DataFrame(shares, index=pd.Index(names, name=INDEX_NAMES[level]),
+                      columns=[PCT_COLUMNS[g] for g in GROUPS])
+    df.insert(0, "jumlah_penduduk", grouped.sum(axis=1))
+    return df
+
+
+class Hierarchy:
+    """Tiga tingkat agregasi + indeks induk/anak untuk drill-down."""
+
+    def __init__(self, levels, offsets, periods):
+        self.levels = {level.name: level for level in levels}
+        self.offsets = offsets    # anak kecamatan i = kelurahan[offsets[i]:offsets[i + 1]]
+        self.periods = periods
+
+    def __getitem__(self, level):
+        return self.levels[level]
+
+    # -------- navigasi --------
+    def children(self, level, name):
+        """Nama node anak (kota -> kecamatan, kecamatan -> kelurahan)."""
+        if level == "kota":
+            return self["kecamatan"].names
+        if level == "kecamatan":
+            i = self["kecamatan"].position[name]
+            return self["kelurahan"].names[self.offsets[i]:self.offsets[i + 1]]
+        return self["kelurahan"].names[:0]
+
+    def parent(self, level, name):
+        """Nama node induk; None untuk kota."""
+        if level == "kota":
+            return None
+        above = LEVEL_NAMES[LEVEL_NAMES.index(level) - 1]
+        return self[above].names[self[level].parent[self[level].position[name]]]
+
+    def drill_down(self, level, name):
+        """Tabel persentase anak-anak sebuah node (irisan baris, tanpa agregasi ulang)."""
+        below = LEVEL_NAMES[LEVEL_NAMES.index(level) + 1]
+        if level == "kota":
+            return self[below].pct
+        i = self[level].position[name]
+        return self[below].pct.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    def unit_key(self, names):
+        """Kunci unit (kode kecamatan, kode kelurahan) untuk label kelurahan."""
+        kel = self["kelurahan"]
+        codes = kel.codes[[kel.position[name] for name in names]]
+        return pd.MultiIndex.from_arrays(codes.T, names=UNIT_KEY)
+
+    # -------- periode --------
+    def frame(self, level, tahun=None, semester=None):
+        """Tabel persentase satu tingkat; tanpa filter periode memakai tabel yang sudah jadi."""
+        node = self[level]
+        if tahun is None and semester is None:
+            return node.pct
+        mask = np.ones(len(self.periods), dtype=bool)
+        if tahun is not None:
+            mask &= np.isin(self.periods[:, 0], np.atleast_1d(tahun))
+        if semester is not None:
+            mask &= np.isin(self.periods[:, 1], np.atleast_1d(semester))
+        return _pct(node.names, node.counts[:, mask, :].sum(axis=1), level).dropna()
+
+
+@traced("build_hierarchy")
+def build_hierarchy(cube):
+    """Hierarki dari cube dalam satu lintasan berkelompok per tingkat."""
+    kec_names, kec_codes = np.unique(cube.kecamatan.astype(str), return_inverse=True)
+    kec_names = kec_names.astype(object)
+
+    # Kelurahan diurutkan per (kecamatan, nama) -> anak tiap kecamatan berurutan
+    order = np.lexsort((cube.kelurahan.astype(str), kec_codes))
+    kel_counts = cube.counts[order]
+    kel_parent = kec_codes[order]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(kel_parent, minlength=len(kec_names)))])
+
+    kec_counts = np.zeros((len(kec_names),) + cube.counts.shape[1:], dtype=np.int64)
+    np.add.at(kec_counts, kec_codes, cube.counts)
+    kota_counts = kec_counts.sum(axis=0, keepdims=True)
+
+    kota_names = np.array([KOTA], dtype=object)
+    kel_names = cube.kelurahan[order]
+    levels = [
+        Level("kota", kota_names, kota_counts,
+              _pct(kota_names, kota_counts.sum(axis=1), "kota"), np.array([-1])),
+        Level("kecamatan", kec_names, kec_counts,
+              _pct(kec_names, kec_counts.sum(axis=1), "kecamatan"), np.zeros(len(kec_names), dtype=np.int64)),
+        Level("kelurahan", kel_names, kel_counts,
+              _pct(kel_names, kel_counts.sum(axis=1), "kelurahan"), kel_parent, cube.codes[order]),
+    ]
+    return Hierarchy(levels, offsets, cube.periods)
+
+
+def get_hierarchy(raw_path=RAW_PATH):
+    """Hierarki dibangun sekali per versi data mentah lalu diambil dari cache."""
+    key = make_key(file_hash(raw_path), "hierarchy", CUBE_VERSION, HIERARCHY_VERSION, LEVELS)
+    return _hierarchy_cache.get_or_compute(key, lambda: build_hierarchy(get_cube(raw_path)))
+
+
+def cluster_level(hierarchy, level, n_clusters=3, random_state=42, n_init=10):
+    """Label K-Means untuk node satu tingkat (kecamatan atau kelurahan), di-cache per isi proporsinya."""
+    from clustering import FEATURES, get_model
+
+    X = hierarchy[level].pct[FEATURES].dropna()
+    model = get_model(X, min(n_clusters, len(X)), random_state, n_init)
+    return pd.Series(model["labels"], index=X.index, name="cluster")
+
+
+def assign_units(hierarchy, frozen):
+    """Klaster model beku per unit kelurahan, ber-index kunci unit (UNIT_KEY).
+
+    Label kelurahan bisa berakhiran "(KECAMATAN)" dan nama polos bisa kembar,
+    sehingga penggabungan dengan tabel lain memakai kode, bukan nama.
+    """
+    from clustering import predict
+
+    kel = hierarchy["kelurahan"]
+    X = kel.pct[frozen["features"]]
+    valid = X.notna().all(axis=1).to_numpy()
+    index = pd.MultiIndex.from_arrays(kel.codes[valid].T, names=UNIT_KEY)
+    return pd.Series(predict(frozen, X[valid]), index=index, name="cluster")
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from ingest import LEVELS, RAW_PATH
+from tracing import traced
+
+# =====================
+# INDEKS KETIMPANGAN PENDIDIKAN
+# =====================
+# Setiap jenjang dipetakan ke lama sekolah (tahun). Untuk satu wilayah dan satu
+# periode, distribusi penduduk per jenjang menjadi distribusi lama sekolah:
+#   - Gini pendidikan (Thomas, Wang & Fan 2001): sum_ij p_i p_j |y_i - y_j| / 2μ
+#   - Theil T (GE(1)) dan Theil L (GE(0), mean log deviation)
+#   - entropi Shannon sebaran jenjang, dinormalisasi ke [0, 1]
+# Semua indeks dihitung sekaligus untuk array counts (..., jenjang) apa pun:
+# (kelurahan, periode, jenjang) cukup satu kali einsum / reduksi NumPy.
+# Theil L tidak terdefinisi untuk lama sekolah 0, sehingga memakai y + 1.
+YEARS = {
+    "TIDAK/BELUM SEKOLAH": 0.0,
+    "BELUM TAMAT SD/SEDERAJAT": 3.0,
+    "TAMAT SD/SEDERAJAT": 6.0,
+    "SLTP/SEDERAJAT": 9.0,
+    "SLTA/SEDERAJAT": 12.0,
+    "DIPLOMA I & II": 13.5,
+    "DIPLOMA III": 15.0,
+    "DIPLOMA IV/STRATA I": 16.0,
+    "STRATA 2": 18.0,
+    "STRATA 3": 21.0,
+}
+YEARS_ARRAY = np.array([YEARS[lvl] for lvl in LEVELS])
+THEIL_L_OFFSET = 1.0
+
+INDICES = ["rata_lama_sekolah", "gini", "theil_t", "theil_l", "entropi"]
+INDEX_LABELS = {
+    "rata_lama_sekolah": "Rata-rata Lama Sekolah (tahun)",
+    "gini": "Gini Pendidikan",
+    "theil_t": "Theil T",
+    "theil_l": "Theil L",
+    "entropi": "Entropi Jenjang",
+}
+
+_inequality_cache = DiskCache("inequality")
+
+
+def _xlogx(x):
+    """x * ln(x) dengan 0 * ln(0) = 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x > 0, x * np.log(np.where(x > 0, x, 1.0)), 0.0)
+
+
+def indices(counts, years=YEARS_ARRAY):
+    """Semua indeks untuk counts (..., jenjang); wilayah tanpa penduduk -> NaN."""
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = counts / n[..., None]
+        mu = p @ years
+        gini = np.einsum("...i,ij,...j->...", p, np.abs(years[:, None] - years[None, :]), p) / (2 * mu)
+        theil_t = (p * _xlogx(years / mu[..., None])).sum(axis=-1)
+        shifted = years + THEIL_L_OFFSET
+        theil_l = np.log(p @ shifted) - p @ np.log(shifted)
+        entropi = -_xlogx(p).sum(axis=-1) / np.log(len(years))
+    return {
+        "rata_lama_sekolah": mu,
+        "gini": gini,
+        "theil_t": theil_t,
+        "theil_l": theil_l,
+        "entropi": entropi,
+    }
+
+
+def theil_decomposition(group_counts, years=YEARS_ARRAY):
+    """Theil T & L populasi gabungan = dalam kelompok + antar kelompok.
+
+    group_counts: (kelompok, ..., jenjang). Mengembalikan dict array (...) berisi
+    total, within dan between untuk kedua indeks; total == within + between.
+    """
+    group_counts = np.asarray(group_counts, dtype=np.float64)
+    group = indices(group_counts, years)
+    total = indices(group_counts.sum(axis=0), years)
+
+    n_g = group_counts.sum(axis=-1)
+    n = n_g.sum(axis=0)
+    pop_share = n_g / n
+    mu_g, mu = group["rata_lama_sekolah"], total["rata_lama_sekolah"]
+    years_share = pop_share * mu_g / mu        # bagian total lama sekolah milik kelompok g
+
+    shifted = years + THEIL_L_OFFSET
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mu_l_g = (group_counts / n_g[..., None]) @ shifted
+        mu_l = (group_counts.sum(axis=0) / n[..., None]) @ shifted
+        ratio = mu_g / mu
+    present = n_g > 0
+
+    return {
+        "theil_t": total["theil_t"],
+        "theil_t_within": np.where(present, years_share * group["theil_t"], 0.0).sum(axis=0),
+        "theil_t_between": np.where(present, years_share * np.log(np.where(present, ratio, 1.0)), 0.0).sum(axis=0),
+        "theil_l": total["theil_l"],
+        "theil_l_within": np.where(present, pop_share * group["theil_l"], 0.0).sum(axis=0),
+        "theil_l_between": np.where(present, pop_share * np.log(mu_l / np.where(present, mu_l_g, 1.0)), 0.0).sum(axis=0),
+    }
+
+
+def _long_frame(names, periods, values, index_name):
+    """Array (node, periode) per indeks -> tabel panjang ber-index (node, tahun, semester)."""
+    n_nodes, n_periods = len(names), len(periods)
+    index = pd.MultiIndex.from_arrays(
+        [np.repeat(names, n_periods), np.tile(periods[:, 0], n_nodes), np.tile(periods[:, 1], n_nodes)],
+        names=[index_name, "tahun", "semester"],
+    )
+    df = pd.DataFrame({name: values[name].ravel() for name in INDICES}, index=index)
+    return df.dropna()
+
+
+@traced("inequality")
+def build_inequality(hierarchy):
+    """Indeks seluruh tingkat dan periode + dekomposisi Theil antar/dalam kecamatan."""
+    from hierarchy import INDEX_NAMES, LEVEL_NAMES
+
+    periods = hierarchy.periods
+    result = {}
+    for level in LEVEL_NAMES:
+        node = hierarchy[level]
+        per_period = indices(node.counts)
+        overall = indices(node.counts.sum(axis=1))
+        result[level] = _long_frame(node.names, periods, per_period, INDEX_NAMES[level])
+        result[level + "_total"] = pd.DataFrame(
+            overall, index=pd.Index(node.names, name=INDEX_NAMES[level])
+        ).dropna()
+
+    # Kota = gabungan kecamatan: per periode (sumbu 1) dan seluruh periode
+    kec_counts = hierarchy["kecamatan"].counts
+    per_period = theil_decomposition(kec_counts)
+    result["decomposition"] = pd.DataFrame(
+        per_period,
+        index=pd.MultiIndex.from_arrays([periods[:, 0], periods[:, 1]], names=["tahun", "semester"]),
+    )
+    result["decomposition_total"] = pd.Series(
+        {k: float(v) for k, v in theil_decomposition(kec_counts.sum(axis=1)).items()}
+    )
+    return result
+
+
+def get_inequality(raw_path=RAW_PATH):
+    """Indeks ketimpangan dihitung sekali per versi data mentah lalu diambil dari cache."""
+    from cube import CUBE_VERSION
+    from hierarchy import get_hierarchy
+
+    key = make_key(file_hash(raw_path), "inequality", CUBE_VERSION, LEVELS, YEARS_ARRAY.tolist(), THEIL_L_OFFSET)
+    return _inequality_cache.get_or_compute(key, lambda: build_inequality(get_hierarchy(raw_path)))
@@ -0,0 +1,224 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# =====================
+# KONFIGURASI DATA MENTAH
+# =====================
+RAW_PATH = "jumlah_penduduk_kota_bandung_berdasarkan_jenis_pendidikan_2(1).csv"
+PIVOT_PATH = "data pivot.csv"
+DATASET_PATH = "dataset_final.csv"
+EDA_PATH = "df_eda.csv"
+
+# Penyeragaman nama jenjang (ejaan lama -> ejaan baru), sama seperti di new.ipynb
+ALIASES = {
+    "TIDAK/BLM SEKOLAH": "TIDAK/BELUM SEKOLAH",
+    "BELUM TAMAT SD": "BELUM TAMAT SD/SEDERAJAT",
+    "DIPLOMA I/II": "DIPLOMA I & II",
+    "AKADEMI/DIPL.III/S.MUDA": "DIPLOMA III",
+    "STRATA-II": "STRATA 2",
+    "STRATA-III": "STRATA 3",
+}
+
+LEVEL_GROUPS = {
+    "pendidikan_rendah": [
+        "TAMAT SD/SEDERAJAT",
+        "BELUM TAMAT SD/SEDERAJAT",
+        "TIDAK/BELUM SEKOLAH",
+    ],
+    "pendidikan_menengah": [
+        "SLTP/SEDERAJAT",
+        "SLTA/SEDERAJAT",
+    ],
+    "pendidikan_tinggi": [
+        "DIPLOMA I & II",
+        "DIPLOMA III",
+        "DIPLOMA IV/STRATA I",
+        "STRATA 2",
+        "STRATA 3",
+    ],
+}
+
+LEVELS = [lvl for group in LEVEL_GROUPS.values() for lvl in group]
+
+PCT_COLUMNS = {
+    "pendidikan_rendah": "rendah_pct",
+    "pendidikan_menengah": "menengah_pct",
+    "pendidikan_tinggi": "tinggi_pct",
+}
+
+CHUNK_SIZE = 100_000
+COMPACT_PARTS = 16  # aggregate_counts: gabungkan hasil parsial setiap sekian chunk
+
+# Kunci unik kelurahan lintas wilayah: nama kelurahan bisa kembar antar kecamatan
+# (Kota Bandung: dua SINDANG JAYA), kode BPS tidak
+REGION_KEYS = ("bps_kode_kecamatan", "bps_kode_desa_kelurahan")
+
+# CSV hasil olahan di repo memakai akhir baris CRLF; dipertahankan agar ingest
+# ulang pada data yang sama tidak mengubah file sama sekali
+CSV_LINE_TERMINATOR = "\r\n"
+
+# Tombol "Jalankan Ingest" menulis ulang data di server, jadi hanya ditampilkan
+# bila diizinkan eksplisit (mis. di mesin pengelola data)
+ALLOW_UI_INGEST = os.environ.get("TUBES_ALLOW_INGEST", "") == "1"
+
+
+def normalize_jenis(series):
+    """Menyeragamkan alias jenjang pada kolom kategorikal (cukup mengubah kategori, bukan tiap baris)."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    categories = series.cat.categories
+    renamed = [ALIASES.get(c, c) for c in categories]
+    if len(set(renamed)) == len(renamed):
+        return series.cat.rename_categories(renamed)
+    # Alias lama & baru sama-sama muncul di chunk ini -> gabungkan kategorinya
+    codes_map = {c: ALIASES.get(c, c) for c in categories}
+    return series.map(codes_map).astype("category")
+
+
+def iter_chunks(path=RAW_PATH, columns=None, chunksize=CHUNK_SIZE):
+    """Membaca data mentah per chunk dengan dtype kategorikal dan jenjang yang sudah dinormalisasi."""
+    dtype = {
+        "jenis_pendidikan": "category",
+        "bps_desa_kelurahan": "category",
+        "bps_nama_kecamatan": "category",
+        "jumlah_penduduk": "int64",
+    }
+    if columns is not None:
+        dtype = {c: t for c, t in dtype.items() if c in columns}
+
+    if path.endswith(".parquet"):
+        # Salinan kolumnar (lihat storage.py): kategori sudah dictionary-encoded
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+        reader = (batch.to_pandas() for batch in batches)
+    else:
+        reader = pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunksize)
+
+    for chunk in reader:
+        if "jenis_pendidikan" in chunk.columns:
+            chunk["jenis_pendidikan"] = normalize_jenis(chunk["jenis_pendidikan"])
+        yield chunk
+
+
+def aggregate_counts(path=RAW_PATH, keys=("bps_desa_kelurahan",), chunksize=CHUNK_SIZE):
+    """Jumlah penduduk per (keys..., jenis_pendidikan), diakumulasi chunk demi chunk.
+
+    Memori hanya sebanding dengan jumlah grup, bukan jumlah baris file mentah:
+    hasil per chunk dikumpulkan lalu dipadatkan setiap COMPACT_PARTS chunk.
+    Mengembalikan (tabel lebar: index=keys, kolom=jenjang; jumlah baris terbaca).
+    Data skala provinsi / nasional memakai keys=REGION_KEYS (nama kelurahan kembar).
+    """
+    keys = list(keys)
+    columns = keys + ["jenis_pendidikan", "jumlah_penduduk"]
+    level = list(range(len(keys) + 1))
+    parts = []
+    n_rows = 0
+
+    for chunk in iter_chunks(path, columns=columns, chunksize=chunksize):
+        n_rows += len(chunk)
+        parts.append(chunk.groupby(keys + ["jenis_pendidikan"], observed=True, sort=False)[
+            "jumlah_penduduk"
+        ].sum())
+        if len(parts) >= COMPACT_PARTS:
+            parts = [pd.concat(parts).groupby(level=level, observed=True).sum()]
+
+    if parts:
+        long = pd.concat(parts).groupby(level=level, observed=True).sum().astype("int64")
+        # Kategori berasal dari chunk tertentu; hasil memakai nilai biasa
+        long.index = pd.MultiIndex.from_arrays([
+            values.astype(values.categories.dtype) if isinstance(values, pd.CategoricalIndex) else values
+            for values in (long.index.get_level_values(i) for i in level)
+        ])
+    else:
+        index = pd.MultiIndex.from_tuples([], names=keys + ["jenis_pendidikan"])
+        long = pd.Series([], index=index, dtype="int64")
+    wide = long.unstack("jenis_pendidikan", fill_value=0).sort_index()
+    wide = wide.reindex(sorted(wide.columns), axis=1)
+    return wide, n_rows
+
+
+def build_pivot(counts):
+    """Dari tabel jumlah per jenjang -> kolom total_*, kelompok rendah/menengah/tinggi dan *_pct."""
+    df_pivot = counts.copy()
+    df_pivot.columns = [f"total_{col}" for col in df_pivot.columns]
+
+    for group, levels in LEVEL_GROUPS.items():
+        df_pivot[group] = sum(
+            df_pivot[f"total_{lvl}"] for lvl in levels if f"total_{lvl}" in df_pivot
+        )
+
+    df_pivot["total_pendidikan"] = (
+        df_pivot["pendidikan_rendah"] +
+        df_pivot["pendidikan_menengah"] +
+        df_pivot["pendidikan_tinggi"]
+    )
+
+    for group, pct in PCT_COLUMNS.items():
+        df_pivot[pct] = df_pivot[group] / df_pivot["total_pendidikan"]
+
+    return df_pivot
+
+
+def write_csv(df, path):
+    """Menulis CSV secara atomik: file sementara di folder yang sama lalu `os.replace`,
+    sehingga sesi lain yang sedang membaca tidak pernah melihat file setengah jadi."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            df.to_csv(f, lineterminator=CSV_LINE_TERMINATOR)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def run_ingest(raw_path=RAW_PATH, out_dir=".", chunksize=CHUNK_SIZE):
+    """Tahap ingest lengkap: data mentah -> `data pivot.csv`, `dataset_final.csv`, `df_eda.csv`.
+
+    Jumlah per jenjang dan pivot diambil dari pipeline (pipeline.py): selama isi
+    file mentah sama, ingest ulang hanya menulis ulang CSV tanpa membaca data mentah.
+    """
+    import pipeline
+
+    start = time.perf_counter()
+
+    report = []
+    n_rows = pipeline.run("counts", report, raw_path=raw_path, chunksize=chunksize)["rows"]
+    df_pivot = pipeline.run("pivot", report, raw_path=raw_path, chunksize=chunksize)
+
+    write_csv(df_pivot.reset_index(), os.path.join(out_dir, PIVOT_PATH))
+    dfp = df_pivot[list(PCT_COLUMNS.values())]
+    write_csv(dfp, os.path.join(out_dir, DATASET_PATH))
+    write_csv(dfp, os.path.join(out_dir, EDA_PATH))
+
+    return {
+        "rows": n_rows,
+        "kelurahan": len(df_pivot),
+        "seconds": time.perf_counter() - start,
+        "recomputed": [name for name, status, _ in report if status == "hitung"],
+    }
+
+
+def outputs_missing(out_dir="."):
+    """True bila salah satu hasil olahan (`dataset_final.csv` / `df_eda.csv`) belum ada."""
+    return not all(
+        os.path.exists(os.path.join(out_dir, name)) for name in (DATASET_PATH, EDA_PATH)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest data mentah BPS menjadi dataset_final.csv")
+    parser.add_argument("--raw", default=RAW_PATH)
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    info = run_ingest(args.raw, args.out_dir, args.chunksize)
+    print(f"{info['rows']} baris -> {info['kelurahan']} kelurahan ({info['seconds']:.2f} s)")
@@ -0,0 +1,364 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+# =====================
+# UJI BEBAN SESI SERENTAK
+# =====================
+# app.py dijalankan sebagai SATU proses server Streamlit sungguhan (headless),
+# lalu banyak sesi simulasi terhubung lewat websocket yang sama dengan yang
+# dipakai browser (protokol BackMsg/ForwardMsg). Karena itu cache_resource,
+# cache gambar, feature store, dsb. dipakai bersama persis seperti di produksi.
+# Tiap sesi membuka aplikasi, berpindah ke kelima menu, lalu di halaman K-Means
+# memilih kelurahan acak dan menekan "Cek Klaster" (keduanya rerun fragment).
+#
+#   python loadtest.py --sessions 1 5 10 20 --iterations 2
+#
+# Untuk tiap tingkat konkurensi dilaporkan latensi per jenis interaksi
+# (p50/p95/p99, dari kirim rerun sampai script_finished), throughput, CPU
+# server beserta worker pool anaknya (detik CPU per detik wall = jumlah core
+# terpakai) dan puncak RSS server beserta proses anaknya. Klien berjalan di
+# mesin yang sama, jadi sisakan core untuknya.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+TIMEOUT_S = 120
+STARTUP_TIMEOUT_S = 60
+
+
+# =====================
+# PROSES SERVER
+# =====================
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    """Menjalankan `streamlit run app.py` headless dan menunggu sampai sehat."""
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server Streamlit berhenti saat start (kode {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"Server Streamlit tidak siap dalam {STARTUP_TIMEOUT_S} s")
+
+
+def _stat_fields(pid):
+    """Kolom /proc/<pid>/stat setelah nama proses (fields[0] = state, fields[1] = ppid)."""
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()
+
+
+def _process_tree(pid):
+    """pid beserta seluruh turunannya yang masih hidup (worker ProcessPoolExecutor, dsb.)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            children.setdefault(int(_stat_fields(entry)[1]), []).append(int(entry))
+        except (OSError, IndexError):
+            pass  # proses selesai di tengah pemindaian
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def _cpu_seconds(pid):
+    """CPU server beserta proses anaknya (Linux: /proc/<pid>/stat).
+
+    Tiap proses yang masih hidup menyumbang utime + stime miliknya ditambah
+    cutime + cstime (anak yang sudah selesai dan di-wait). Worker pool hidup
+    lama dan belum di-wait, jadi harus dibaca langsung dari prosesnya.
+    """
+    ticks = 0
+    for member in _process_tree(pid):
+        try:
+            fields = _stat_fields(member)
+        except OSError:
+            continue
+        ticks += sum(int(v) for v in fields[11:15])
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def _rss_bytes(pid):
+    """RSS server beserta proses anaknya, dari pohon proses yang sama dengan _cpu_seconds."""
+    pages = 0
+    for member in _process_tree(pid):
+        try:
+            with open(f"/proc/{member}/statm") as f:
+                pages += int(f.read().split()[1])
+        except (OSError, IndexError):
+            pass  # proses selesai di tengah pembacaan
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class RssSampler(threading.Thread):
+    """Mencatat puncak RSS gabungan proses `pid` dan turunannya selama satu tingkat konkurensi."""
+
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = _rss_bytes(pid)
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes(self.pid))
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, _rss_bytes(self.pid))
+        return self.peak
+
+
+# =====================
+# KLIEN WEBSOCKET (PENGGANTI BROWSER)
+# =====================
+class Session:
+    """Satu penonton: menyimpan state widget seperti browser dan mengukur tiap rerun."""
+
+    def __init__(self, port):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.ws = None
+        self.widgets = {}     # id -> WidgetState terakhir (dikirim ulang tiap rerun)
+        self.elements = {}    # label -> (jenis, proto elemen, fragment_id) dari rerun terakhir
+        self.cache = {}       # hash -> ForwardMsg (server hanya mengirim ref untuk pesan berulang)
+        self.records = []
+
+    async def connect(self):
+        from tornado.httpclient import HTTPRequest
+        from tornado.websocket import websocket_connect
+
+        request = HTTPRequest(self.url, headers={"Sec-WebSocket-Protocol": "streamlit"})
+        self.ws = await websocket_connect(request, max_message_size=1 << 30)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, name, trigger=None, fragment_id=""):
+        """Mengirim satu rerun dan menunggu script_finished; mencatat latensi & galat."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.fragment_id = fragment_id
+        for state in self.widgets.values():
+            msg.rerun_script.widget_states.widgets.append(state)
+        if trigger is not None:
+            state = msg.rerun_script.widget_states.widgets.add()
+            state.id = trigger
+            state.trigger_value = True
+
+        if not fragment_id:
+            self.elements = {}
+        errors = 0
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), TIMEOUT_S)
+            if raw is None:
+                raise ConnectionError("Websocket ditutup server")
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            if fwd.ref_hash:
+                fwd = self.cache[fwd.ref_hash]
+            elif fwd.hash:
+                self.cache[fwd.hash] = fwd
+
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                errors += self._remember(fwd.delta)
+            elif kind == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                # st.rerun() (tombol navigasi) menghasilkan FINISHED_EARLY_FOR_RERUN dulu
+                errors += fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR
+                break
+        self.records.append((name, time.perf_counter() - start, errors))
+
+    def _remember(self, delta):
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            return 1
+        if kind in ("button", "selectbox"):
+            proto = getattr(element, kind)
+            self.elements[proto.label] = (kind, proto, delta.fragment_id)
+        return 0
+
+    def select(self, label, index):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        _, proto, fragment_id = self.elements[label]
+        self.widgets[proto.id] = WidgetState(id=proto.id, int_value=index)
+        return fragment_id
+
+
+def _page_name(label):
+    # "🎯 K-Means Clustering" -> "menu:k-means_clustering"
+    return "menu:" + label.split(" ", 1)[-1].lower().replace(" ", "_")
+
+
+async def session(port, seed, iterations):
+    """Satu penonton: buka aplikasi, jelajahi semua menu, cek klaster kelurahan acak."""
+    rng = random.Random(seed)
+    s = Session(port)
+    await s.connect()
+    try:
+        await s.rerun("buka")
+        nav = {label: el[1].id for label, el in s.elements.items()
+               if el[0] == "button" and "-nav_" in el[1].id}
+
+        for _ in range(iterations):
+            for label, widget_id in nav.items():
+                await s.rerun(_page_name(label), trigger=widget_id)
+
+                if "Pilih Kelurahan" not in s.elements:
+                    continue
+                options = s.elements["Pilih Kelurahan"][1].options
+                fragment_id = s.select("Pilih Kelurahan", rng.randrange(len(options)))
+                await s.rerun("pilih_kelurahan", fragment_id=fragment_id)
+
+                if "Cek Klaster" in s.elements:
+                    _, button, fragment_id = s.elements["Cek Klaster"]
+                    await s.rerun("cek_klaster", trigger=button.id, fragment_id=fragment_id)
+    finally:
+        s.close()
+    return s.records
+
+
+async def _run_sessions(port, n_sessions, iterations, seed):
+    results = await asyncio.gather(*[session(port, seed + i, iterations) for i in range(n_sessions)])
+    return [r for records in results for r in records]
+
+
+# =====================
+# PENGUKURAN PER TINGKAT
+# =====================
+def run_level(port, pid, n_sessions, iterations, seed=0):
+    """Menjalankan n sesi serentak; mengembalikan ringkasan latensi & sumber daya server."""
+    sampler = RssSampler(pid)
+    sampler.start()
+    cpu_start = _cpu_seconds(pid)
+    start = time.perf_counter()
+
+    records = asyncio.run(_run_sessions(port, n_sessions, iterations, seed))
+
+    wall = time.perf_counter() - start
+    cpu = _cpu_seconds(pid) - cpu_start
+    peak_rss = sampler.stop()
+
+    latencies = {}
+    for name, seconds, _ in records:
+        latencies.setdefault(name, []).append(seconds)
+
+    interactions = {}
+    for name, values in latencies.items():
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        interactions[name] = {
+            "n": len(values),
+            "p50_ms": round(p50 * 1000, 1),
+            "p95_ms": round(p95 * 1000, 1),
+            "p99_ms": round(p99 * 1000, 1),
+        }
+
+    all_values = [s for _, s, _ in records]
+    p50, p95, p99 = np.percentile(all_values, [50, 95, 99])
+    return {
+        "sessions": n_sessions,
+        "interactions": len(records),
+        "errors": sum(e for _, _, e in records),
+        "wall_s": round(wall, 2),
+        "throughput_per_s": round(len(records) / wall, 2),
+        "p50_ms": round(p50 * 1000, 1),
+        "p95_ms": round(p95 * 1000, 1),
+        "p99_ms": round(p99 * 1000, 1),
+        "cpu_cores": round(cpu / wall, 2),
+        "peak_rss_mb": round(peak_rss / 1e6, 1),
+        "per_interaction": interactions,
+    }
+
+
+def print_level(result):
+    print(
+        f"\n== {result['sessions']} sesi: {result['interactions']} interaksi dalam {result['wall_s']} s "
+        f"({result['throughput_per_s']}/s), galat {result['errors']}, "
+        f"CPU server {result['cpu_cores']} core, puncak RSS {result['peak_rss_mb']} MB"
+    )
+    print(f"{'interaksi':<40} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, r in sorted(result["per_interaction"].items()):
+        print(f"{name:<40} {r['n']:>5} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+    print(f"{'SEMUA':<40} {result['interactions']:>5} {result['p50_ms']:>9} "
+          f"{result['p95_ms']:>9} {result['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban sesi serentak untuk app.py (tanpa browser)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10],
+                        help="tingkat konkurensi yang diuji berurutan")
+    parser.add_argument("--iterations", type=int, default=1,
+                        help="berapa kali tiap sesi menjelajahi kelima menu")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="jangan panaskan cache dengan satu sesi sebelum pengukuran")
+    parser.add_argument("--port", type=int, help="port server (default: port bebas acak)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    port = args.port or _free_port()
+    server = start_server(port)
+    try:
+        if not args.no_warmup:
+            start = time.perf_counter()
+            asyncio.run(_run_sessions(port, 1, 1, args.seed))
+            print(f"Pemanasan (cache dingin -> hangat): {time.perf_counter() - start:.1f} s")
+
+        results = []
+        for n in args.sessions:
+            result = run_level(port, server.pid, n, args.iterations, args.seed)
+            print_level(result)
+            results.append(result)
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpu_count": os.cpu_count(), "levels": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
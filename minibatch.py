@@ -0,0 +1,180 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from clustering import FEATURES, order_centroids
+from ingest import PCT_COLUMNS, RAW_PATH, REGION_KEYS, aggregate_counts, build_pivot
+
+# =====================
+# CLUSTERING MINI-BATCH (OUT-OF-CORE)
+# =====================
+# Untuk data skala provinsi / nasional. Fitur per kelurahan dibaca sebagai
+# aliran chunk dari disk, sehingga memori hanya sebesar satu chunk + centroid:
+#   lintasan 1: StandardScaler.partial_fit + reservoir sample untuk centroid awal
+#   lintasan 2: MiniBatchKMeans.partial_fit (bisa beberapa epoch)
+#   lintasan 3: pelabelan akhir, ditulis langsung ke file keluaran
+CHUNK_SIZE = 50_000
+SAMPLE_SIZE = 20_000
+
+
+def write_features(raw_path, out_path, chunksize=200_000):
+    """Data mentah -> file fitur (kode kecamatan, kode kelurahan, rendah_pct, menengah_pct, tinggi_pct).
+
+    Dikelompokkan per kode BPS: pada skala provinsi ribuan desa berbagi nama.
+    """
+    counts, n_rows = aggregate_counts(raw_path, keys=REGION_KEYS, chunksize=chunksize)
+    dfp = build_pivot(counts)[list(PCT_COLUMNS.values())]
+    dfp.to_csv(out_path)
+    return len(dfp), n_rows
+
+
+def _key_columns(path):
+    # Kolom kunci = semua kolom selain fitur: kode wilayah (write_features) atau
+    # nama kelurahan (format dataset_final.csv)
+    return list(range(len([c for c in pd.read_csv(path, nrows=0).columns if c not in FEATURES])))
+
+
+def stream_features(path, chunksize=CHUNK_SIZE):
+    """Membaca file fitur per chunk (index = kolom kunci kelurahan)."""
+    for chunk in pd.read_csv(path, index_col=_key_columns(path), chunksize=chunksize):
+        yield chunk[FEATURES]
+
+
+def fit_streaming(path, n_clusters=3, random_state=42, chunksize=CHUNK_SIZE,
+                  epochs=3, batch_size=4096, sample_size=SAMPLE_SIZE):
+    """Scaler + MiniBatchKMeans yang di-fit dari aliran chunk, tanpa memuat seluruh data."""
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(random_state)
+
+    # Lintasan 1: statistik scaler + reservoir sample berukuran tetap untuk inisialisasi
+    scaler = StandardScaler()
+    sample = np.empty((0, len(FEATURES)))
+    seen = 0
+    for chunk in stream_features(path, chunksize):
+        X = chunk.to_numpy()
+        scaler.partial_fit(X)
+        sample, seen = _reservoir_update(sample, seen, X, sample_size, rng)
+
+    # Centroid awal = KMeans penuh (n_init=10) pada sampel, seperti mode in-memory
+    init = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    init.fit(scaler.transform(sample))
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        init=init.cluster_centers_,
+        n_init=1,
+        random_state=random_state,
+        batch_size=batch_size,
+    )
+
+    # Lintasan 2..: penyempurnaan centroid per mini-batch
+    for _ in range(max(epochs, 1)):
+        for chunk in stream_features(path, chunksize):
+            X = scaler.transform(chunk.to_numpy())
+            X = X[rng.permutation(len(X))]
+            for start in range(0, len(X), batch_size):
+                batch = X[start:start + batch_size]
+                if len(batch) >= n_clusters:
+                    kmeans.partial_fit(batch)
+
+    # Nomor klaster mengikuti urutan semantik yang sama dengan mode in-memory
+    kmeans.cluster_centers_ = kmeans.cluster_centers_[order_centroids(kmeans.cluster_centers_, scaler)]
+    return scaler, kmeans
+
+
+def _reservoir_update(sample, seen, X, size, rng):
+    """Algorithm R versi vektor: sampel acak seragam berukuran tetap dari aliran."""
+    n = len(X)
+    take = max(0, min(size - len(sample), n))
+    if take:
+        sample = np.vstack([sample, X[:take]])
+    rest = X[take:]
+    if len(rest):
+        positions = seen + take + np.arange(len(rest))
+        slots = (rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+        keep = slots < size
+        sample[slots[keep]] = rest[keep]
+    return sample, seen + n
+
+
+def label_streaming(path, scaler, kmeans, out_path, chunksize=CHUNK_SIZE):
+    """Lintasan pelabelan: label ditulis per chunk; ringkasan per klaster diakumulasi."""
+    k = kmeans.n_clusters
+    sums = np.zeros((k, len(FEATURES)))
+    counts = np.zeros(k, dtype=np.int64)
+    inertia = 0.0
+    header = True
+
+    for chunk in stream_features(path, chunksize):
+        X = chunk.to_numpy()
+        X_scaled = scaler.transform(X)
+        labels = kmeans.predict(X_scaled)
+        dist = ((X_scaled - kmeans.cluster_centers_[labels]) ** 2).sum(axis=1)
+
+        np.add.at(sums, labels, X)
+        counts += np.bincount(labels, minlength=k)
+        inertia += float(dist.sum())
+
+        out = chunk.copy()
+        out["cluster"] = labels
+        out.to_csv(out_path, mode="w" if header else "a", header=header)
+        header = False
+
+    summary = pd.DataFrame(sums / np.maximum(counts, 1)[:, None], columns=FEATURES)
+    summary.index.name = "cluster"
+    summary["jumlah_kelurahan"] = counts
+    return summary, inertia
+
+
+def run_streaming(features_path, out_path, n_clusters=3, random_state=42,
+                  chunksize=CHUNK_SIZE, epochs=3):
+    scaler, kmeans = fit_streaming(features_path, n_clusters, random_state, chunksize, epochs)
+    summary, inertia = label_streaming(features_path, scaler, kmeans, out_path, chunksize)
+    return {"scaler": scaler, "kmeans": kmeans, "summary": summary, "inertia": inertia}
+
+
+def agreement(features_path, labels_path, n_clusters=3, random_state=42):
+    """Adjusted Rand Index antara mode mini-batch dan KMeans(n_init=10) penuh di memori."""
+    from sklearn.metrics import adjusted_rand_score
+
+    from clustering import fit_kmeans
+
+    dfp = pd.read_csv(features_path, index_col=_key_columns(features_path))
+    full = fit_kmeans(dfp[FEATURES], n_clusters=n_clusters, random_state=random_state)
+    streamed = pd.read_csv(labels_path, index_col=_key_columns(features_path))["cluster"].reindex(dfp.index)
+    return adjusted_rand_score(full["labels"], streamed.to_numpy())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="K-Means mini-batch out-of-core")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--raw", help="data mentah berskema BPS (mis. dari synthetic.py)")
+    source.add_argument("--features", help="file fitur per kelurahan (format dataset_final.csv)")
+    parser.add_argument("--out", default="assignments_minibatch.csv")
+    parser.add_argument("--n-clusters", type=int, default=3)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="bandingkan dengan KMeans(random_state=42) penuh (butuh data muat di memori)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    features = args.features
+    if features is None:
+        raw = args.raw or RAW_PATH
+        features = os.path.join(tempfile.mkdtemp(), "features.csv")
+        n_kel, n_rows = write_features(raw, features)
+        print(f"agregasi: {n_rows:,} baris -> {n_kel:,} kelurahan ({time.perf_counter() - start:.1f} s)")
+
+    result = run_streaming(features, args.out, args.n_clusters, chunksize=args.chunksize, epochs=args.epochs)
+    print(result["summary"].to_string())
+    print(f"inertia={result['inertia']:.2f}  total {time.perf_counter() - start:.1f} s -> {args.out}")
+
+    if args.check:
+        print(f"ARI vs KMeans penuh: {agreement(features, args.out, args.n_clusters):.3f}")
@@ -0,0 +1,215 @@
+import argparse
+import hashlib
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from ingest import CHUNK_SIZE, PCT_COLUMNS, RAW_PATH, aggregate_counts, build_pivot
+
+# =====================
+# PIPELINE ANALISIS BERDEPENDENSI
+# =====================
+# Alur data mentah -> jumlah per jenjang (alias dinormalisasi) -> pivot ->
+# persentase (dataset_final) -> standardisasi -> K-Means -> ringkasan -> grafik
+# ditulis sebagai graf tahap. Kunci cache sebuah tahap = hash dari
+#   nama tahap + versi kode tahap + parameter yang DIPAKAI tahap itu
+#   + hash ISI keluaran tiap tahap masukannya.
+# Keluaran disimpan bersama hash isinya (hanya bagian yang dipakai tahap hilir,
+# lihat `content`), sehingga:
+#   - n_clusters berubah -> hanya model, ringkasan dan grafik yang dihitung ulang;
+#   - file mentah berubah -> tahap hilir berhenti dihitung ulang begitu ada
+#     keluaran yang isinya tetap sama (mis. hanya kolom yang tidak dipakai berubah);
+#   - rerun / restart -> semua diambil dari cache (disk).
+# Keluaran sebuah tahap juga bisa diberikan langsung (`given`): clustering.get_model
+# memberi tahap "dataset" berupa fitur yang sudah dimuat aplikasi (dataset_final
+# atau tingkat kecamatan), lalu membaca tahap "model" dari graf yang sama.
+# Naikkan `version` sebuah tahap bila kodenya berubah.
+_pipeline_cache = DiskCache("pipeline")
+
+DEFAULT_PARAMS = {
+    "raw_path": RAW_PATH,
+    "chunksize": CHUNK_SIZE,
+    "n_clusters": 3,
+    "random_state": 42,
+    "n_init": 10,
+}
+
+
+class Stage:
+    def __init__(self, name, func, inputs=(), params=(), runtime=(), content=None, version=1):
+        self.name = name
+        self.func = func              # func(*keluaran_masukan, **parameter, **runtime)
+        self.inputs = tuple(inputs)
+        self.params = tuple(params)   # ikut menentukan kunci cache
+        self.runtime = tuple(runtime) # hanya memengaruhi cara hitung (mis. ukuran chunk), bukan hasil
+        self.content = content        # bagian keluaran yang di-hash (default: seluruhnya)
+        self.version = version
+
+
+def digest(value):
+    """Hash isi sebuah keluaran (DataFrame, array, dict, ...), stabil antar proses."""
+    h = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        names = value.columns if isinstance(value, pd.DataFrame) else [value.name]
+        h.update(repr([str(n) for n in names]).encode("utf-8"))
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype.str, value.shape)).encode("utf-8"))
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for k in sorted(value, key=str):
+            h.update(repr(k).encode("utf-8"))
+            h.update(digest(value[k]).encode("utf-8"))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            h.update(digest(item).encode("utf-8"))
+    elif isinstance(value, bytes):
+        h.update(value)
+    else:
+        h.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return h.hexdigest()
+
+
+class Pipeline:
+    """Graf tahap; `run(target)` hanya menghitung tahap yang kuncinya belum ada di cache."""
+
+    def __init__(self, stages, cache=_pipeline_cache):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+
+    def run(self, target, report=None, given=None, **params):
+        """Keluaran tahap `target`; bila `report` (list) diberikan, diisi
+        (tahap, "sumber" / "diberikan" / "cache" / "hitung", detik) untuk tiap tahap
+        yang dilalui. `given` = {tahap: keluaran} dipakai apa adanya (tahap hulunya
+        tidak dijalankan); kunci tahap hilir tetap dari hash isinya."""
+        params = {**DEFAULT_PARAMS, **params}
+        report = [] if report is None else report
+        resolved = {}
+        for name, value in (given or {}).items():
+            resolved[name] = (digest(value), value)
+            report.append((name, "diberikan", 0.0))
+        return self._resolve(target, params, resolved, report)[1]
+
+    def _resolve(self, name, params, resolved, report):
+        """(hash isi, keluaran) satu tahap, setelah seluruh masukannya terselesaikan."""
+        if name in resolved:
+            return resolved[name]
+
+        stage = self.stages[name]
+        inputs = [self._resolve(dep, params, resolved, report) for dep in stage.inputs]
+        used = {p: params[p] for p in stage.params}
+
+        start = time.perf_counter()
+        if not stage.inputs:
+            # Tahap sumber: hash isi file, tanpa membaca ulang datanya
+            entry = (file_hash(used["raw_path"]), used["raw_path"])
+            status = "sumber"
+        else:
+            key = make_key(name, stage.version, sorted(used.items()), [d for d, _ in inputs])
+            missing = object()
+            entry = self.cache.get(key, missing)
+            status = "cache"
+            if entry is missing:
+                runtime = {p: params[p] for p in stage.runtime}
+                value = stage.func(*[v for _, v in inputs], **used, **runtime)
+                entry = (digest(stage.content(value) if stage.content else value), value)
+                self.cache.set(key, entry)
+                status = "hitung"
+        report.append((name, status, time.perf_counter() - start))
+
+        resolved[name] = entry
+        return entry
+
+
+# =====================
+# DEFINISI TAHAP
+# =====================
+def _counts(raw_path, chunksize):
+    counts, n_rows = aggregate_counts(raw_path, chunksize=chunksize)
+    return {"counts": counts, "rows": n_rows}
+
+
+def _counts_content(counts):
+    # Hanya tabel jumlah yang dipakai pivot; jumlah baris mentah sekadar laporan
+    return counts["counts"]
+
+
+def _pivot(counts):
+    return build_pivot(counts["counts"])
+
+
+def _dataset(pivot):
+    # Setara dataset_final.csv: index kelurahan, kolom *_pct
+    return pivot[list(PCT_COLUMNS.values())]
+
+
+def _scaled(dataset):
+    from clustering import FEATURES
+    from stats import StreamingStats
+
+    X = dataset[FEATURES].dropna()
+    scaler = StreamingStats.from_frame(X, FEATURES).to_scaler()
+    return {"scaler": scaler, "X_scaled": scaler.transform(X)}
+
+
+def _model(scaled, n_clusters, random_state, n_init):
+    from clustering import fit_scaled
+
+    X_scaled = scaled["X_scaled"]
+    return fit_scaled(X_scaled, scaled["scaler"], min(n_clusters, len(X_scaled)), random_state, n_init)
+
+
+def _summary(dataset, model):
+    from clustering import FEATURES, summarize
+
+    return summarize(dataset[FEATURES].dropna(), model["labels"])
+
+
+def _cluster_figure(dataset, model):
+    import figures
+    from clustering import FEATURES
+
+    X = dataset[FEATURES].dropna()
+    return figures.render_png(figures.scatter, X["rendah_pct"], X["tinggi_pct"], model["labels"])
+
+
+STAGES = [
+    Stage("raw", None, params=["raw_path"]),
+    Stage("counts", _counts, ["raw"], runtime=["chunksize"], content=_counts_content),
+    Stage("pivot", _pivot, ["counts"]),
+    Stage("dataset", _dataset, ["pivot"]),
+    Stage("scaled", _scaled, ["dataset"]),
+    Stage("model", _model, ["scaled"], ["n_clusters", "random_state", "n_init"]),
+    Stage("summary", _summary, ["dataset", "model"]),
+    Stage("cluster_figure", _cluster_figure, ["dataset", "model"]),
+]
+
+PIPELINE = Pipeline(STAGES)
+
+
+def run(target, report=None, given=None, **params):
+    """Keluaran satu tahap dari pipeline bawaan (lihat STAGES)."""
+    return PIPELINE.run(target, report, given, **params)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jalankan pipeline analisis sampai tahap tertentu")
+    parser.add_argument("target", nargs="?", default="summary", choices=[s.name for s in STAGES])
+    parser.add_argument("--raw", default=RAW_PATH)
+    parser.add_argument("--n-clusters", type=int, default=DEFAULT_PARAMS["n_clusters"])
+    parser.add_argument("--random-state", type=int, default=DEFAULT_PARAMS["random_state"])
+    parser.add_argument("--n-init", type=int, default=DEFAULT_PARAMS["n_init"])
+    args = parser.parse_args()
+
+    report = []
+    result = run(
+        args.target, report, raw_path=args.raw, n_clusters=args.n_clusters,
+        random_state=args.random_state, n_init=args.n_init,
+    )
+    print(pd.DataFrame(report, columns=["tahap", "status", "detik"]).to_string(index=False))
+    if isinstance(result, pd.DataFrame):
+        print()
+        print(result.to_string())
@@ -0,0 +1,55 @@
+import argparse
+import os
+import time
+
+from clustering import DATASET_PATH, FROZEN_MODEL_PATH, refit, run, save_result
+
+# =====================
+# BATCH CLUSTERING (TANPA STREAMLIT)
+# =====================
+# Contoh:
+#   python run_batch.py --out-dir hasil
+# menghasilkan hasil/assignments.csv, hasil/cluster_summary.csv dan
+# hasil/model.pkl (artefak yang dimuat oleh serve.py).
+#
+# Penugasan memakai model beku (frozen_model.json). Fit ulang hanya dilakukan
+# bila diminta:
+#   python run_batch.py --refit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan K-Means untuk semua kelurahan dan simpan hasilnya")
+    parser.add_argument("--data", default=DATASET_PATH, help="dataset fitur per kelurahan")
+    parser.add_argument("--out-dir", default="hasil")
+    parser.add_argument("--n-clusters", type=int, default=3)
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--n-init", type=int, default=10)
+    parser.add_argument("--frozen-model", default=FROZEN_MODEL_PATH)
+    parser.add_argument("--refit", action="store_true",
+                        help="fit ulang centroid pada data terkini dan perbarui model beku")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.refit:
+        report = refit(args.data, args.n_clusters, args.random_state, args.n_init, args.frozen_model)
+        print(f"Refit: {report['n_changed']} kelurahan berpindah klaster")
+        if report["n_changed"]:
+            print(report["changed"].to_string())
+        print()
+
+    result = run(args.data, args.n_clusters, args.random_state, args.n_init, args.frozen_model)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    result["assignments"].to_csv(os.path.join(args.out_dir, "assignments.csv"))
+    result["summary"].to_csv(os.path.join(args.out_dir, "cluster_summary.csv"))
+    save_result(result, os.path.join(args.out_dir, "model.pkl"))
+
+    print(result["summary"].to_string())
+    print(
+        f"\n{len(result['assignments'])} kelurahan -> {args.out_dir}/ "
+        f"({time.perf_counter() - start:.2f} s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import bisect
+import difflib
+import os
+import re
+
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from ingest import RAW_PATH
+from tracing import traced
+
+# =====================
+# INDEKS PENCARIAN KELURAHAN
+# =====================
+# Satu kelurahan bisa dicari lewat nama BPS, nama Kemendagri, kode BPS, kode
+# Kemendagri, atau nama kecamatannya. Semua kunci dinormalisasi (huruf besar,
+# spasi dirapikan) lalu disimpan dalam dict (pencarian persis), list terurut
+# (pencarian awalan via bisect) dan dipakai difflib untuk pencarian mirip.
+_index_cache = DiskCache("search")
+
+INDEX_COLUMNS = [
+    "bps_desa_kelurahan",
+    "bps_kode_desa_kelurahan",
+    "kemendagri_kode_desa_kelurahan",
+    "kemendagri_nama_desa_kelurahan",
+    "bps_nama_kecamatan",
+]
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", str(text)).strip().upper()
+
+
+class KelurahanIndex:
+    def __init__(self, records):
+        """`records`: DataFrame berisi kolom INDEX_COLUMNS (boleh sebagian)."""
+        self.kelurahan = sorted(records["bps_desa_kelurahan"].map(normalize).unique())
+        self.key_to_kel = {}
+        self.kecamatan = {}
+        self.kel_to_kecamatan = {}
+
+        for row in records.drop_duplicates().itertuples(index=False):
+            row = row._asdict()
+            kel = normalize(row["bps_desa_kelurahan"])
+            for col in INDEX_COLUMNS[:4]:
+                if col in row and pd.notna(row[col]):
+                    self.key_to_kel.setdefault(normalize(row[col]), kel)
+            if "bps_nama_kecamatan" in row and pd.notna(row["bps_nama_kecamatan"]):
+                kec = normalize(row["bps_nama_kecamatan"])
+                self.kecamatan.setdefault(kec, set()).add(kel)
+                self.kel_to_kecamatan[kel] = kec
+
+        self.kecamatan = {k: sorted(v) for k, v in self.kecamatan.items()}
+        self.sorted_keys = sorted(self.key_to_kel)
+
+    # -------- satu kueri --------
+    def prefix(self, query, limit=20):
+        query = normalize(query)
+        start = bisect.bisect_left(self.sorted_keys, query)
+        found = []
+        for key in self.sorted_keys[start:]:
+            if not key.startswith(query) or len(found) >= limit:
+                break
+            kel = self.key_to_kel[key]
+            if kel not in found:
+                found.append(kel)
+        return found
+
+    def fuzzy(self, query, limit=5, cutoff=0.75):
+        matches = difflib.get_close_matches(normalize(query), self.sorted_keys, n=limit * 2, cutoff=cutoff)
+        return list(dict.fromkeys(self.key_to_kel[m] for m in matches))[:limit]
+
+    def search(self, query, limit=20):
+        """Urutan: persis -> awalan -> kecamatan -> mirip (fuzzy)."""
+        query = normalize(query)
+        if not query:
+            return list(self.kelurahan)
+
+        found = []
+        if query in self.key_to_kel:
+            found.append(self.key_to_kel[query])
+        found += self.prefix(query, limit)
+        found += self.kecamatan.get(query, [])
+        if not found:
+            found = self.fuzzy(query)
+        return list(dict.fromkeys(found))[:limit]
+
+    # -------- banyak kueri sekaligus --------
+    def resolve(self, queries, fuzzy=True):
+        """Memetakan setiap kueri ke satu nama kelurahan (NaN bila tidak ditemukan)."""
+        keys = pd.Series(queries, dtype=object).map(normalize)
+        resolved = keys.map(self.key_to_kel)
+        if fuzzy:
+            missing = resolved.isna() & (keys != "")
+            for key in keys[missing].unique():
+                best = self.fuzzy(key, limit=1)
+                if best:
+                    resolved[keys == key] = best[0]
+        return resolved
+
+
+@traced("build_index")
+def build_index(names=None, raw_path=RAW_PATH):
+    if os.path.exists(raw_path):
+        from storage import read_columns
+
+        records = read_columns(raw_path, INDEX_COLUMNS, raw=True)
+        # Kode jadi teks; nilai kosong tetap NaN (astype(str) saja menghasilkan "NAN")
+        records = records.astype(str).where(records.notna())
+    else:
+        records = pd.DataFrame({"bps_desa_kelurahan": list(names or [])})
+    return KelurahanIndex(records.dropna(subset=["bps_desa_kelurahan"]))
+
+
+def get_index(names=None, raw_path=RAW_PATH):
+    """Indeks dibangun sekali per versi data mentah (atau per daftar nama bila data mentah tidak ada)."""
+    if os.path.exists(raw_path):
+        key = make_key(file_hash(raw_path), "search")
+    else:
+        key = make_key("names", sorted(names or []))
+    return _index_cache.get_or_compute(key, lambda: build_index(names, raw_path))
+
+
+def parse_queries(text):
+    """Memecah teks tempelan (per baris, koma, atau titik koma) menjadi daftar kueri."""
+    parts = re.split(r"[\n;,]+", text or "")
+    return [p.strip() for p in parts if p.strip()]
+
+
+def batch_lookup(queries, clusters, index, cluster_info):
+    """Klaster + rekomendasi untuk banyak kueri sekaligus (map/merge, tanpa loop per baris)."""
+    result = pd.DataFrame({"kueri": list(queries)})
+    result["kelurahan"] = index.resolve(result["kueri"]).to_numpy()
+    result["kecamatan"] = result["kelurahan"].map(index.kel_to_kecamatan)
+
+    normalized = pd.Series(clusters.to_numpy(), index=clusters.index.map(normalize))
+    result["klaster"] = result["kelurahan"].map(normalized).astype("Int64")
+
+    info = pd.DataFrame.from_dict(cluster_info, orient="index")
+    info.index = info.index.astype("Int64")
+    return result.merge(
+        info[["nama", "rekomendasi"]], left_on="klaster", right_index=True, how="left"
+    )
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from clustering import CLUSTER_INFO, load_result, run
+from search import get_index, normalize
+
+# =====================
+# LAYANAN LOOKUP KLASTER (HTTP + JSON)
+# =====================
+# Model dimuat sekali saat start. Jawaban JSON untuk setiap kelurahan (dan
+# setiap kode BPS / Kemendagri-nya) dibuat di depan, sehingga satu request
+# hanya berupa satu lookup dictionary.
+#
+#   python serve.py --model hasil/model.pkl --port 8600
+#   curl localhost:8600/kelurahan/ANCOL
+#   curl localhost:8600/kelurahan/3273250002
+#   curl -X POST localhost:8600/batch -d '{"queries": ["ancol", "sukarasa"]}'
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+class LookupTable:
+    def __init__(self, result):
+        self.result = result
+        assignments = result["assignments"]
+        self.index = get_index(assignments.index.tolist())
+
+        self.records = {}
+        for kel, row in assignments.iterrows():
+            info = CLUSTER_INFO.get(int(row["cluster"]), {})
+            self.records[normalize(kel)] = {
+                "kelurahan": kel,
+                "kecamatan": self.index.kel_to_kecamatan.get(normalize(kel)),
+                "cluster": int(row["cluster"]),
+                "nama_klaster": info.get("nama"),
+                "rekomendasi": info.get("rekomendasi"),
+                "rendah_pct": float(row["rendah_pct"]),
+                "menengah_pct": float(row["menengah_pct"]),
+                "tinggi_pct": float(row["tinggi_pct"]),
+            }
+
+        # Kunci alternatif (kode, nama Kemendagri) menunjuk ke bytes yang sama
+        encoded = {kel: _dumps(rec) for kel, rec in self.records.items()}
+        self.responses = dict(encoded)
+        for key, kel in self.index.key_to_kel.items():
+            if kel in encoded:
+                self.responses.setdefault(key, encoded[kel])
+
+        summary = result["summary"].reset_index().to_dict(orient="records")
+        self.summary = _dumps({"version": result["version"], "clusters": summary})
+        self.health = _dumps({
+            "status": "ok",
+            "version": result["version"],
+            "kelurahan": len(self.records),
+        })
+
+    def lookup(self, query):
+        body = self.responses.get(normalize(query))
+        if body is not None:
+            return 200, body
+        return 404, _dumps({"error": "kelurahan tidak ditemukan", "saran": self.index.search(query, limit=5)})
+
+    def batch(self, queries):
+        kelurahan = self.index.resolve(queries)
+        out = []
+        for query, kel in zip(queries, kelurahan):
+            record = self.records.get(kel) if isinstance(kel, str) else None
+            out.append({"kueri": query, **(record or {"kelurahan": None})})
+        return _dumps(out)
+
+
+def make_handler(table, verbose=False):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/health":
+                self._send(200, table.health)
+            elif path == "/summary":
+                self._send(200, table.summary)
+            elif path.startswith("/kelurahan/"):
+                self._send(*table.lookup(unquote(path[len("/kelurahan/"):])))
+            else:
+                self._send(404, _dumps({"error": "endpoint tidak dikenal"}))
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/batch":
+                self._send(404, _dumps({"error": "endpoint tidak dikenal"}))
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                queries = json.loads(self.rfile.read(length) or b"{}")["queries"]
+            except (ValueError, KeyError, TypeError):
+                self._send(400, _dumps({"error": 'body harus berupa {"queries": [...]}'}))
+                return
+            self._send(200, table.batch([str(q) for q in queries]))
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP lookup klaster kelurahan")
+    parser.add_argument("--model", default=os.path.join("hasil", "model.pkl"),
+                        help="artefak dari run_batch.py; bila tidak ada, model di-fit dari dataset")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    result = load_result(args.model) if os.path.exists(args.model) else run()
+    table = LookupTable(result)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(table, args.verbose))
+    print(f"Melayani {len(table.records)} kelurahan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, make_key
+from tracing import traced
+
+# =====================
+# STABILITAS KLASTER (BOOTSTRAP)
+# =====================
+# Ratusan fit ulang K-Means, masing-masing pada subsampel acak kelurahan
+# (tanpa pengembalian) dengan seed berbeda. Matriks ko-asosiasi M[i, j] =
+# berapa kali i dan j masuk klaster yang sama / berapa kali keduanya terambil.
+# Keyakinan penugasan satu kelurahan = rata-rata M terhadap anggota lain di
+# klasternya sendiri (item consensus, Monti dkk. 2003): 1.0 berarti selalu
+# bersama, mendekati 0.5 ke bawah berarti sering berpindah.
+# Matriks berukuran n x n, cukup kecil untuk ratusan kelurahan.
+N_REPLICATES = 200
+SAMPLE_FRAC = 0.8
+
+_stability_cache = DiskCache("stability")
+
+
+def _fit_chunk(X_scaled, n_clusters, seeds, sample_frac):
+    """Sekelompok replikasi dalam satu worker; mengembalikan jumlah parsial (bersama, terambil)."""
+    from sklearn.cluster import KMeans
+
+    n = len(X_scaled)
+    m = max(int(round(n * sample_frac)), n_clusters)
+    together = np.zeros((n, n), dtype=np.int32)
+    sampled = np.zeros((n, n), dtype=np.int32)
+
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        idx = np.sort(rng.choice(n, size=m, replace=False))
+        labels = KMeans(n_clusters=n_clusters, random_state=seed, n_init=1).fit_predict(X_scaled[idx])
+
+        # Pembaruan tervektorisasi: one-hot H (m x k) -> H @ H.T = pasangan seklaster
+        onehot = np.zeros((m, n_clusters), dtype=np.int32)
+        onehot[np.arange(m), labels] = 1
+        together[np.ix_(idx, idx)] += onehot @ onehot.T
+        sampled[np.ix_(idx, idx)] += 1
+
+    return together, sampled
+
+
+@traced("bootstrap_stability")
+def run_stability(X_scaled, n_clusters, n_replicates=N_REPLICATES, sample_frac=SAMPLE_FRAC,
+                  seed=0, max_workers=None):
+    """Matriks ko-asosiasi dari `n_replicates` fit ulang, dibagi rata ke process pool."""
+    X_scaled = np.ascontiguousarray(X_scaled, dtype=np.float64)
+    seeds = [seed + i for i in range(n_replicates)]
+
+    if max_workers is None:
+        max_workers = min(n_replicates, os.cpu_count() or 1)
+    # Satu potongan seed per worker: hanya 2 matriks parsial per worker yang dikirim balik
+    chunks = [c.tolist() for c in np.array_split(seeds, max(max_workers, 1)) if len(c)]
+
+    if max_workers <= 1:
+        parts = [_fit_chunk(X_scaled, n_clusters, chunk, sample_frac) for chunk in chunks]
+    else:
+        # "spawn" agar aman dijalankan dari thread server Streamlit
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_fit_chunk, X_scaled, n_clusters, chunk, sample_frac) for chunk in chunks]
+            parts = [f.result() for f in futures]
+
+    together = sum(p[0] for p in parts)
+    sampled = sum(p[1] for p in parts)
+    return together / np.maximum(sampled, 1)
+
+
+def confidence(co_association, labels):
+    """Keyakinan per kelurahan: rata-rata ko-asosiasi dengan anggota lain klasternya."""
+    labels = np.asarray(labels)
+    same = labels[:, None] == labels[None, :]
+    np.fill_diagonal(same, False)
+    n_same = same.sum(axis=1)
+    total = (co_association * same).sum(axis=1)
+    # Klaster beranggota satu: tidak ada pembanding, dianggap yakin penuh
+    return np.where(n_same > 0, total / np.maximum(n_same, 1), 1.0)
+
+
+def get_stability(X_scaled, labels, index, version, scaler, n_clusters, n_replicates=N_REPLICATES,
+                  sample_frac=SAMPLE_FRAC, seed=0):
+    """Ko-asosiasi + keyakinan per kelurahan, dihitung sekali per versi data, scaler dan label acuan.
+
+    `scaler` = digest mean/scale (clustering.scaler_digest) yang menghasilkan
+    X_scaled; model beku dengan data sama tetapi scaler lain tidak berbagi cache.
+
+    Mengembalikan dict: "co_association" (DataFrame n x n), "confidence" (Series),
+    "per_cluster" (rata-rata keyakinan per klaster), "n_replicates".
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    key = make_key(version, "stability", scaler, n_clusters, n_replicates, sample_frac, seed, labels.tobytes())
+
+    def compute():
+        matrix = run_stability(X_scaled, n_clusters, n_replicates, sample_frac, seed)
+        conf = pd.Series(confidence(matrix, labels), index=index, name="keyakinan")
+        return {
+            "co_association": pd.DataFrame(matrix, index=index, columns=index),
+            "confidence": conf,
+            "per_cluster": conf.groupby(pd.Series(labels, index=index, name="cluster")).mean(),
+            "n_replicates": n_replicates,
+        }
+
+    return _stability_cache.get_or_compute(key, compute)
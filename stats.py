@@ -0,0 +1,280 @@
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, make_key
+from cube import GROUP_MATRIX, GROUPS, DataCube
+from ingest import CHUNK_SIZE, LEVELS, PCT_COLUMNS, RAW_PATH, normalize_jenis
+
+# =====================
+# STATISTIK FITUR STREAMING
+# =====================
+# Satu lintasan, bisa diperbarui per batch dan digabung (merge) antar batch:
+#   - mean & varians: Welford / Chan (stabil secara numerik, tanpa simpan data)
+#   - kuantil: sketsa terurut berbobot per fitur. Selama jumlah baris <=
+#     SKETCH_SIZE semua nilai disimpan, sehingga kuantil dan outlier eksak
+#     (kelurahan-semester Kota Bandung ~2.600 baris). Di atas itu sketsa
+#     dipadatkan ke SKETCH_SIZE titik berjarak rank sama: galat rank <=
+#     1/SKETCH_SIZE, mengikuti sebaran data (tidak bergantung lebar bin tetap).
+#   - outlier IQR: batas Q1 - 1.5*IQR .. Q3 + 1.5*IQR dari kuantil tersebut
+# Statistik per semester disimpan di cache; semester baru cukup dihitung
+# sendiri lalu digabung, tanpa memindai ulang seluruh riwayat.
+SKETCH_SIZE = 4096
+_stats_cache = DiskCache("stats")
+
+
+class StreamingStats:
+    def __init__(self, columns, sketch_size=SKETCH_SIZE):
+        self.columns = list(columns)
+        self.sketch_size = sketch_size
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        # Nilai terurut per kolom (m x fitur) dan bobotnya; bobot 1 = nilai asli
+        self.points = np.empty((0, k))
+        self.weights = np.empty((0, k))
+
+    @classmethod
+    def from_frame(cls, df, columns, sketch_size=SKETCH_SIZE):
+        stats = cls(columns, sketch_size)
+        stats.update(df[list(columns)].to_numpy(dtype=float))
+        return stats
+
+    @property
+    def exact(self):
+        """True bila semua nilai masih tersimpan (kuantil dan outlier eksak)."""
+        return len(self.points) == self.n
+
+    # -------- pembaruan --------
+    def update(self, X):
+        """Menambahkan satu batch baris (array n x fitur); NaN diabaikan per baris."""
+        X = np.asarray(X, dtype=float)
+        X = X[~np.isnan(X).any(axis=1)]
+        if not len(X):
+            return self
+        batch = StreamingStats(self.columns, self.sketch_size)
+        batch.n = len(X)
+        batch.mean = X.mean(axis=0)
+        batch.m2 = ((X - batch.mean) ** 2).sum(axis=0)
+        batch.min = X.min(axis=0)
+        batch.max = X.max(axis=0)
+        batch.points = np.sort(X, axis=0)
+        batch.weights = np.ones_like(X)
+        batch._compress()
+        return self.merge(batch)
+
+    def merge(self, other):
+        """Menggabungkan statistik batch lain (rumus paralel Chan et al. + gabungan sketsa)."""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.n / n
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+        points = np.concatenate([self.points, other.points])
+        weights = np.concatenate([self.weights, other.weights])
+        order = np.argsort(points, axis=0, kind="stable")
+        self.points = np.take_along_axis(points, order, axis=0)
+        self.weights = np.take_along_axis(weights, order, axis=0)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """Memadatkan sketsa ke sketch_size titik berjarak rank sama (hanya bila melebihi)."""
+        m = self.sketch_size
+        if len(self.points) <= m:
+            return
+        targets = (np.arange(m) + 0.5) / m
+        points = np.empty((m, len(self.columns)))
+        for j in range(len(self.columns)):
+            points[:, j] = np.interp(targets, self._positions(j), self.points[:, j])
+        self.points = points
+        self.weights = np.broadcast_to(self.weights.sum(axis=0) / m, points.shape).copy()
+
+    def _positions(self, j):
+        """Posisi rank (0..1) titik tengah bobot tiap nilai sketsa kolom j."""
+        w = self.weights[:, j]
+        return (np.cumsum(w) - w / 2) / w.sum()
+
+    # -------- pembacaan --------
+    @property
+    def var(self):
+        """Varians populasi (ddof=0), sama dengan StandardScaler."""
+        return self.m2 / max(self.n, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    def quantile(self, q):
+        """Kuantil per fitur (interpolasi linear, sama dengan pandas bila sketsa eksak)."""
+        q = np.atleast_1d(q)
+        if self.exact:
+            return np.quantile(self.points, q, axis=0).T
+        out = np.empty((len(self.columns), len(q)))
+        for j in range(len(self.columns)):
+            out[j] = np.interp(q, self._positions(j), self.points[:, j])
+        # Tidak mungkin di luar rentang data yang pernah terlihat
+        return np.clip(out, self.min[:, None], self.max[:, None])
+
+    def iqr_bounds(self, k=1.5):
+        q1, q3 = self.quantile([0.25, 0.75]).T
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+    def outlier_counts(self, k=1.5):
+        """Jumlah nilai di luar batas IQR (eksak selama sketsa belum dipadatkan)."""
+        low, high = self.iqr_bounds(k)
+        outside = (self.points < low[None, :]) | (self.points > high[None, :])
+        return np.rint((self.weights * outside).sum(axis=0)).astype(np.int64)
+
+    def to_scaler(self):
+        """StandardScaler yang sudah 'fit' dari statistik ini (tanpa lintasan data lagi)."""
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler()
+        scaler.mean_ = self.mean.copy()
+        scaler.var_ = self.var.copy()
+        scaler.scale_ = np.where(self.std > 0, self.std, 1.0)
+        scaler.n_samples_seen_ = self.n
+        scaler.n_features_in_ = len(self.columns)
+        scaler.feature_names_in_ = np.array(self.columns, dtype=object)
+        return scaler
+
+    def summary(self, k=1.5):
+        """Tabel ringkas per fitur: jumlah, mean, std, min, kuartil, maks, batas & jumlah outlier."""
+        q = self.quantile([0.25, 0.5, 0.75])
+        low, high = self.iqr_bounds(k)
+        return pd.DataFrame({
+            "n": self.n,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "q1": q[:, 0],
+            "median": q[:, 1],
+            "q3": q[:, 2],
+            "max": self.max,
+            "batas_bawah": low,
+            "batas_atas": high,
+            "outlier": self.outlier_counts(k),
+        }, index=pd.Index(self.columns, name="fitur"))
+
+
+def get_feature_stats(df, version, columns):
+    """Statistik fitur per kelurahan, dihitung sekali per versi data."""
+    key = make_key(version, "feature_stats", list(columns), SKETCH_SIZE)
+    return _stats_cache.get_or_compute(key, lambda: StreamingStats.from_frame(df, columns))
+
+
+def outlier_rows(df, stats, k=1.5):
+    """Baris (kelurahan) yang punya minimal satu fitur di luar batas IQR."""
+    low, high = stats.iqr_bounds(k)
+    X = df[stats.columns].to_numpy(dtype=float)
+    mask = (X < low) | (X > high)
+    return df[mask.any(axis=1)]
+
+
+# =====================
+# STATISTIK PER SEMESTER (INKREMENTAL)
+# =====================
+# File mentah diperlakukan sebagai log yang hanya bertambah: yang disimpan adalah
+# jumlah per (kelurahan, jenjang) dan StreamingStats tiap semester, ditambah
+# posisi byte terakhir yang sudah diproses dan hash isi sebelum posisi itu.
+# Bila awal file tidak berubah, hanya baris baru di ekor file yang diparse dan
+# hanya semester yang tersentuh yang dihitung ulang. Bila awal file berubah
+# (data lama dikoreksi), semuanya dibangun ulang.
+PERIOD_COLUMNS = [
+    "bps_kode_kecamatan", "bps_kode_desa_kelurahan", "tahun", "semester",
+    "jenis_pendidikan", "jumlah_penduduk",
+]
+UNIT = ["bps_kode_kecamatan", "bps_kode_desa_kelurahan"]
+
+
+def _prefix_hash(f, n_bytes):
+    """Hash n_bytes pertama file (hanya dibaca, tidak diparse)."""
+    f.seek(0)
+    h = hashlib.sha256()
+    remaining = n_bytes
+    while remaining > 0:
+        block = f.read(min(1 << 20, remaining))
+        if not block:
+            break
+        h.update(block)
+        remaining -= len(block)
+    return h.hexdigest()
+
+
+def _parse_rows(header, data, chunksize=CHUNK_SIZE):
+    """Jumlah per (tahun, semester, kelurahan, jenjang) dari potongan baris CSV mentah."""
+    reader = pd.read_csv(
+        io.BytesIO(header + data), usecols=PERIOD_COLUMNS,
+        dtype={"jenis_pendidikan": "category", "jumlah_penduduk": "int64"}, chunksize=chunksize,
+    )
+    parts = []
+    for chunk in reader:
+        chunk["jenis_pendidikan"] = normalize_jenis(chunk["jenis_pendidikan"])
+        parts.append(chunk.groupby(["tahun", "semester"] + UNIT + ["jenis_pendidikan"], observed=True)
+                     ["jumlah_penduduk"].sum())
+    if not parts:
+        return pd.Series(dtype="int64")
+    return pd.concat(parts).groupby(level=list(range(5)), observed=True).sum()
+
+
+def _semester_stats(counts, columns):
+    """StreamingStats proporsi rendah/menengah/tinggi untuk counts (kelurahan x jenjang) satu semester."""
+    pct_columns = [PCT_COLUMNS[g] for g in GROUPS]
+    take = [pct_columns.index(c) for c in columns]
+    # Kelurahan tanpa penduduk di semester itu -> NaN, diabaikan
+    pct = DataCube.shares(counts.reindex(columns=LEVELS, fill_value=0).to_numpy() @ GROUP_MATRIX)
+    return StreamingStats(columns).update(pct[:, take])
+
+
+def period_stats(columns, raw_path=RAW_PATH):
+    """Statistik kelurahan-semester seluruh riwayat, digabung dari statistik tiap semester.
+
+    Hanya baris yang ditambahkan sejak pemanggilan terakhir yang dibaca dan
+    diparse (lihat catatan di atas); hasil per semester tersimpan di cache disk.
+    """
+    columns = list(columns)
+    key = make_key("period_state", os.path.abspath(raw_path), columns, SKETCH_SIZE)
+    state = _stats_cache.get(key)
+
+    with open(raw_path, "rb") as f:
+        header = f.readline()
+        size = os.fstat(f.fileno()).st_size
+        if (state is None or state["header"] != header or size < state["offset"]
+                or _prefix_hash(f, state["offset"]) != state["prefix"]):
+            state = {"header": header, "offset": len(header), "counts": {}, "stats": {}}
+        f.seek(state["offset"])
+        tail = f.read()
+
+    complete = tail[:tail.rfind(b"\n") + 1]  # baris terakhir yang belum lengkap ditunda
+    if complete:
+        counts = _parse_rows(header, complete)
+        for period, part in counts.groupby(level=["tahun", "semester"]):
+            period = (int(period[0]), int(period[1]))
+            added = part.droplevel(["tahun", "semester"]).unstack("jenis_pendidikan", fill_value=0)
+            before = state["counts"].get(period)
+            merged = added if before is None else before.add(added, fill_value=0).astype("int64")
+            state["counts"][period] = merged
+            state["stats"][period] = _semester_stats(merged, columns)
+
+        state["offset"] += len(complete)
+        with open(raw_path, "rb") as f:
+            state["prefix"] = _prefix_hash(f, state["offset"])
+        _stats_cache.set(key, state)
+
+    total = StreamingStats(columns)
+    for period in sorted(state["stats"]):
+        total.merge(state["stats"][period])
+    return total
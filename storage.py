@@ -0,0 +1,167 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cache import CACHE_DIR, file_hash
+
+# =====================
+# PENYIMPANAN KOLUMNAR (PARQUET)
+# =====================
+# CSV diparse sekali, lalu disimpan sebagai Parquet: kolom teks berulang
+# (provinsi, kota, kecamatan, kelurahan, jenjang) di-dictionary-encode dan
+# kolom angka memakai integer sempit. Setelah itu pembacaan cukup memuat
+# kolom yang diperlukan saja.
+STORE_DIR = os.path.join(CACHE_DIR, "columnar")
+SOURCE_HASH_KEY = b"source_sha256"
+
+RAW_CATEGORICAL = [
+    "nama_provinsi",
+    "bps_nama_kabupaten_kota",
+    "bps_nama_kecamatan",
+    "bps_desa_kelurahan",
+    "kemendagri_kode_kecamatan",
+    "kemendagri_nama_kecamatan",
+    "kemendagri_kode_desa_kelurahan",
+    "kemendagri_nama_desa_kelurahan",
+    "jenis_pendidikan",
+    "satuan",
+]
+
+RAW_NARROW = {
+    "id": "int32",
+    "kode_provinsi": "int8",
+    "bps_kode_kabupaten_kota": "int32",  # kode kota sintetis bisa > 32767 (lihat synthetic.kota_digits)
+    "bps_kode_kecamatan": "int32",
+    "bps_kode_desa_kelurahan": "int64",
+    "jumlah_penduduk": "int32",
+    "semester": "int8",
+    "tahun": "int16",
+}
+
+
+def _parquet_path(csv_path):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(STORE_DIR, f"{name}.parquet")
+
+
+def _raw_chunks(csv_path, chunksize):
+    dtype = {col: "category" for col in RAW_CATEGORICAL}
+    for chunk in pd.read_csv(csv_path, dtype=dtype, chunksize=chunksize):
+        for col, narrow in RAW_NARROW.items():
+            if col in chunk.columns:
+                chunk[col] = _narrow(chunk[col], narrow)
+        yield chunk
+
+
+def _narrow(series, dtype):
+    # astype ke integer sempit membungkus nilai di luar rentang tanpa peringatan
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        raise ValueError(
+            f"Kolom {series.name} berisi nilai di luar rentang {dtype} "
+            f"({series.min()}..{series.max()}); perlebar RAW_NARROW."
+        )
+    return series.astype(dtype)
+
+
+def _fixed_schema(schema):
+    # Lebar index dictionary dari pandas bergantung pada jumlah kategori per chunk;
+    # diseragamkan ke int32 agar semua chunk bisa ditulis ke file yang sama.
+    fields = [
+        pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type))
+        if pa.types.is_dictionary(f.type) else f
+        for f in schema
+    ]
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def _read_derived_csv(csv_path):
+    # Dataset turunan kecil (satu baris per kelurahan); index disimpan sebagai kolom biasa
+    df = pd.read_csv(csv_path)
+    unnamed = [c for c in df.columns if c.startswith("Unnamed:")]
+    return df.drop(columns=unnamed)
+
+
+def _header_frame(csv_path):
+    # Frame kosong dengan tipe kolom yang sama seperti chunk data mentah
+    dtype = {col: "category" for col in RAW_CATEGORICAL}
+    df = pd.read_csv(csv_path, dtype=dtype, nrows=0)
+    return df.astype({col: narrow for col, narrow in RAW_NARROW.items() if col in df.columns})
+
+
+def _open_writer(path, table, source_hash):
+    schema = _fixed_schema(table.schema)
+    schema = schema.with_metadata({**schema.metadata, SOURCE_HASH_KEY: source_hash})
+    return pq.ParquetWriter(path, schema, compression="zstd")
+
+
+def write_parquet(csv_path, raw=False, chunksize=100_000):
+    """Konversi satu CSV ke Parquet (atomik), dengan hash CSV sumber disimpan di metadata.
+
+    Data mentah dikonversi per chunk sehingga memori tidak bergantung pada ukuran file.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _parquet_path(csv_path)
+    source_hash = file_hash(csv_path).encode("ascii")
+
+    if raw:
+        chunks = _raw_chunks(csv_path, chunksize)
+    else:
+        chunks = [_read_derived_csv(csv_path)]
+
+    fd, tmp_path = tempfile.mkstemp(dir=STORE_DIR, suffix=".tmp")
+    os.close(fd)
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = _open_writer(tmp_path, table, source_hash)
+            writer.write_table(table.cast(writer.schema))
+        if writer is None:
+            # CSV hanya berisi header: tetap ditulis sebagai tabel kosong berskema sama
+            table = pa.Table.from_pandas(_header_frame(csv_path), preserve_index=False)
+            writer = _open_writer(tmp_path, table, source_hash)
+            writer.write_table(table.cast(writer.schema))
+        writer.close()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def ensure_parquet(csv_path, raw=False):
+    """Path Parquet untuk CSV ini; ditulis ulang hanya bila isi CSV berubah."""
+    path = _parquet_path(csv_path)
+    if os.path.exists(path):
+        stored = pq.read_schema(path).metadata or {}
+        if stored.get(SOURCE_HASH_KEY) == file_hash(csv_path).encode("ascii"):
+            return path
+    return write_parquet(csv_path, raw=raw)
+
+
+def read_columns(csv_path, columns=None, raw=False):
+    """Membaca (sebagian) kolom dari versi Parquet sebuah CSV."""
+    path = ensure_parquet(csv_path, raw=raw)
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def iter_batches(csv_path, columns=None, batch_size=100_000, raw=True):
+    """Membaca versi Parquet per batch, sebagai pengganti `read_csv(chunksize=...)`."""
+    parquet_file = pq.ParquetFile(ensure_parquet(csv_path, raw=raw))
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield batch.to_pandas()
+
+
+if __name__ == "__main__":
+    from ingest import DATASET_PATH, EDA_PATH, RAW_PATH
+
+    for path, is_raw in ((RAW_PATH, True), (DATASET_PATH, False), (EDA_PATH, False)):
+        if os.path.exists(path):
+            out = write_parquet(path, raw=is_raw)
+            print(f"{path} ({os.path.getsize(path):,} B) -> {out} ({os.path.getsize(out):,} B)")
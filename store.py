@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# =====================
+# FEATURE STORE BERSAMA (READ-ONLY)
+# =====================
+# Satu salinan fitur per kelurahan untuk seluruh sesi Streamlit. Array NumPy
+# dikunci (writeable=False) dan DataFrame yang dibagikan hanya pembungkus
+# tanpa salinan di atas array tersebut, sehingga penulisan tidak sengaja ke
+# data bersama langsung gagal ("assignment destination is read-only").
+# Hasil per sesi (mis. label klaster) disimpan sebagai array terpisah.
+KEY_COLUMN = "bps_desa_kelurahan"
+
+
+def _freeze(array):
+    # Urutan kolom (Fortran) agar tiap fitur berupa blok memori yang berurutan
+    array = np.asfortranarray(array)
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class FeatureStore:
+    names: np.ndarray      # nama kelurahan (object), sejajar baris `values`
+    values: np.ndarray     # (kelurahan, fitur) float64
+    columns: tuple
+    version: str
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.names.nbytes
+
+    def column(self, name):
+        """Kolom sebagai view 1-D read-only."""
+        return self.values[:, self.columns.index(name)]
+
+    def frame(self):
+        """DataFrame ber-index kelurahan (format `dfp`) tanpa menyalin data."""
+        return pd.DataFrame(
+            self.values, index=pd.Index(self.names, name=KEY_COLUMN),
+            columns=list(self.columns), copy=False,
+        )
+
+    def flat_frame(self):
+        """DataFrame dengan kolom kelurahan (format `df_eda`) tanpa menyalin data."""
+        data = {KEY_COLUMN: self.names}
+        data.update({c: self.column(c) for c in self.columns})
+        return pd.DataFrame(data, copy=False)
+
+    def series(self, values, name=None):
+        """Array hasil per sesi (sejajar baris store) sebagai Series ber-index kelurahan."""
+        return pd.Series(values, index=pd.Index(self.names, name=KEY_COLUMN), name=name, copy=False)
+
+
+def build_store(df, columns, version):
+    """Store dari frame berkolom kelurahan + `columns`."""
+    columns = tuple(columns)
+    return FeatureStore(
+        names=_freeze(df[KEY_COLUMN].to_numpy(dtype=object)),
+        values=_freeze(df[list(columns)].to_numpy(dtype=np.float64)),
+        columns=columns,
+        version=version,
+    )
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, make_key
+from tracing import traced
+
+_sweep_cache = DiskCache("sweep")
+
+
+def _fit_one(X_scaled, k, seed, n_init):
+    """Fit satu model (k, seed) dan hitung ketiga metrik sekaligus."""
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import davies_bouldin_score, silhouette_score
+
+    km = KMeans(n_clusters=k, random_state=seed, n_init=n_init)
+    labels = km.fit_predict(X_scaled)
+
+    return {
+        "k": k,
+        "seed": seed,
+        "inertia": float(km.inertia_),
+        "silhouette": float(silhouette_score(X_scaled, labels)),
+        "davies_bouldin": float(davies_bouldin_score(X_scaled, labels)),
+    }
+
+
+@traced("elbow_sweep")
+def run_sweep(X_scaled, tasks, n_init=10, max_workers=None):
+    """Menjalankan daftar (k, seed) secara paralel di process pool.
+
+    Mengembalikan list hasil (dict per (k, seed)) dengan urutan sama seperti `tasks`.
+    """
+    X_scaled = np.ascontiguousarray(X_scaled, dtype=np.float64)
+    tasks = list(tasks)
+
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        return [_fit_one(X_scaled, k, seed, n_init) for k, seed in tasks]
+
+    # "spawn" agar aman dijalankan dari thread server Streamlit
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        futures = [pool.submit(_fit_one, X_scaled, k, seed, n_init) for k, seed in tasks]
+        return [f.result() for f in futures]
+
+
+def summarize_sweep(table):
+    """Rata-rata dan simpangan baku tiap metrik per k (dirata-rata atas seed)."""
+    summary = table.groupby("k")[["inertia", "silhouette", "davies_bouldin"]].agg(["mean", "std"])
+    return summary.fillna(0.0)
+
+
+def get_sweep(X_scaled, version, scaler, k_values, seeds=(42,), n_init=10):
+    """Tabel metrik untuk seluruh (k, seed); satu baris per (k, seed).
+
+    Tiap (k, seed) di-memo sendiri per versi data dan parameter scaler (`scaler`
+    = digest mean/scale), sehingga rentang slider baru hanya mem-fit k / seed
+    yang belum pernah dihitung.
+    """
+    tasks = [(int(k), int(s)) for k in k_values for s in seeds]
+    keys = {task: make_key(version, "sweep", scaler, n_init, *task) for task in tasks}
+
+    missing = object()
+    rows = {task: _sweep_cache.get(keys[task], missing) for task in tasks}
+    todo = [task for task in tasks if rows[task] is missing]
+    if todo:
+        for task, row in zip(todo, run_sweep(X_scaled, todo, n_init=n_init)):
+            _sweep_cache.set(keys[task], row)
+            rows[task] = row
+
+    return pd.DataFrame([rows[task] for task in tasks]).sort_values(["k", "seed"]).reset_index(drop=True)
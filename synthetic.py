@@ -0,0 +1,148 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingest import ALIASES, LEVELS, RAW_PATH
+
+# =====================
+# GENERATOR DATA SINTETIS (SKEMA SAMA DENGAN DATA MENTAH BPS)
+# =====================
+# Komposisi pendidikan tiap kelurahan sintetis diambil dari kelurahan asli
+# (dipilih acak) lalu diberi derau, sehingga pola klaster tetap mirip data
+# Kota Bandung. File ditulis per chunk agar jutaan baris tidak perlu muat di memori.
+RAW_COLUMNS = [
+    "id", "kode_provinsi", "nama_provinsi", "bps_kode_kabupaten_kota",
+    "bps_nama_kabupaten_kota", "bps_kode_kecamatan", "bps_nama_kecamatan",
+    "bps_kode_desa_kelurahan", "bps_desa_kelurahan", "kemendagri_kode_kecamatan",
+    "kemendagri_nama_kecamatan", "kemendagri_kode_desa_kelurahan",
+    "kemendagri_nama_desa_kelurahan", "jenis_pendidikan", "jumlah_penduduk",
+    "satuan", "semester", "tahun",
+]
+
+KELURAHAN_PER_KECAMATAN = 20
+KECAMATAN_PER_KOTA = 30
+
+# Ejaan lama jenjang (dipakai pada periode pertama, seperti data asli 2017)
+_OLD_SPELLING = {new: old for old, new in ALIASES.items()}
+
+
+def _base_shares(raw_path=RAW_PATH):
+    """Komposisi 10 jenjang tiap kelurahan asli (baris = kelurahan, jumlah = 1)."""
+    try:
+        from cube import get_cube
+
+        cube = get_cube(raw_path)
+        return cube.shares(cube.total())
+    except (FileNotFoundError, OSError):
+        # Tanpa data asli: komposisi acak yang masih masuk akal
+        rng = np.random.default_rng(0)
+        return rng.dirichlet(np.full(len(LEVELS), 2.0), size=150)
+
+
+def periods_between(tahun_awal, tahun_akhir):
+    return [(t, s) for t in range(tahun_awal, tahun_akhir + 1) for s in (1, 2)]
+
+
+def kota_digits(n_kelurahan):
+    """Lebar kode kota: 2 digit seperti data asli (3273), melebar bila kota sintetis > 100."""
+    n_kota = -(-n_kelurahan // (KELURAHAN_PER_KECAMATAN * KECAMATAN_PER_KOTA))
+    return max(2, len(str(max(n_kota - 1, 0))))
+
+
+def _kelurahan_labels(kel_ids, digits=2):
+    """Kode & nama wilayah untuk sekumpulan id kelurahan (vektor).
+
+    Kode kecamatan / kelurahan memakai nomor lokal di dalam induknya dan kode
+    kota selebar `digits`, sehingga setiap kode unik untuk berapa pun jumlah
+    kelurahan (lihat kota_digits). Nama kelurahan sengaja tidak unik: kelurahan
+    pertama tiap kecamatan memakai nama yang sama di seluruh kecamatan satu kota
+    (seperti SINDANG JAYA di ARCAMANIK dan MANDALAJATI), sehingga agregasi yang
+    mengelompokkan per nama, bukan per kode, langsung terlihat salah.
+    """
+    kota = kel_ids // (KELURAHAN_PER_KECAMATAN * KECAMATAN_PER_KOTA)
+    kec = kel_ids // KELURAHAN_PER_KECAMATAN
+    kec_lokal = kec % KECAMATAN_PER_KOTA + 1
+    kel_lokal = kel_ids % KELURAHAN_PER_KECAMATAN + 1
+    kode_kota = 32 * 10 ** digits + kota
+    kode_kec = kode_kota.astype(np.int64) * 1000 + kec_lokal * 10
+    kode_kel = kode_kec * 1000 + kel_lokal
+    nama_kel = [
+        f"KELURAHAN {k:07d}"
+        for k in np.where(kel_lokal == 1, kota * KELURAHAN_PER_KECAMATAN * KECAMATAN_PER_KOTA, kel_ids)
+    ]
+    kemendagri_kec = pd.Series(
+        [f"32.{k:0{digits}d}.{c:02d}" for k, c in zip(kota, kec_lokal)]
+    )
+    return pd.DataFrame({
+        "kode_provinsi": 32,
+        "nama_provinsi": "JAWA BARAT",
+        "bps_kode_kabupaten_kota": kode_kota,
+        "bps_nama_kabupaten_kota": [f"KOTA SINTETIS {k:03d}" for k in kota],
+        "bps_kode_kecamatan": kode_kec,
+        "bps_nama_kecamatan": [f"KECAMATAN {k:05d}" for k in kec],
+        "bps_kode_desa_kelurahan": kode_kel,
+        "bps_desa_kelurahan": nama_kel,
+        "kemendagri_kode_kecamatan": kemendagri_kec,
+        "kemendagri_nama_kecamatan": [f"KECAMATAN {k:05d}" for k in kec],
+        "kemendagri_kode_desa_kelurahan": kemendagri_kec + "." + (1000 + kel_lokal).astype(str),
+        "kemendagri_nama_desa_kelurahan": nama_kel,
+    })
+
+
+def generate(out_path, n_kelurahan, tahun_awal=2017, tahun_akhir=2025,
+             seed=42, chunk_kelurahan=5_000, raw_path=RAW_PATH):
+    """Menulis CSV sintetis dengan n_kelurahan x n_periode x 10 baris. Mengembalikan jumlah baris."""
+    rng = np.random.default_rng(seed)
+    base = _base_shares(raw_path)
+    periods = periods_between(tahun_awal, tahun_akhir)
+    n_levels = len(LEVELS)
+    levels_new = np.array(LEVELS, dtype=object)
+    levels_old = np.array([_OLD_SPELLING.get(lvl, lvl) for lvl in LEVELS], dtype=object)
+    digits = kota_digits(n_kelurahan)
+    row_id = 0
+    header = True
+
+    for start in range(0, n_kelurahan, chunk_kelurahan):
+        kel_ids = np.arange(start, min(start + chunk_kelurahan, n_kelurahan))
+        n = len(kel_ids)
+        wilayah = _kelurahan_labels(kel_ids, digits)
+
+        # Komposisi + ukuran penduduk + tren per semester, semua vektor
+        template = base[rng.integers(0, len(base), size=n)]
+        shares = rng.dirichlet(np.full(n_levels, 1.0), size=n) * 0.15 + template * 0.85
+        population = rng.lognormal(mean=10.0, sigma=0.5, size=n)
+        growth = rng.normal(0.005, 0.01, size=n)
+
+        for p, (tahun, semester) in enumerate(periods):
+            pop_p = population * (1 + growth) ** p
+            counts = rng.poisson(shares * pop_p[:, None])
+
+            chunk = wilayah.loc[wilayah.index.repeat(n_levels)].reset_index(drop=True)
+            chunk.insert(0, "id", np.arange(row_id + 1, row_id + len(chunk) + 1))
+            chunk["jenis_pendidikan"] = np.tile(levels_old if p == 0 else levels_new, n)
+            chunk["jumlah_penduduk"] = counts.ravel()
+            chunk["satuan"] = "ORANG"
+            chunk["semester"] = semester
+            chunk["tahun"] = tahun
+
+            chunk[RAW_COLUMNS].to_csv(out_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            row_id += len(chunk)
+
+    return row_id
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buat data mentah sintetis berskema BPS")
+    parser.add_argument("--kelurahan", type=int, default=10_000)
+    parser.add_argument("--tahun-awal", type=int, default=2017)
+    parser.add_argument("--tahun-akhir", type=int, default=2025)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="data_sintetis.csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_rows = generate(args.out, args.kelurahan, args.tahun_awal, args.tahun_akhir, args.seed)
+    print(f"{n_rows:,} baris -> {args.out} ({time.perf_counter() - start:.1f} s)")
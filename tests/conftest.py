@@ -0,0 +1,35 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Modul aplikasi ada di root repo (tanpa paket); cache uji dipisah dari .cache/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("TUBES_CACHE_DIR", tempfile.mkdtemp(prefix="tubes-test-cache-"))
+
+
+@pytest.fixture(scope="session")
+def raw_path():
+    from ingest import RAW_PATH
+
+    path = os.path.join(ROOT, RAW_PATH)
+    if not os.path.exists(path):
+        pytest.skip("data mentah BPS tidak tersedia")
+    return path
+
+
+@pytest.fixture(scope="session")
+def raw(raw_path):
+    import pandas as pd
+
+    return pd.read_csv(raw_path)
+
+
+@pytest.fixture(scope="session")
+def hierarchy(raw_path):
+    from cube import build_cube
+    from hierarchy import build_hierarchy
+
+    return build_hierarchy(build_cube(raw_path))
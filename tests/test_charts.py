@@ -0,0 +1,26 @@
+import numpy as np
+
+from charts import stratified_sample
+
+
+def test_stratified_sample_bounded_and_keeps_every_cluster():
+    rng = np.random.default_rng(0)
+    # Satu klaster padat besar + dua klaster kecil yang terpisah jauh
+    sizes = [100_000, 40, 15]
+    centers = [(0.3, 0.3), (0.8, 0.1), (0.1, 0.9)]
+    xy = np.concatenate([c + rng.normal(0, 0.02, (n, 2)) for c, n in zip(centers, sizes)])
+    cluster = np.repeat(np.arange(len(sizes)), sizes)
+
+    idx = stratified_sample(xy[:, 0], xy[:, 1], max_points=2000)
+
+    assert len(idx) <= 2000
+    assert len(np.unique(idx)) == len(idx) and (np.diff(idx) > 0).all()
+    kept = np.bincount(cluster[idx], minlength=len(sizes))
+    assert kept[0] > 1000
+    # Sel jarang tidak ditipiskan: klaster kecil terbawa hampir utuh
+    assert (kept[1:] >= 0.8 * np.array(sizes[1:])).all()
+
+
+def test_stratified_sample_small_input_untouched():
+    x = np.linspace(0, 1, 50)
+    np.testing.assert_array_equal(stratified_sample(x, x, max_points=100), np.arange(50))
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from clustering import FEATURES, fit_kmeans, freeze, load_features, load_frozen, order_centroids, predict, refit, save_frozen
+from stats import StreamingStats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET = os.path.join(ROOT, "dataset_final.csv")
+
+
+@pytest.fixture(scope="module")
+def X():
+    if not os.path.exists(DATASET):
+        pytest.skip("dataset final tidak tersedia")
+    return load_features(DATASET)[FEATURES]
+
+
+def test_order_centroids_ignores_kmeans_label_order():
+    raw = pd.DataFrame([[0.50, 0.40, 0.10], [0.20, 0.45, 0.35], [0.35, 0.50, 0.15]], columns=FEATURES)
+    scaler = StreamingStats.from_frame(raw, FEATURES).to_scaler()
+    centroids = scaler.transform(raw)
+
+    expected = centroids[order_centroids(centroids, scaler)]
+    for perm in ([2, 0, 1], [1, 2, 0], [2, 1, 0]):
+        shuffled = centroids[perm]
+        np.testing.assert_array_equal(shuffled[order_centroids(shuffled, scaler)], expected)
+    # Klaster 0 = proporsi pendidikan rendah terkecil
+    np.testing.assert_allclose(scaler.inverse_transform(expected)[:, 0], [0.20, 0.35, 0.50])
+
+
+def test_predict_reproduces_training_labels(X):
+    model = fit_kmeans(X, 3)
+    np.testing.assert_array_equal(predict(freeze(model, "v"), X), model["labels"])
+
+
+def test_frozen_round_trip(X, tmp_path):
+    frozen = freeze(fit_kmeans(X, 3), "v")
+    path = tmp_path / "frozen.json"
+    save_frozen(frozen, path)
+    loaded = load_frozen(path)
+
+    assert loaded.keys() == frozen.keys()
+    for name in ("mean", "scale", "centroids"):
+        np.testing.assert_array_equal(loaded[name], frozen[name])
+    np.testing.assert_array_equal(predict(loaded, X), predict(frozen, X))
+
+
+def test_refit_on_unchanged_data_moves_nothing(X, tmp_path):
+    path = tmp_path / "frozen.json"
+    first = refit(DATASET, frozen_path=path)
+    second = refit(DATASET, frozen_path=path)
+
+    assert second["n_changed"] == 0
+    np.testing.assert_array_equal(second["frozen"]["centroids"], first["frozen"]["centroids"])
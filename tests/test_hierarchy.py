@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def test_kecamatan_totals_match_raw_groupby(hierarchy, raw):
+    expected = raw.groupby("bps_nama_kecamatan")["jumlah_penduduk"].sum()
+    kec = hierarchy["kecamatan"]
+    actual = dict(zip(kec.names, kec.counts.sum(axis=(1, 2))))
+    assert actual == expected.to_dict()
+
+
+def test_kecamatan_period_totals_match_raw_groupby(hierarchy, raw):
+    expected = raw.groupby(["bps_nama_kecamatan", "tahun", "semester"])["jumlah_penduduk"].sum()
+    kec = hierarchy["kecamatan"]
+    for (name, tahun, semester), total in expected.items():
+        p = np.flatnonzero((hierarchy.periods[:, 0] == tahun) & (hierarchy.periods[:, 1] == semester))[0]
+        assert kec.counts[kec.position[name], p].sum() == total
+
+
+def test_kelurahan_keyed_by_kecamatan_and_code(hierarchy, raw):
+    pairs = raw[["bps_kode_kecamatan", "bps_kode_desa_kelurahan"]].drop_duplicates()
+    kel = hierarchy["kelurahan"]
+    assert len(kel) == len(pairs)
+    assert len(set(kel.names)) == len(kel.names)
+
+    # Nama yang sama di dua kecamatan tetap terpisah dan ada di bawah kecamatannya
+    shared = raw.groupby("bps_desa_kelurahan")["bps_nama_kecamatan"].nunique()
+    for name in shared[shared > 1].index:
+        for kecamatan in raw.loc[raw["bps_desa_kelurahan"] == name, "bps_nama_kecamatan"].unique():
+            children = hierarchy.children("kecamatan", kecamatan)
+            assert any(str(child).startswith(name) for child in children)
+
+
+def test_drill_down_children_sum_to_parent(hierarchy):
+    kec = hierarchy["kecamatan"]
+    kel = hierarchy["kelurahan"]
+    for i, name in enumerate(kec.names):
+        children = kel.counts[hierarchy.offsets[i]:hierarchy.offsets[i + 1]]
+        assert (children.sum(axis=0) == kec.counts[i]).all()
+        assert len(hierarchy.drill_down("kecamatan", name)) == len(children)
+    assert hierarchy["kota"].counts.sum() == kec.counts.sum()
+
+
+def test_drill_down_clusters_joined_by_unit_code(hierarchy, raw):
+    from clustering import FEATURES, fit_kmeans, freeze
+    from hierarchy import assign_units
+
+    frozen = freeze(fit_kmeans(hierarchy["kelurahan"].pct[FEATURES].dropna(), 3), "v")
+    clusters = assign_units(hierarchy, frozen)
+
+    # Unit yang labelnya berakhiran "(KECAMATAN)" tetap mendapat klaster
+    shared = raw.groupby("bps_desa_kelurahan")["bps_nama_kecamatan"].nunique()
+    for kecamatan in raw.loc[raw["bps_desa_kelurahan"].isin(shared[shared > 1].index), "bps_nama_kecamatan"].unique():
+        anggota = hierarchy.drill_down("kecamatan", kecamatan)
+        key = hierarchy.unit_key(anggota.index)
+        assert clusters.reindex(key).notna().all()
+        assert (key.get_level_values(0) == raw.loc[raw["bps_nama_kecamatan"] == kecamatan, "bps_kode_kecamatan"].iloc[0]).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest import ALIASES, LEVELS
+from inequality import YEARS_ARRAY, build_inequality, indices, theil_decomposition
+
+
+@pytest.fixture(scope="module")
+def result(hierarchy):
+    return build_inequality(hierarchy)
+
+
+@pytest.fixture(scope="module")
+def raw_counts(raw):
+    """Jumlah per (kecamatan, tahun, semester, jenjang) langsung dari file mentah."""
+    jenis = raw["jenis_pendidikan"].replace(ALIASES)
+    counts = raw.groupby(["bps_nama_kecamatan", "tahun", "semester", jenis])["jumlah_penduduk"].sum()
+    return counts.unstack(fill_value=0).reindex(columns=LEVELS, fill_value=0)
+
+
+def test_decomposition_adds_up(result):
+    for table in (result["decomposition"], result["decomposition_total"].to_frame().T):
+        for index in ("theil_t", "theil_l"):
+            np.testing.assert_allclose(
+                table[f"{index}_within"] + table[f"{index}_between"], table[index], rtol=1e-10
+            )
+
+
+def test_decomposition_groups_match_raw_groupby(hierarchy, result, raw_counts):
+    kec = hierarchy["kecamatan"]
+    periods = hierarchy.periods
+    group_counts = np.zeros((len(kec), len(periods), len(LEVELS)))
+    for (name, tahun, semester), row in raw_counts.iterrows():
+        p = np.flatnonzero((periods[:, 0] == tahun) & (periods[:, 1] == semester))[0]
+        group_counts[kec.position[name], p] = row.to_numpy()
+
+    np.testing.assert_array_equal(kec.counts, group_counts)
+    expected = pd.DataFrame(theil_decomposition(group_counts), index=result["decomposition"].index)
+    pd.testing.assert_frame_equal(result["decomposition"], expected, rtol=1e-12)
+
+
+def test_kecamatan_indices_match_raw(result, raw_counts):
+    per_kecamatan = raw_counts.groupby(level="bps_nama_kecamatan").sum()
+    expected = indices(per_kecamatan.to_numpy())
+    actual = result["kecamatan_total"].loc[per_kecamatan.index]
+    for name, values in expected.items():
+        np.testing.assert_allclose(actual[name].to_numpy(), values, rtol=1e-12)
+
+
+def test_gini_matches_pairwise_definition():
+    counts = np.array([[5, 0, 3, 1, 0, 2, 0, 0, 1, 0]], dtype=float)
+    p = counts[0] / counts[0].sum()
+    mu = p @ YEARS_ARRAY
+    brute = sum(p[i] * p[j] * abs(YEARS_ARRAY[i] - YEARS_ARRAY[j])
+                for i in range(len(p)) for j in range(len(p))) / (2 * mu)
+    assert indices(counts)["gini"][0] == pytest.approx(brute)
@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from ingest import DATASET_PATH, EDA_PATH, PIVOT_PATH, run_ingest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# 1.000 baris per chunk: lebih dari COMPACT_PARTS chunk, memicu pemadatan parsial
+@pytest.mark.parametrize("chunksize", [None, 1_000])
+def test_ingest_matches_committed_csvs(raw_path, tmp_path, chunksize):
+    kwargs = {"chunksize": chunksize} if chunksize else {}
+    run_ingest(raw_path, out_dir=str(tmp_path), **kwargs)
+
+    for name in (PIVOT_PATH, DATASET_PATH, EDA_PATH):
+        with open(os.path.join(ROOT, name), "rb") as f:
+            expected = f.read()
+        assert (tmp_path / name).read_bytes() == expected, name
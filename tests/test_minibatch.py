@@ -0,0 +1,26 @@
+import pandas as pd
+
+from ingest import ALIASES, REGION_KEYS, aggregate_counts
+from minibatch import write_features
+from synthetic import generate
+
+
+def test_features_keyed_by_code_not_name(tmp_path):
+    raw_path = str(tmp_path / "raw.csv")
+    generate(raw_path, 700, tahun_awal=2024, tahun_akhir=2024, raw_path="tidak-ada.csv")
+    raw = pd.read_csv(raw_path)
+    assert raw["bps_desa_kelurahan"].nunique() < 700  # nama sengaja kembar
+
+    n_kelurahan, n_rows = write_features(raw_path, str(tmp_path / "features.csv"))
+    assert (n_kelurahan, n_rows) == (700, len(raw))
+
+
+def test_chunked_counts_match_groupby(raw_path, raw):
+    counts, n_rows = aggregate_counts(raw_path, keys=REGION_KEYS, chunksize=997)
+
+    expected = (
+        raw.groupby(list(REGION_KEYS) + [raw["jenis_pendidikan"].replace(ALIASES)])["jumlah_penduduk"]
+        .sum().unstack(fill_value=0)
+    )
+    assert n_rows == len(raw)
+    pd.testing.assert_frame_equal(counts, expected, check_names=False)
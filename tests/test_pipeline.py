@@ -0,0 +1,46 @@
+import pipeline
+
+
+def test_counts_digest_ignores_row_count(raw_path, tmp_path):
+    path = tmp_path / "raw.csv"
+    with open(raw_path) as f:
+        lines = f.readlines()
+    path.write_text("".join(lines))
+    pipeline.run("dataset", raw_path=str(path))
+
+    # Baris tambahan berpenduduk 0: jumlah baris berubah, tabel jumlah tidak
+    header = lines[0].rstrip("\n").split(",")
+    row = lines[1].rstrip("\n").split(",")
+    row[header.index("jumlah_penduduk")] = "0"
+    with open(path, "a") as f:
+        f.write(",".join(row) + "\n")
+
+    report = []
+    pipeline.run("dataset", report, raw_path=str(path))
+    status = {name: s for name, s, _ in report}
+    assert status["counts"] == "hitung"
+    assert status["pivot"] == status["dataset"] == "cache"
+    assert pipeline.run("counts", raw_path=str(path))["rows"] == len(lines)
+
+
+def test_n_clusters_only_recomputes_downstream(raw_path):
+    pipeline.run("summary", raw_path=raw_path, n_clusters=3)
+
+    report = []
+    summary = pipeline.run("summary", report, raw_path=raw_path, n_clusters=4)
+    status = {name: s for name, s, _ in report}
+    assert status["counts"] == status["pivot"] == status["dataset"] == status["scaled"] == "cache"
+    assert status["model"] == status["summary"] == "hitung"
+    assert len(summary) == 4
+
+
+def test_given_dataset_shares_model_stage(raw_path):
+    from clustering import FEATURES, get_model
+
+    dataset = pipeline.run("dataset", raw_path=raw_path)
+    model = pipeline.run("model", raw_path=raw_path, n_clusters=3)
+
+    report = []
+    pipeline.run("model", report, given={"dataset": dataset}, n_clusters=3)
+    assert dict((name, s) for name, s, _ in report)["model"] == "cache"
+    assert (get_model(dataset[FEATURES].dropna(), 3)["labels"] == model["labels"]).all()
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from search import KelurahanIndex, batch_lookup, build_index
+
+CLUSTER_INFO = {
+    0: {"nama": "Rendah", "rekomendasi": "a"},
+    1: {"nama": "Menengah", "rekomendasi": "b"},
+    2: {"nama": "Tinggi", "rekomendasi": "c"},
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    records = pd.DataFrame({
+        "bps_desa_kelurahan": ["SUKAMAJU", "SUKAMAJU", "SUKALUYU", "CIGADUNG", "CIHAURGEULIS"],
+        "bps_kode_desa_kelurahan": ["3273010001", "3273020001", "3273010002", "3273020002", "3273020003"],
+        "bps_nama_kecamatan": ["CIBEUNYING KIDUL", "CIBEUNYING KALER", "CIBEUNYING KIDUL",
+                               "CIBEUNYING KALER", "CIBEUNYING KALER"],
+    })
+    return KelurahanIndex(records)
+
+
+@pytest.fixture(scope="module")
+def clusters():
+    return pd.Series([0, 1, 2, 1], index=["Sukamaju", "Sukaluyu", "Cigadung", "Cihaurgeulis"], name="cluster")
+
+
+def test_prefix_and_fuzzy(index):
+    assert index.prefix("suka") == ["SUKALUYU", "SUKAMAJU"]
+    assert index.prefix("ci") == ["CIGADUNG", "CIHAURGEULIS"]
+    assert index.prefix("3273020") == ["SUKAMAJU", "CIGADUNG", "CIHAURGEULIS"]
+    assert index.fuzzy("cigadong") == ["CIGADUNG"]
+    assert index.fuzzy("bandung") == []
+
+
+def test_resolve_exact_code_and_typo(index):
+    resolved = index.resolve(["  sukaluyu ", "3273020003", "CIHAURGEULSI", "BOJONGLOA", ""])
+    assert resolved.iloc[:3].tolist() == ["SUKALUYU", "CIHAURGEULIS", "CIHAURGEULIS"]
+    assert resolved.iloc[3:].isna().all()
+    assert index.resolve(["CIHAURGEULSI"], fuzzy=False).isna().all()
+
+
+def test_batch_lookup_typo_and_ambiguous_name(index, clusters):
+    result = batch_lookup(["Cigadnug", "sukamaju", "xyz"], clusters, index, CLUSTER_INFO)
+
+    assert result["kelurahan"].tolist()[:2] == ["CIGADUNG", "SUKAMAJU"]
+    assert result["klaster"].tolist()[:2] == [2, 0]
+    assert result["nama"].tolist()[:2] == ["Tinggi", "Rendah"]
+    # Nama kembar di dua kecamatan: satu kelurahan, kecamatannya salah satu yang memuatnya
+    assert result.loc[1, "kecamatan"] in {"CIBEUNYING KIDUL", "CIBEUNYING KALER"}
+    assert index.search("sukamaju")[0] == "SUKAMAJU"
+    assert pd.isna(result.loc[2, "kelurahan"]) and pd.isna(result.loc[2, "klaster"])
+
+
+def test_build_index_skips_null_names(tmp_path):
+    index = build_index(["ANCOL", None, np.nan], raw_path=str(tmp_path / "tidak_ada.csv"))
+    assert index.kelurahan == ["ANCOL"]
+    assert "NAN" not in index.key_to_kel and "NONE" not in index.key_to_kel
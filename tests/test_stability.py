@@ -0,0 +1,39 @@
+import numpy as np
+
+import stability
+from clustering import scaler_digest
+from stability import confidence, get_stability, run_stability
+
+
+def blobs(n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = np.array([[-10.0, 0.0], [0.0, 10.0], [10.0, 0.0]])
+    X = np.concatenate([c + rng.normal(0, 0.1, (n, 2)) for c in centers])
+    return X, np.repeat(np.arange(len(centers)), n)
+
+
+def test_separated_blobs_fully_confident():
+    X, labels = blobs()
+    matrix = run_stability(X, 3, n_replicates=20, max_workers=1)
+
+    np.testing.assert_allclose(confidence(matrix, labels), 1.0)
+    # Pasangan beda blob tidak pernah seklaster
+    assert matrix[labels[:, None] != labels[None, :]].max() == 0.0
+
+
+def test_cache_key_follows_scaler_digest(monkeypatch):
+    X, labels = blobs(n=5)
+    calls = []
+    monkeypatch.setattr(
+        stability, "run_stability",
+        lambda *args, **kwargs: calls.append(args) or np.ones((len(X), len(X))),
+    )
+    args = (X, labels, np.arange(len(X)), "versi-uji")
+    digest = scaler_digest([0.0, 0.0], [1.0, 1.0])
+
+    get_stability(*args, digest, 3, n_replicates=4)
+    get_stability(*args, digest, 3, n_replicates=4)
+    assert len(calls) == 1
+
+    get_stability(*args, scaler_digest([0.0, 0.0], [2.0, 1.0]), 3, n_replicates=4)
+    assert len(calls) == 2
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+# Anggaran waktu startup: render pertama Home diukur di proses Python baru
+# (cold start), tanpa pemanasan cache (TUBES_WARMUP=0) karena thread warmup
+# sengaja memuat semua halaman di latar belakang.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Batas waktu render pertama halaman Home (detik), tanpa impor streamlit itu sendiri
+HOME_BUDGET_S = float(os.environ.get("TUBES_HOME_BUDGET_S", "0.5"))
+
+# Modul yang TIDAK boleh ikut dimuat saat membuka Home
+HOME_FORBIDDEN = ["matplotlib.pyplot", "seaborn", "sklearn"]
+
+_HOME_PROBE = """
+import json, sys, time
+sys.path.insert(0, {base!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+start = time.perf_counter()
+at.run()
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "exceptions": [e.value for e in at.exception],
+    "loaded": [m for m in {forbidden!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_home():
+    code = _HOME_PROBE.format(base=ROOT, app=os.path.join(ROOT, "app.py"), forbidden=HOME_FORBIDDEN)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, "TUBES_WARMUP": "0"},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_home_first_render_within_budget():
+    home = measure_home()
+    assert home["exceptions"] == []
+    assert home["loaded"] == [], f"Home memuat modul berat: {home['loaded']}"
+    assert home["seconds"] <= HOME_BUDGET_S, f"Home {home['seconds']:.3f} s > anggaran {HOME_BUDGET_S:.3f} s"
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+import stats
+from cube import build_cube
+from stats import StreamingStats, period_stats
+from trajectory import period_shares
+
+FEATURES = ["rendah_pct", "menengah_pct", "tinggi_pct"]
+
+
+def test_quantiles_exact_when_values_concentrated():
+    rng = np.random.default_rng(0)
+    values = np.r_[np.full(140, 0.30001), rng.normal(0.3, 0.00005, 8), [0.5, 0.6, 0.1]]
+    result = StreamingStats(["x"]).update(values[:, None])
+
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    iqr = q3 - q1
+    expected = ((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)).sum()
+    np.testing.assert_allclose(result.quantile([0.25, 0.75])[0], [q1, q3])
+    assert result.outlier_counts()[0] == expected
+
+
+def test_compressed_sketch_stays_close():
+    rng = np.random.default_rng(1)
+    X = rng.beta(2, 5, (50_000, 2))
+    result = StreamingStats(["a", "b"], sketch_size=512)
+    for part in np.array_split(X, 20):
+        result.update(part)
+
+    assert not result.exact
+    q = [0.05, 0.25, 0.5, 0.75, 0.95]
+    np.testing.assert_allclose(result.quantile(q), np.quantile(X, q, axis=0).T, atol=5e-3)
+
+
+def test_period_stats_match_cube(raw_path):
+    Y = period_shares(build_cube(raw_path), FEATURES).reshape(-1, len(FEATURES))
+    Y = Y[~np.isnan(Y).any(axis=1)]
+    result = period_stats(FEATURES, raw_path)
+
+    assert result.n == len(Y)
+    np.testing.assert_allclose(result.mean, Y.mean(axis=0))
+    np.testing.assert_allclose(result.quantile([0.25, 0.5, 0.75]), np.quantile(Y, [0.25, 0.5, 0.75], axis=0).T)
+
+
+def test_period_stats_parses_only_appended_rows(raw_path, tmp_path, monkeypatch):
+    with open(raw_path, "rb") as f:
+        lines = f.readlines()
+    cut = len(lines) * 3 // 4
+    path = tmp_path / "raw.csv"
+    path.write_bytes(b"".join(lines[:cut]))
+    period_stats(FEATURES, path)
+
+    parsed = []
+    parse_rows = stats._parse_rows
+    monkeypatch.setattr(stats, "_parse_rows", lambda header, data: parsed.append(data) or parse_rows(header, data))
+    with open(path, "ab") as f:
+        f.write(b"".join(lines[cut:]))
+    result = period_stats(FEATURES, path)
+
+    assert parsed == [b"".join(lines[cut:])]
+    full = period_stats(FEATURES, raw_path).summary()
+    pd.testing.assert_frame_equal(result.summary(), full)
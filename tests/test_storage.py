@@ -0,0 +1,13 @@
+from storage import RAW_NARROW, read_columns
+
+
+def test_header_only_csv_gives_empty_table(raw_path, tmp_path):
+    with open(raw_path) as f:
+        header = f.readline()
+    path = tmp_path / "kosong.csv"
+    path.write_text(header)
+
+    df = read_columns(str(path), raw=True)
+    assert len(df) == 0
+    assert list(df.columns) == header.rstrip("\n").split(",")
+    assert df["jumlah_penduduk"].dtype == RAW_NARROW["jumlah_penduduk"]
@@ -0,0 +1,32 @@
+import numpy as np
+
+import sweep
+from clustering import scaler_digest
+from sweep import get_sweep
+
+
+def test_sweep_memo_per_k_seed_and_scaler(monkeypatch):
+    X = np.random.default_rng(0).normal(size=(60, 3))
+    fitted = []
+    run_sweep = sweep.run_sweep
+
+    def counting(X_scaled, tasks, n_init=10):
+        fitted.extend(tasks)
+        return run_sweep(X_scaled, tasks, n_init=n_init, max_workers=1)
+
+    monkeypatch.setattr(sweep, "run_sweep", counting)
+    digest = scaler_digest(np.zeros(3), np.ones(3))
+
+    first = get_sweep(X, "versi-uji", digest, range(2, 4), seeds=(0, 1), n_init=2)
+    assert sorted(fitted) == [(2, 0), (2, 1), (3, 0), (3, 1)]
+
+    # Rentang baru: hanya k yang belum pernah dihitung
+    fitted.clear()
+    wider = get_sweep(X, "versi-uji", digest, range(2, 5), seeds=(0, 1), n_init=2)
+    assert sorted(fitted) == [(4, 0), (4, 1)]
+    assert wider[wider["k"] < 4].reset_index(drop=True).equals(first)
+
+    # Scaler lain = X_scaled lain: semua (k, seed) dihitung ulang
+    fitted.clear()
+    get_sweep(X, "versi-uji", scaler_digest(np.zeros(3), np.full(3, 2.0)), range(2, 4), seeds=(0, 1), n_init=2)
+    assert sorted(fitted) == [(2, 0), (2, 1), (3, 0), (3, 1)]
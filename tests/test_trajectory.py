@@ -0,0 +1,42 @@
+import numpy as np
+
+from trajectory import change_points, period_time, slopes, transition_matrices
+
+
+def test_slopes_of_linear_series():
+    periods = np.array([[2021, 1], [2021, 2], [2022, 1], [2022, 2], [2023, 1], [2023, 2]])
+    t = period_time(periods)
+    Y = np.stack([
+        np.column_stack([0.1 + 0.02 * (t - t[0]), 0.5 - 0.01 * (t - t[0])]),
+        np.column_stack([np.full(len(t), 0.3), 0.4 + 0.05 * (t - t[0])]),
+    ])
+    Y[1, [1, 4], 1] = np.nan  # periode kosong diabaikan
+
+    np.testing.assert_allclose(slopes(Y, t), [[0.02, -0.01], [0.0, 0.05]], atol=1e-12)
+    assert np.isnan(slopes(np.full((1, 6, 1), np.nan), t)).all()
+
+
+def test_single_step_change_point():
+    Y = np.r_[np.full(5, 0.2), np.full(7, 0.6)][None, :, None]
+    cp = change_points(Y)
+
+    assert cp["index"][0, 0] == 5
+    np.testing.assert_allclose([cp["before"][0, 0], cp["after"][0, 0], cp["gain"][0, 0]], [0.2, 0.6, 1.0])
+
+    flat = change_points(np.full((1, 12, 1), 0.4))
+    assert flat["index"][0, 0] == -1 and flat["gain"][0, 0] == 0.0
+
+
+def test_transition_rows_sum_to_source_cluster_size():
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 3, (200, 8))
+    transitions = transition_matrices(labels, 3)
+
+    assert transitions.shape == (7, 3, 3)
+    for step in range(7):
+        np.testing.assert_array_equal(transitions[step].sum(axis=1), np.bincount(labels[:, step], minlength=3))
+
+    # Periode tanpa data (-1) tidak ikut dihitung di kedua sisi
+    labels[:10, 3] = -1
+    transitions = transition_matrices(labels, 3)
+    assert transitions[3].sum() == transitions[2].sum() == 190
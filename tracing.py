@@ -0,0 +1,216 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+
+from cache import CACHE_DIR
+
+# =====================
+# INSTRUMENTASI (SPAN WAKTU & MEMORI)
+# =====================
+# `span(nama)` membungkus satu bagian pekerjaan (halaman, load_data, fit model,
+# render grafik). Span hanya dicatat bila ada perekam aktif di thread ini
+# (satu rerun Streamlit = satu thread skrip); tanpa perekam, `span()` hanya
+# mengembalikan objek no-op yang sama, sehingga biayanya praktis nol.
+#
+# Setiap span yang selesai menjadi satu baris JSON di TRACE_FILE agar bisa
+# diagregasi lintas sesi, mis. dengan pandas.read_json(path, lines=True).
+# Modul ini sengaja hanya memakai pustaka standar (dimuat juga oleh Home).
+TRACE_FILE = os.environ.get("TUBES_TRACE_FILE", os.path.join(CACHE_DIR, "trace.jsonl"))
+TRACE_ALL = os.environ.get("TUBES_TRACE", "") == "1"  # rekam semua sesi tanpa perlu opt-in
+# tracemalloc berlaku untuk seluruh proses (memperlambat SEMUA sesi), jadi
+# pengukuran memori dari UI hanya boleh bila diizinkan pengelola server
+TRACE_MEMORY = os.environ.get("TUBES_TRACE_MEMORY", "") == "1"
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_memory_lock = threading.Lock()
+_memory_users = 0
+_memory_started = False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "attrs", "parent", "depth",
+                 "start", "start_cpu", "start_mem", "outer_peak", "child_peak")
+
+    def __init__(self, recorder, name, attrs):
+        self.recorder = recorder
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Menambah atribut yang baru diketahui di tengah span (mis. cache hit/miss)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = self.recorder.stack
+        self.parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+
+        if self.recorder.memory:
+            # Puncak alokasi diukur relatif terhadap awal span; puncak yang
+            # sudah tercatat sebelumnya disimpan dulu untuk span induk.
+            self.start_mem, self.outer_peak = tracemalloc.get_traced_memory()
+            self.child_peak = 0
+            tracemalloc.reset_peak()
+        self.start_cpu = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.start_cpu
+        self.recorder.stack.pop()
+
+        record = {
+            "trace": self.recorder.trace_id,
+            "session": self.recorder.session,
+            "span": self.name,
+            "parent": self.parent.name if self.parent is not None else None,
+            "depth": self.depth,
+            "ts": time.time() - seconds,
+            "ms": round(seconds * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+        }
+        if self.recorder.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            record["peak_mb"] = round(max(peak - self.start_mem, 0) / 1e6, 3)
+            if self.parent is not None:
+                self.parent.child_peak = max(self.parent.child_peak, self.outer_peak, peak)
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+
+        self.recorder.records.append(record)
+        return False
+
+
+class Recorder:
+    def __init__(self, session=None, memory=False):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.session = session
+        self.memory = memory
+        self.stack = []
+        self.records = []
+
+    def breakdown(self):
+        """Span urut waktu mulai (induk sebelum anak), untuk ditampilkan sebagai tabel."""
+        return sorted(self.records, key=lambda r: (r["ts"], r["depth"]))
+
+
+def span(name, **attrs):
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None:
+        return _NOOP
+    return _Span(recorder, name, attrs)
+
+
+def traced(name=None):
+    """Dekorator: seluruh pemanggilan fungsi menjadi satu span (bila perekaman aktif)."""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "recorder", None) is None:
+                return func(*args, **kwargs)
+            with _Span(_local.recorder, label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def active():
+    return getattr(_local, "recorder", None)
+
+
+class recording:
+    """Mengaktifkan perekam untuk satu rerun / fragment di thread ini.
+
+    Bila perekam sudah aktif (mis. fragment yang dirender di dalam halaman),
+    blok ini hanya menjadi span biasa di perekam tersebut.
+    """
+
+    def __init__(self, name, session=None, memory=False, path=TRACE_FILE, **attrs):
+        self.name = name
+        self.session = session
+        self.memory = memory
+        self.path = path
+        self.attrs = attrs
+        self.recorder = None
+        self._owner = False
+
+    def __enter__(self):
+        current = active()
+        if current is None:
+            self.recorder = Recorder(self.session, self.memory)
+            self._owner = True
+            if self.memory:
+                _start_memory()
+            _local.recorder = self.recorder
+        else:
+            self.recorder = current
+        self._span = _Span(self.recorder, self.name, dict(self.attrs))
+        self._span.__enter__()
+        return self.recorder
+
+    def __exit__(self, *exc):
+        self._span.__exit__(*exc)
+        if self._owner:
+            _local.recorder = None
+            if self.memory:
+                _stop_memory()
+            if self.path:
+                write(self.recorder.records, self.path)
+        return False
+
+
+def _start_memory():
+    # tracemalloc bersifat global per proses; dihitung jumlah pemakainya agar
+    # sesi lain yang masih merekam tidak ikut dimatikan.
+    global _memory_users, _memory_started
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_started = True
+        _memory_users += 1
+
+
+def _stop_memory():
+    global _memory_users, _memory_started
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+def write(records, path=TRACE_FILE):
+    if not records:
+        return
+    lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from cache import DiskCache, file_hash, make_key
+from clustering import FEATURES, predict
+from cube import CUBE_VERSION, GROUPS, DataCube, get_cube
+from ingest import PCT_COLUMNS, RAW_PATH
+from tracing import traced
+
+# =====================
+# LINTASAN KELURAHAN ANTAR SEMESTER
+# =====================
+# Semua kelurahan diproses sekaligus sebagai array (kelurahan, periode, fitur)
+# dari DataCube; periode tanpa penduduk bernilai NaN dan diberi bobot 0:
+#   - tren: kemiringan regresi linear per tahun (OLS berbobot, tanpa loop)
+#   - titik perubahan: satu pergeseran rata-rata terbaik per deret, dicari
+#     untuk semua posisi sekaligus lewat jumlah kumulatif (SSE kiri + kanan)
+#   - klaster per periode: tiap (kelurahan, periode) ditugaskan ke centroid
+#     model beku yang sama, sehingga nomor klaster sebanding antar waktu
+#   - matriks transisi klaster antar periode berurutan dan awal -> akhir
+MIN_SEGMENT = 3   # periode minimal di tiap sisi titik perubahan
+SSE_RTOL = 1e-9   # SSE lewat jumlah kumulatif menyisakan galat pembulatan pada deret konstan
+
+_trajectory_cache = DiskCache("trajectory")
+
+
+def period_shares(cube, features=FEATURES):
+    """Proporsi per (kelurahan, periode, fitur), urut kolom `features`."""
+    pct_columns = [PCT_COLUMNS[g] for g in GROUPS]
+    take = [pct_columns.index(c) for c in features]
+    return DataCube.shares(DataCube.rollup(cube.counts))[:, :, take]
+
+
+def period_time(periods):
+    """Waktu dalam tahun: semester 1 -> t, semester 2 -> t + 0.5."""
+    return periods[:, 0] + (periods[:, 1] - 1) * 0.5
+
+
+def slopes(Y, t):
+    """Kemiringan OLS per deret untuk Y (..., periode, fitur) dengan NaN diabaikan."""
+    w = (~np.isnan(Y)).astype(float)
+    y = np.nan_to_num(Y)
+    t = t[:, None]
+    n = w.sum(axis=-2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_mean = (w * t).sum(axis=-2) / n
+        y_mean = (w * y).sum(axis=-2) / n
+        dt = t - t_mean[..., None, :]
+        cov = (w * dt * (y - y_mean[..., None, :])).sum(axis=-2)
+        var = (w * dt ** 2).sum(axis=-2)
+        return np.where(n >= 2, cov / var, np.nan)
+
+
+def change_points(Y, min_segment=MIN_SEGMENT):
+    """Satu titik perubahan rata-rata terbaik per deret Y (..., periode, fitur).
+
+    Mengembalikan dict array (..., fitur): "index" (periode pertama setelah
+    perubahan, -1 bila tidak ada), "before", "after" (rata-rata tiap sisi) dan
+    "gain" (porsi SSE yang dijelaskan oleh pemisahan, 0..1).
+    """
+    w = (~np.isnan(Y)).astype(float)
+    y = np.nan_to_num(Y)
+
+    cw, cy, cy2 = (np.cumsum(a, axis=-2) for a in (w, w * y, w * y ** 2))
+    total_w, total_y, total_y2 = cw[..., -1:, :], cy[..., -1:, :], cy2[..., -1:, :]
+
+    # Pemisahan setelah posisi k: kiri = [0..k], kanan = [k+1..]
+    lw, ly, ly2 = cw[..., :-1, :], cy[..., :-1, :], cy2[..., :-1, :]
+    rw, ry, ry2 = total_w - lw, total_y - ly, total_y2 - ly2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sse_total = total_y2 - total_y ** 2 / total_w
+        sse_split = (ly2 - ly ** 2 / lw) + (ry2 - ry ** 2 / rw)
+        gain = (sse_total - sse_split) / sse_total
+    valid = (lw >= min_segment) & (rw >= min_segment) & (sse_total > SSE_RTOL * total_y2)
+    gain = np.where(valid, gain, -np.inf)
+
+    best = gain.argmax(axis=-2)
+    pick = lambda a: np.take_along_axis(a, best[..., None, :], axis=-2)[..., 0, :]
+    best_gain = pick(gain)
+    found = np.isfinite(best_gain)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        before = pick(ly) / pick(lw)
+        after = pick(ry) / pick(rw)
+    return {
+        "index": np.where(found, best + 1, -1),
+        "before": np.where(found, before, np.nan),
+        "after": np.where(found, after, np.nan),
+        "gain": np.where(found, best_gain, 0.0),
+    }
+
+
+def assign_periods(frozen, Y):
+    """Klaster tiap (kelurahan, periode) terhadap centroid beku; -1 bila data kosong."""
+    flat = Y.reshape(-1, Y.shape[-1])
+    present = ~np.isnan(flat).any(axis=1)
+    labels = predict(frozen, pd.DataFrame(np.nan_to_num(flat), columns=frozen["features"]))
+    return np.where(present, labels, -1).reshape(Y.shape[:-1])
+
+
+def transition_matrices(labels, n_clusters):
+    """(periode - 1, dari, ke): jumlah kelurahan yang berpindah antar periode berurutan."""
+    src, dst = labels[:, :-1], labels[:, 1:]
+    valid = (src >= 0) & (dst >= 0)
+    step = np.broadcast_to(np.arange(src.shape[1]), src.shape)
+    flat = (step * n_clusters + src) * n_clusters + dst
+    counts = np.bincount(flat[valid], minlength=src.shape[1] * n_clusters * n_clusters)
+    return counts.reshape(src.shape[1], n_clusters, n_clusters)
+
+
+def _first_last(labels):
+    """Klaster pada periode pertama dan terakhir yang berdata untuk tiap kelurahan."""
+    present = labels >= 0
+    first = present.argmax(axis=1)
+    last = labels.shape[1] - 1 - present[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(labels))
+    has = present.any(axis=1)
+    return np.where(has, labels[rows, first], -1), np.where(has, labels[rows, last], -1)
+
+
+@traced("trajectory")
+def build_trajectory(cube, frozen):
+    features = frozen["features"]
+    Y = period_shares(cube, features)
+    t = period_time(cube.periods)
+    labels_period = cube.period_labels()
+    n_clusters = int(frozen["n_clusters"])
+    index = pd.Index(cube.kelurahan, name="bps_desa_kelurahan")
+
+    slope = slopes(Y, t)
+    cp = change_points(Y)
+    labels = assign_periods(frozen, Y)
+    first, last = _first_last(labels)
+
+    summary = pd.DataFrame(index=index)
+    for j, col in enumerate(features):
+        summary[f"{col}_tren"] = slope[:, j]
+    summary["klaster_awal"] = first
+    summary["klaster_akhir"] = last
+    summary["perubahan_klaster"] = np.where((first >= 0) & (last >= 0), last - first, 0)
+    for j, col in enumerate(features):
+        at = cp["index"][:, j]
+        summary[f"{col}_titik_ubah"] = np.where(at >= 0, np.asarray(labels_period, dtype=object)[at], None)
+        summary[f"{col}_sebelum"] = cp["before"][:, j]
+        summary[f"{col}_sesudah"] = cp["after"][:, j]
+        summary[f"{col}_kekuatan"] = cp["gain"][:, j]
+
+    # Klaster lebih besar = ketimpangan lebih tinggi; seri dipecah oleh tren rendah_pct
+    worse = summary.sort_values(
+        ["perubahan_klaster", "rendah_pct_tren"], ascending=[False, False]
+    )
+
+    clusters = range(n_clusters)
+    transitions = transition_matrices(labels, n_clusters)
+    both = (first >= 0) & (last >= 0)
+    overall = np.bincount(first[both] * n_clusters + last[both], minlength=n_clusters ** 2)
+
+    sizes = np.stack([(labels == c).sum(axis=0) for c in clusters], axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        size_share = sizes / sizes.sum(axis=1, keepdims=True)
+
+    return {
+        "features": features,
+        "periods": labels_period,
+        "shares": Y,
+        "labels": pd.DataFrame(labels, index=index, columns=labels_period),
+        "summary": summary,
+        "worse": worse,
+        "transitions": transitions,
+        "transition_first_last": pd.DataFrame(
+            overall.reshape(n_clusters, n_clusters),
+            index=pd.Index(clusters, name="dari"), columns=pd.Index(clusters, name="ke"),
+        ),
+        "cluster_share": size_share,
+    }
+
+
+def trajectory_version(frozen, raw_path=RAW_PATH):
+    """Versi data mentah + centroid beku, untuk cache hasil dan gambar lintasan."""
+    return make_key(
+        file_hash(raw_path), "trajectory", CUBE_VERSION, frozen["features"], MIN_SEGMENT, SSE_RTOL,
+        frozen["mean"].tobytes(), frozen["scale"].tobytes(), frozen["centroids"].tobytes(),
+    )
+
+
+def get_trajectory(frozen, raw_path=RAW_PATH):
+    """Analitik lintasan dihitung sekali per versi data mentah dan centroid beku."""
+    return _trajectory_cache.get_or_compute(
+        trajectory_version(frozen, raw_path), lambda: build_trajectory(get_cube(raw_path), frozen)
+    )
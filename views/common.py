@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import charts
+import figures
+from cache import file_hash
+from clustering import DATASET_PATH, FEATURES
+from ingest import RAW_PATH, outputs_missing, run_ingest
+from storage import read_columns
+from store import KEY_COLUMN, build_store
+from tracing import span
+
+# =====================
+# LOAD DATA
+# =====================
+# Fitur per kelurahan disimpan SEKALI per proses sebagai FeatureStore read-only
+# (st.cache_resource, bukan st.cache_data yang memberi salinan baru ke setiap
+# pemanggil). Halaman menerima DataFrame pembungkus tanpa salinan; hasil per
+# sesi seperti label klaster disimpan sebagai array terpisah.
+@st.cache_resource(show_spinner=False)
+def get_store(columns, version, path=DATASET_PATH):
+    df = read_columns(path, [KEY_COLUMN] + list(columns))
+    return build_store(df, columns, version)
+
+
+def load_data(columns=None, path=DATASET_PATH):
+    # Asumsi file 'dataset_final.csv' ada di direktori yang sama (df_eda.csv
+    # berisi data yang sama). Bila belum ada tetapi data mentah BPS tersedia,
+    # bangun dulu lewat tahap ingest.
+    if outputs_missing() and os.path.exists(RAW_PATH):
+        run_ingest()
+
+    columns = tuple(columns) if columns is not None else tuple(FEATURES)
+    try:
+        store = get_store(columns, file_hash(path), path)
+    except FileNotFoundError:
+        st.error("Pastikan file 'df_eda.csv' dan 'dataset_final.csv' tersedia.")
+        # Membuat dataframe dummy agar kode selanjutnya tidak error
+        df_dummy = pd.DataFrame({
+            "bps_desa_kelurahan": ["Kelurahan A", "Kelurahan B"], 
+            "rendah_pct": [0.3, 0.6], 
+            "menengah_pct": [0.4, 0.3], 
+            "tinggi_pct": [0.3, 0.1]
+        })
+        store = build_store(df_dummy, columns, "dummy")
+
+    return store.flat_frame(), store.frame()
+
+
+def show_figure(version, spec, draw, *args):
+    # Gambar diambil dari cache PNG; matplotlib hanya dipanggil saat cache miss
+    with span("figure", grafik=spec):
+        st.image(figures.cached_png(version, spec, draw, *args), use_column_width=True)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _scatter_payload(version, spec, mode, _x, _y, _c=None, _labels=None):
+    # Argumen berawalan "_" tidak di-hash: isi titik sudah ditentukan oleh
+    # (version, spec), jadi reduksi data cukup dihitung sekali per grafik
+    return charts.scatter_chart(_x, _y, _c, _labels, mode=mode)
+
+
+def show_scatter(version, spec, x, y, c=None, labels=None):
+    """Scatter rendah vs tinggi: PNG dari server, atau Vega-Lite yang digambar browser."""
+    n = len(x)
+    besar = n > charts.MAX_POINTS
+    interaktif = st.toggle(
+        "Grafik interaktif", value=besar, key=f"interaktif_{spec[0]}",
+        help="Titik digambar di browser (bisa di-zoom dan menampilkan nama kelurahan)."
+    )
+    mode = "sample"
+    if besar:
+        mode = st.radio(
+            "Reduksi titik", ["sample", "bin"], horizontal=True, key=f"reduksi_{spec[0]}",
+            format_func={"sample": "Sampling berstrata", "bin": "Agregasi grid"}.get,
+        )
+
+    if interaktif:
+        with span("chart", grafik=spec, mode=mode):
+            data, chart_spec, info = _scatter_payload(version, spec, mode, x, y, c, labels)
+            st.vega_lite_chart(data, chart_spec, use_container_width=True)
+    else:
+        # Grafik statis memakai titik hasil sampling yang sama bila data besar
+        if besar:
+            idx = charts.stratified_sample(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+            x, y = np.asarray(x)[idx], np.asarray(y)[idx]
+            c = np.asarray(c)[idx] if c is not None else None
+        show_figure(version, spec, figures.scatter, x, y, c)
+        info = {"n": n, "ditampilkan": len(x), "mode": "sampling berstrata"} if besar else {}
+
+    if info.get("mode") == "agregasi grid":
+        st.caption(f"{info['n']:,} titik diringkas menjadi {info['ditampilkan']:,} sel grid.")
+    elif "ditampilkan" in info:
+        st.caption(f"Menampilkan {info['ditampilkan']:,} dari {info['n']:,} titik ({info['mode']}).")
@@ -0,0 +1,113 @@
+import os
+
+import streamlit as st
+
+from ingest import ALLOW_UI_INGEST, RAW_PATH, run_ingest
+
+
+# =====================
+# DATA PREPARATION
+# =====================
+def render():
+    st.markdown(
+    "<h1 style='text-align: center;'>Data Preparation</h1>",
+    unsafe_allow_html=True
+)
+    # ... (Konten Data Preparation yang sudah Anda buat) ...
+    st.markdown("""
+    Tahap **Data Preparation** bertujuan untuk menjelaskan proses penyiapan data 
+    pendidikan penduduk Kota Bandung yang digunakan dalam analisis ketimpangan 
+    dan metode clustering.
+    """)
+
+    # =====================
+    # TUJUAN
+    # =====================
+    st.subheader("📌 Tujuan Data Preparation")
+    st.markdown("""
+    - Menyusun data pendidikan penduduk pada level **kelurahan**.
+    - Membentuk representasi kuantitatif untuk mengukur **ketimpangan pendidikan**.
+    - Menyiapkan dataset yang siap digunakan pada tahap **EDA** dan **K-Means Clustering**.
+    """)
+
+    # =====================
+    # SUMBER DATA
+    # =====================
+    st.subheader("🗂️ Sumber dan Cakupan Data")
+    st.markdown("""
+    - Data merupakan hasil agregasi penduduk berdasarkan **tingkat pendidikan**.
+    - Setiap observasi merepresentasikan **satu kelurahan di Kota Bandung**.
+    - Fokus analisis berada pada perbedaan struktur pendidikan antar kelurahan.
+    """)
+
+    # =====================
+    # VARIABEL
+    # =====================
+    st.subheader("📊 Variabel yang Digunakan")
+    st.markdown("""
+    Untuk menggambarkan struktur pendidikan penduduk, digunakan tiga variabel utama:
+    - **Pendidikan Rendah (`rendah_pct`)**: proporsi penduduk berpendidikan dasar.
+    - **Pendidikan Menengah (`menengah_pct`)**: proporsi penduduk berpendidikan menengah.
+    - **Pendidikan Tinggi (`tinggi_pct`)**: proporsi penduduk berpendidikan tinggi.
+
+    Ketiga variabel ini membentuk komposisi pendidikan tiap kelurahan.
+    """)
+
+    # =====================
+    # PENGOLAHAN DATA
+    # =====================
+    st.subheader("📖 Proses Pengolahan Data")
+    st.markdown("""
+    - Data pendidikan diringkas dalam bentuk **persentase** untuk setiap kelurahan (dari tahun 2017 hingga 2025).
+    - Agregasi dilakukan agar perbandingan antar wilayah dapat dilakukan secara adil.
+    - Dataset dipisahkan sesuai kebutuhan analisis, yaitu untuk:
+        - **Exploratory Data Analysis (EDA)**
+        - **Clustering menggunakan K-Means**
+    """)
+
+    # =====================
+    # OUTPUT
+    # =====================
+    st.subheader("🎯 Output Tahap Data Preparation")
+    st.markdown("""
+    Hasil dari tahap ini adalah dataset yang:
+    - Mewakili kondisi ketimpangan pendidikan antar kelurahan.
+    - Siap digunakan untuk analisis eksploratif dan pemodelan clustering.
+    - Menjadi dasar dalam proses pengambilan insight dan rekomendasi kebijakan.
+    """)
+
+    # =====================
+    # INGEST DATA MENTAH
+    # =====================
+    st.subheader("🔄 Bangun Ulang Dataset dari Data Mentah")
+    st.markdown("""
+    Data mentah BPS dibaca **per chunk**, nama jenjang pendidikan diseragamkan
+    (misalnya `TIDAK/BLM SEKOLAH` → `TIDAK/BELUM SEKOLAH`), lalu jumlah penduduk
+    diakumulasi per kelurahan sehingga penggunaan memori tetap kecil walaupun
+    file mentahnya sangat besar.
+    """)
+
+    if not os.path.exists(RAW_PATH):
+        st.warning(f"File data mentah '{RAW_PATH}' tidak ditemukan.")
+    elif not ALLOW_UI_INGEST:
+        st.caption(
+            "Ingest dijalankan oleh pengelola data lewat `python ingest.py` "
+            "(atau aktifkan tombol di sini dengan `TUBES_ALLOW_INGEST=1`)."
+        )
+    else:
+        if st.button("Jalankan Ingest"):
+            # views.common (pandas/pyarrow) hanya dimuat saat tombol ditekan
+            from views.common import get_store
+
+            with st.spinner("Memproses data mentah..."):
+                info = run_ingest()
+            get_store.clear()
+            st.success(
+                f"{info['rows']:,} baris diproses menjadi {info['kelurahan']} kelurahan "
+                f"dalam {info['seconds']:.2f} detik."
+            )
+            if not info["recomputed"]:
+                st.caption("Isi data mentah tidak berubah: jumlah per jenjang dan pivot diambil dari cache pipeline.")
+
+    st.markdown("---")
+    st.caption("Tahap selanjutnya akan membahas pola dan ketimpangan pendidikan melalui Exploratory Data Analysis (EDA).")
@@ -0,0 +1,258 @@
+import os
+
+import streamlit as st
+
+import figures
+from cache import file_hash
+from clustering import FEATURES, data_version
+from cube import get_cube
+from hierarchy import KOTA, get_hierarchy
+from inequality import INDEX_LABELS, INDICES, get_inequality
+from ingest import RAW_PATH
+from tracing import span
+from views.common import load_data, show_figure, show_scatter
+
+
+# =====================
+# EDA
+# =====================
+def render():
+    with span("load_data"):
+        df_eda, _ = load_data(tuple(FEATURES))
+    versi_eda = data_version(df_eda)
+
+    st.markdown(
+        """
+        <h1 style='text-align: center;'>Exploratory Data Analysis (EDA)</h1>
+        <p style='text-align: center; font-size: 18px;'>
+        Menggali pola dan ketimpangan pendidikan antar kelurahan
+        </p>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("""
+    Tahap **Exploratory Data Analysis (EDA)** bertujuan untuk memahami pola,
+    sebaran, dan hubungan antar tingkat pendidikan penduduk di setiap kelurahan
+    sebelum dilakukan proses clustering.
+    """)
+
+    st.info(
+        "Visualisasi berikut membantu mengidentifikasi kelurahan dengan tingkat "
+        "ketimpangan pendidikan yang ekstrem, pola sebaran struktur pendidikan, "
+        "serta hubungan antar tingkat pendidikan sebagai dasar pengelompokan."
+    )
+
+    # ==================================================
+    # LINE PLOT – EXTREME VALUES
+    # ==================================================
+    st.subheader("Kelurahan dengan Ketimpangan Pendidikan Paling Ekstrem")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("Top 10 kelurahan dengan proporsi pendidikan rendah tertinggi.")
+        show_figure(
+            versi_eda, ("top10_line", "rendah_pct"),
+            figures.top10_line, df_eda, "rendah_pct", "Proporsi Pendidikan Rendah"
+        )
+
+    with col2:
+        st.write("Top 10 kelurahan dengan proporsi pendidikan tinggi tertinggi.")
+        show_figure(
+            versi_eda, ("top10_line", "tinggi_pct"),
+            figures.top10_line, df_eda, "tinggi_pct", "Proporsi Pendidikan Tinggi"
+        )
+
+    with st.expander("🔍 Apa yang perlu diperhatikan dari grafik ini?"):
+        st.markdown("""
+        - Terdapat perbedaan ekstrem antar kelurahan dalam proporsi pendidikan rendah dan tinggi.
+        - Kelurahan dengan pendidikan rendah tinggi tidak selalu memiliki pendidikan tinggi yang besar.
+        - Hal ini mengindikasikan adanya ketimpangan struktural antar wilayah.
+        """)
+
+    # ==================================================
+    # BOXPLOT – DISTRIBUTION
+    # ==================================================
+    st.subheader("Seberapa Merata Struktur Pendidikan Antar Kelurahan?")
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.write("Sebaran pendidikan rendah dan tinggi antar kelurahan.")
+        show_figure(
+            versi_eda, ("boxplot", "rendah_tinggi"),
+            figures.boxplot, df_eda,
+            ["rendah_pct", "tinggi_pct"],
+            ["Pendidikan Rendah", "Pendidikan Tinggi"]
+        )
+
+    with col4:
+        st.write("Struktur pendidikan lengkap per kelurahan.")
+        show_figure(
+            versi_eda, ("boxplot", "semua"),
+            figures.boxplot, df_eda,
+            ["rendah_pct", "menengah_pct", "tinggi_pct"],
+            [
+                "Pendidikan Rendah",
+                "Pendidikan Menengah",
+                "Pendidikan Tinggi"
+            ]
+        )
+
+    with st.expander("🔍 Insight dari boxplot"):
+        st.markdown("""
+        - Sebaran nilai menunjukkan variasi yang cukup besar antar kelurahan.
+        - Pendidikan rendah memiliki rentang yang lebih lebar dibanding pendidikan tinggi.
+        - Pola ini menandakan ketimpangan pendidikan tidak terjadi secara merata.
+        """)
+
+    # ==================================================
+    # SCATTER & CORRELATION
+    # ==================================================
+    st.subheader("Hubungan Antar Tingkat Pendidikan")
+
+    st.markdown(
+        "**Grafik berikut menunjukkan hubungan langsung antara pendidikan rendah dan "
+        "pendidikan tinggi, yang menjadi dasar penting dalam proses clustering.**"
+    )
+
+    col5, col6 = st.columns(2)
+
+    with col5:
+        show_scatter(
+            versi_eda, ("scatter", "rendah_tinggi"),
+            df_eda["rendah_pct"], df_eda["tinggi_pct"],
+            labels=df_eda["bps_desa_kelurahan"]
+        )
+
+    with col6:
+        show_figure(
+            versi_eda, ("corr_heatmap",),
+            figures.corr_heatmap, df_eda, ["rendah_pct", "menengah_pct", "tinggi_pct"]
+        )
+
+    with st.expander("🔍 Interpretasi hubungan antar variabel"):
+        st.markdown("""
+        - Pendidikan rendah dan pendidikan tinggi menunjukkan hubungan negatif.
+        - Kelurahan dengan pendidikan rendah tinggi cenderung memiliki pendidikan tinggi yang rendah.
+        - Pola ini menunjukkan adanya kelompok kelurahan dengan karakteristik serupa.
+        """)
+
+    # ==================================================
+    # PERKEMBANGAN PER PERIODE (DATA CUBE)
+    # ==================================================
+    if os.path.exists(RAW_PATH):
+        st.subheader("Perkembangan Komposisi Pendidikan per Periode")
+
+        with span("get_cube"):
+            cube = get_cube()
+        kota = cube.shares(cube.rollup(cube.counts.sum(axis=0)))
+
+        col7, col8 = st.columns(2)
+
+        with col7:
+            st.write("Komposisi pendidikan Kota Bandung per semester (2017–2025).")
+            show_figure(
+                file_hash(RAW_PATH), ("period_lines", "kota"),
+                figures.period_lines, cube.period_labels(), kota,
+                ["Pendidikan Rendah", "Pendidikan Menengah", "Pendidikan Tinggi"]
+            )
+
+        with col8:
+            tahun_list = sorted({int(t) for t in cube.periods[:, 0]})
+            tahun = st.selectbox("Pilih Tahun", tahun_list, index=len(tahun_list) - 1)
+            st.write(f"Top 10 kelurahan dengan proporsi pendidikan rendah tertinggi ({tahun}).")
+            st.dataframe(
+                cube.pct_frame(tahun=tahun).sort_values("rendah_pct", ascending=False).head(10)
+            )
+
+        # ==================================================
+        # DRILL-DOWN KOTA -> KECAMATAN -> KELURAHAN
+        # ==================================================
+        st.subheader("Dari Kota ke Kecamatan ke Kelurahan")
+
+        with span("get_hierarchy"):
+            hierarchy = get_hierarchy()
+
+        st.write(f"Komposisi pendidikan {KOTA} (seluruh periode).")
+        st.dataframe(hierarchy.frame("kota"))
+
+        st.write("Komposisi pendidikan per kecamatan, diurutkan dari proporsi pendidikan rendah tertinggi.")
+        st.dataframe(hierarchy.drill_down("kota", KOTA).sort_values("rendah_pct", ascending=False))
+
+        kecamatan = st.selectbox("Pilih Kecamatan", hierarchy.children("kota", KOTA))
+        st.write(f"Kelurahan di Kecamatan {kecamatan}:")
+        st.dataframe(hierarchy.drill_down("kecamatan", kecamatan))
+
+        # ==================================================
+        # INDEKS KETIMPANGAN (GINI, THEIL, ENTROPI)
+        # ==================================================
+        st.subheader("Indeks Ketimpangan Pendidikan")
+
+        with span("get_inequality"):
+            inequality = get_inequality()
+
+        st.markdown("""
+        Setiap jenjang dipetakan ke lama sekolah (mis. SD = 6 tahun, SLTA = 12 tahun,
+        S1 = 16 tahun), lalu ketimpangan lama sekolah penduduk dihitung per wilayah dan
+        per semester. Nilai **Gini** dan **Theil** yang lebih besar berarti capaian
+        pendidikan penduduk lebih timpang; **entropi** mengukur seberapa tersebar
+        penduduk di sepuluh jenjang (0 = satu jenjang saja, 1 = merata).
+        """)
+
+        col9, col10 = st.columns(2)
+
+        with col9:
+            decomposition = inequality["decomposition"]
+            st.write("Theil T Kota Bandung: ketimpangan di dalam kecamatan vs antar kecamatan.")
+            show_figure(
+                file_hash(RAW_PATH), ("theil_decomposition",),
+                figures.period_lines, cube.period_labels(),
+                decomposition[["theil_t", "theil_t_within", "theil_t_between"]].to_numpy(),
+                ["Total", "Dalam kecamatan", "Antar kecamatan"], "Theil T"
+            )
+            total = inequality["decomposition_total"]
+            st.caption(
+                f"Seluruh periode: {total['theil_t_between'] / total['theil_t']:.1%} ketimpangan "
+                f"berasal dari perbedaan antar kecamatan, sisanya dari dalam kecamatan."
+            )
+
+        with col10:
+            indeks = st.selectbox("Pilih Indeks", INDICES[1:], format_func=INDEX_LABELS.get)
+            tingkat = st.radio("Tingkat", ["kelurahan", "kecamatan"], horizontal=True)
+            st.write(f"Peringkat {tingkat} dengan {INDEX_LABELS[indeks]} tertinggi (seluruh periode).")
+            st.dataframe(
+                inequality[tingkat + "_total"].sort_values(indeks, ascending=False).head(10)
+            )
+
+    # ==================================================
+    # KEY FINDINGS
+    # ==================================================
+    st.markdown("---")
+    st.markdown(
+        "Berdasarkan seluruh visualisasi di atas, berikut adalah temuan utama dari tahap EDA:"
+    )
+
+    st.markdown("""
+    ### Key Findings EDA
+    - Ketimpangan pendidikan antar kelurahan terlihat jelas dan tidak merata.
+    - Terdapat kelurahan dengan dominasi pendidikan rendah maupun pendidikan tinggi.
+    - Pendidikan rendah dan pendidikan tinggi memiliki hubungan negatif yang kuat.
+    - Pola ketimpangan ini menjadi dasar perlunya pengelompokan kelurahan menggunakan metode clustering (K-Means).
+    """)
+
+    st.markdown("""
+    ### Mengapa Perlu Clustering?
+    Meskipun EDA telah menunjukkan adanya ketimpangan pendidikan dan pola hubungan
+    antar tingkat pendidikan, visualisasi saja belum cukup untuk mengelompokkan
+    kelurahan secara objektif dan konsisten.
+    """)
+
+    st.success("""
+    Oleh karena itu, diperlukan metode **clustering** untuk mengelompokkan kelurahan
+    berdasarkan kemiripan struktur pendidikan. Metode **K-Means** digunakan untuk
+    mengidentifikasi kelompok kelurahan dengan karakteristik ketimpangan pendidikan
+    yang serupa, sehingga analisis dapat dilanjutkan ke tahap interpretasi dan
+    perumusan rekomendasi.
+    """)
+
+    st.caption("Tahap selanjutnya: pengelompokan kelurahan menggunakan metode K-Means Clustering.")
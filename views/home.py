@@ -0,0 +1,56 @@
+import streamlit as st
+
+
+# =====================
+# HOME
+# =====================
+def render():
+    # KONTEN HOME
+    st.markdown("""
+        <p style='text-align: center; font-size: 18px;'>
+        Pendekatan Data dan K-Means Clustering
+        </p>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    st.markdown("""
+    Pendidikan merupakan salah satu indikator penting dalam pembangunan wilayah.
+    Namun, tingkat pendidikan penduduk di Kota Bandung belum tersebar secara merata
+    antar kelurahan.
+    """)
+
+    st.markdown("""
+    Beberapa kelurahan memiliki akses pendidikan yang relatif baik hingga jenjang
+    tinggi, sementara kelurahan lainnya masih didominasi oleh pendidikan rendah.
+    Ketimpangan ini perlu dipahami agar kebijakan pendidikan dapat diarahkan
+    secara lebih tepat sasaran.
+    """)
+
+    st.markdown("""
+    Melalui pendekatan **analisis data** dan **K-Means Clustering**, studi ini
+    bertujuan untuk mengelompokkan kelurahan berdasarkan kemiripan struktur
+    pendidikan penduduk.
+    """)
+
+    st.success("""
+    🎯 **Tujuan Utama Analisis**  
+    Mengidentifikasi kelompok kelurahan dengan tingkat ketimpangan pendidikan
+    yang berbeda sebagai dasar perumusan rekomendasi pemerataan pendidikan.
+    """)
+
+    st.markdown("---")
+
+    st.subheader("🧭 Alur Analisis")
+    st.markdown("""
+    Analisis dilakukan melalui tahapan berikut:
+    - **Data Preparation**: penyiapan dan pembentukan data pendidikan per kelurahan.
+    - **EDA**: eksplorasi pola dan ketimpangan pendidikan antar wilayah.
+    - **Preprocessing**: penyamaan skala data sebelum clustering.
+    - **K-Means Clustering**: pengelompokan kelurahan dan interpretasi hasil.
+    """)
+
+    st.info(
+        "Gunakan menu navigasi di bagian atas halaman untuk mengikuti alur analisis "
+        "dari awal hingga akhir."
+    )
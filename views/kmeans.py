@@ -0,0 +1,514 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.preprocessing import StandardScaler
+
+import figures
+from cache import make_key
+from clustering import CLUSTER_INFO, FEATURES, data_version, get_frozen, predict, scaler_digest, transform
+from export import build_reports, get_job, start_export
+from hierarchy import assign_units, cluster_level, get_hierarchy
+from ingest import RAW_PATH
+from search import batch_lookup, get_index, parse_queries
+from stability import SAMPLE_FRAC, get_stability
+from sweep import get_sweep, summarize_sweep
+from tracing import span
+from trajectory import get_trajectory, trajectory_version
+from views import profiler
+from views.common import load_data, show_figure, show_scatter
+
+
+# =====================
+# CEK KLASTER (FRAGMENT)
+# =====================
+# Streamlit 1.36 baru menyediakan versi experimental
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@fragment
+def cek_klaster_panel(clusters, cukup_data, keyakinan=None):
+    # Rerun fragment tidak melewati app.py, sehingga direkam tersendiri
+    with profiler.recording("fragment:cek_klaster") as recorder:
+        _cek_klaster(clusters, cukup_data, keyakinan)
+    profiler.keep(recorder, "Cek Klaster (fragment)")
+
+
+def _cek_klaster(clusters, cukup_data, keyakinan=None):
+    index = get_index(clusters.index.tolist())
+
+    query = st.text_input(
+        "Cari kelurahan (nama, kode BPS / Kemendagri, atau kecamatan)",
+        placeholder="contoh: SUKA, 3273250002, COBLONG"
+    )
+    kelurahan_list = [k for k in index.search(query, limit=len(index.kelurahan)) if k in clusters.index]
+
+    if not kelurahan_list:
+        st.warning("Kelurahan tidak ditemukan.")
+        return
+
+    selected_kelurahan = st.selectbox(
+        "Pilih Kelurahan",
+        kelurahan_list
+    )
+
+    cek = st.button("Cek Klaster")
+
+    if cek and cukup_data:
+        cluster_id = clusters.loc[selected_kelurahan]
+
+        st.markdown(f"### Hasil untuk Kelurahan **{selected_kelurahan}**")
+        st.write(f"Masuk ke **Klaster {cluster_id}**")
+        if keyakinan is not None:
+            st.metric(
+                "Keyakinan penugasan", f"{keyakinan['confidence'].loc[selected_kelurahan]:.0%}",
+                help=f"Seberapa sering kelurahan ini tetap bersama anggota klasternya "
+                     f"di {keyakinan['n_replicates']} fit ulang K-Means (subsampel & seed acak)."
+            )
+
+        info = CLUSTER_INFO.get(int(cluster_id))
+        if info is not None:
+            st.markdown(f"""
+            **Karakteristik Klaster {cluster_id} ({info["nama"]})**  
+            {info["karakteristik"]}
+
+            **Rekomendasi:**  
+            {info["rekomendasi"]}
+            """)
+
+
+@fragment
+def cek_massal_panel(clusters):
+    with profiler.recording("fragment:cek_massal") as recorder:
+        _cek_massal(clusters)
+    profiler.keep(recorder, "Cek Massal (fragment)")
+
+
+def _cek_massal(clusters):
+    st.markdown("""
+    Tempel daftar nama / kode kelurahan (satu per baris, atau dipisah koma),
+    atau unggah file CSV/TXT yang kolom pertamanya berisi nama atau kode kelurahan.
+    """)
+
+    text = st.text_area("Daftar kelurahan", height=150)
+    uploaded = st.file_uploader("Unggah file", type=["csv", "txt"])
+
+    if st.button("Cek Semua"):
+        queries = parse_queries(text)
+        if uploaded is not None:
+            queries += pd.read_csv(uploaded, header=None, dtype=str).iloc[:, 0].dropna().tolist()
+
+        if not queries:
+            st.warning("Belum ada kelurahan yang dimasukkan.")
+            return
+
+        index = get_index(clusters.index.tolist())
+        result = batch_lookup(queries, clusters, index, CLUSTER_INFO)
+
+        n_missing = int(result["kelurahan"].isna().sum())
+        st.write(f"{len(result) - n_missing} dari {len(result)} kelurahan ditemukan.")
+        st.dataframe(result, hide_index=True)
+        st.download_button(
+            "Unduh Hasil (CSV)",
+            result.to_csv(index=False).encode("utf-8"),
+            file_name="hasil_cek_klaster.csv",
+            mime="text/csv"
+        )
+
+
+# =====================
+# EKSPOR LAPORAN (LATAR BELAKANG)
+# =====================
+@fragment(run_every=1)
+def export_progress():
+    # Hanya dipanggil selama ekspor berjalan; tiap detik membaca progres job
+    job = get_job()
+    st.progress(job.done / max(job.total, 1), text=f"{job.done} dari {job.total} laporan")
+    if not job.running:
+        st.rerun()
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def zip_bytes(path, mtime_ns):
+    """Isi ZIP laporan, dibaca sekali per versi file (mtime) dan dipakai bersama semua sesi."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def export_panel(dfp, clusters, keyakinan):
+    st.markdown("""
+    Buat laporan untuk **seluruh kelurahan** sekaligus: klaster, keyakinan penugasan,
+    komposisi pendidikan dibanding rata-rata klasternya, serta rekomendasi, dalam
+    bentuk CSV, HTML dan gambar. Proses berjalan di latar belakang sehingga halaman
+    tetap bisa digunakan, dan laporan yang datanya tidak berubah tidak dibuat ulang.
+    """)
+
+    job = get_job()
+    if st.button("Buat Laporan", disabled=job is not None and job.running):
+        confidence = None if keyakinan is None else keyakinan["confidence"]
+        job = start_export(build_reports(dfp, clusters, confidence))
+
+    if job is None:
+        return
+    if job.running:
+        export_progress()
+    elif job.status == "gagal":
+        st.error(f"Ekspor gagal: {job.error}")
+    else:
+        st.success(
+            f"{job.rendered} laporan dibuat, {job.skipped} tidak berubah "
+            f"({job.seconds:.1f} detik)."
+        )
+        st.download_button(
+            "Unduh Laporan (ZIP)", zip_bytes(job.zip_path, os.stat(job.zip_path).st_mtime_ns),
+            file_name="laporan_kelurahan.zip", mime="application/zip"
+        )
+
+
+# =====================
+# K-MEANS
+# =====================
+def render():
+    with span("load_data"):
+        _, dfp = load_data(tuple(FEATURES))
+
+    # ==================================================
+    # HEADER
+    # ==================================================
+    st.markdown(
+        """
+        <h1 style='text-align: center;'>K-Means Clustering</h1>
+        <p style='text-align: center; font-size: 18px;'>
+        Pengelompokan kelurahan berdasarkan tingkat ketimpangan pendidikan
+        </p>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("""
+    Halaman ini menyajikan hasil pengelompokan kelurahan di Kota Bandung 
+    berdasarkan komposisi tingkat pendidikan penduduk menggunakan metode 
+    **K-Means Clustering**.
+    """)
+
+    # ==================================================
+    # PREPARE DATA (BACKGROUND)
+    # ==================================================
+    X = dfp[FEATURES]
+
+    # Ensure n_clusters is not greater than number of samples
+    n_clusters_default = 3
+    if len(dfp) < n_clusters_default:
+        n_clusters_default = len(dfp)
+
+    # Centroid beku (frozen_model.json): kelurahan cukup ditugaskan ke centroid
+    # terdekat, tanpa fit ulang dan tanpa nomor klaster yang bergeser.
+    # Bila model beku belum ada (atau n_clusters berbeda), fit dibaca dari tahap
+    # "model" pipeline (clustering.get_model) dengan dfp sebagai tahap "dataset".
+    # Fit ulang dilakukan eksplisit lewat `python run_batch.py --refit`.
+    model = None
+    try:
+        with span("get_model", n_clusters=n_clusters_default):
+            model = get_frozen(X, data_version(dfp), n_clusters=n_clusters_default)
+        X_scaled = transform(model, X)
+        versi_scaler = scaler_digest(model["mean"], model["scale"])
+        labels = predict(model, X)
+    except ValueError:
+        scaler = StandardScaler().fit(X)
+        X_scaled = scaler.transform(X)
+        versi_scaler = scaler_digest(scaler.mean_, scaler.scale_)
+        st.error("Gagal menjalankan K-Means. Mungkin data terlalu sedikit.")
+        labels = np.zeros(len(dfp), dtype=np.int64) # Default cluster jika gagal
+
+    # Label klaster milik sesi ini: array terpisah sejajar baris dfp, karena
+    # dfp adalah view read-only atas data yang dipakai bersama semua sesi.
+    clusters = pd.Series(labels, index=dfp.index, name="cluster")
+
+    # Stabilitas tiap penugasan dari ratusan fit ulang (paralel, sekali per versi data)
+    keyakinan = None
+    if model is not None and len(dfp) > n_clusters_default:
+        with span("get_stability", n_clusters=n_clusters_default):
+            keyakinan = get_stability(
+                X_scaled, labels, dfp.index, data_version(dfp), versi_scaler, n_clusters_default
+            )
+
+    # ==================================================
+    # 1. CEK KLASTER KELURAHAN (HERO SECTION)
+    # ==================================================
+    st.markdown("---")
+    st.subheader("🎯 Cek Klaster Kelurahan")
+
+    st.markdown("""
+    Pilih nama kelurahan untuk mengetahui hasil pengelompokan, 
+    karakteristik klaster, serta rekomendasi berdasarkan kondisi 
+    ketimpangan pendidikan.
+    """)
+
+    # Panel pencarian dijalankan sebagai fragment: memilih kelurahan atau menekan
+    # "Cek Klaster" hanya menjalankan ulang panel ini, bukan seluruh halaman.
+    cek_klaster_panel(clusters, len(dfp) >= n_clusters_default, keyakinan)
+    if model is not None:
+        st.caption(f"Centroid klaster dibekukan sejak {model['fitted_at']}.")
+
+    if keyakinan is not None:
+        with st.expander("🎲 Stabilitas Klaster (Bootstrap)"):
+            st.markdown(f"""
+            K-Means di-fit ulang **{keyakinan['n_replicates']} kali**, masing-masing pada
+            {SAMPLE_FRAC:.0%} kelurahan yang diambil acak dengan seed berbeda. Keyakinan penugasan
+            adalah rata-rata seberapa sering sebuah kelurahan berada di klaster yang sama
+            dengan anggota lain klasternya.
+            """)
+            st.dataframe(keyakinan["per_cluster"].rename("rata-rata keyakinan").to_frame())
+            st.markdown("**Kelurahan dengan penugasan paling tidak stabil**")
+            st.dataframe(
+                pd.DataFrame({"cluster": clusters, "keyakinan": keyakinan["confidence"]})
+                .sort_values("keyakinan").head(10)
+            )
+
+    with st.expander("📋 Cek Banyak Kelurahan Sekaligus"):
+        cek_massal_panel(clusters)
+
+    with st.expander("📦 Ekspor Laporan Semua Kelurahan"):
+        export_panel(dfp, clusters, keyakinan)
+
+    # ==================================================
+    # 2. RINGKASAN KARAKTERISTIK KLASTER
+    # ==================================================
+    st.markdown("---")
+    st.subheader("📌 Ringkasan Karakteristik Klaster")
+
+    if len(dfp) >= n_clusters_default:
+        cluster_summary = dfp.groupby(clusters)[
+            ["rendah_pct", "menengah_pct", "tinggi_pct"]
+        ].mean()
+
+        st.dataframe(cluster_summary)
+
+        st.markdown("""
+        🟢 **Klaster 0 – Ketimpangan Pendidikan Rendah**
+
+        Klaster ini memiliki proporsi pendidikan rendah dan tinggi yang relatif seimbang, 
+        dengan pendidikan menengah sedikit lebih dominan. Struktur ini menunjukkan bahwa 
+        kelurahan dalam klaster 0 memiliki distribusi pendidikan yang lebih merata dan 
+        akses pendidikan yang relatif lebih baik.
+
+        ➡️ **Makna:**<br/>
+        Merepresentasikan kelurahan dengan tingkat ketimpangan pendidikan paling rendah.
+
+        `💡 Rekomendasi:`<br/>
+        Pertahankan kualitas pendidikan yang sudah relatif baik dengan fokus pada 
+        peningkatan mutu sekolah dan keberlanjutan akses ke pendidikan tinggi.
+
+        ___
+
+        🟡 **Klaster 1 – Ketimpangan Pendidikan Menengah**
+
+        Klaster ini didominasi oleh pendidikan menengah, sementara proporsi pendidikan 
+        tinggi relatif rendah. Pendidikan rendah masih cukup signifikan, namun tidak 
+        mendominasi sepenuhnya.
+
+        ➡️ **Makna:**<br/>
+        Menggambarkan kelurahan yang berada pada fase transisi, di mana sebagian besar 
+        penduduk telah mencapai pendidikan menengah tetapi belum banyak yang menempuh 
+        pendidikan tinggi.
+
+        `💡 Rekomendasi:`<br/>
+        Perlu didorong program lanjutan ke pendidikan tinggi dan vokasi agar lulusan 
+        pendidikan menengah tidak berhenti pada jenjang tersebut.
+
+        ___
+
+        🔴 **Klaster 2 – Ketimpangan Pendidikan Tinggi**
+
+        Klaster ini memiliki proporsi pendidikan rendah paling tinggi dan pendidikan tinggi 
+        paling rendah dibanding klaster lain. Hal ini menunjukkan keterbatasan akses dan 
+        capaian pendidikan lanjutan.
+
+        ➡️ **Makna:**<br/>
+        Merepresentasikan kelurahan dengan tingkat ketimpangan pendidikan paling tinggi 
+        dan menjadi wilayah prioritas dalam upaya pemerataan pendidikan.
+
+        `💡 Rekomendasi:`<br/>
+        Menjadi prioritas utama intervensi, terutama pada penguatan pendidikan dasar, 
+        pencegahan putus sekolah, dan peningkatan akses pendidikan menengah.
+        """, unsafe_allow_html=True)
+    else:
+        st.warning("Tidak dapat menampilkan ringkasan klaster karena data terlalu sedikit.")
+
+
+    # ==================================================
+    # 3. VISUALISASI HASIL CLUSTERING
+    # ==================================================
+    st.markdown("---")
+    st.subheader("📊 Visualisasi Hasil Clustering")
+
+    if len(dfp) >= n_clusters_default:
+        # Label bergantung pada isi model beku (scaler + centroid), bukan hanya
+        # versi data; waktu fit saja tidak berubah bila file model ditimpa isinya.
+        model_tag = make_key(versi_scaler, model["centroids"].tobytes()) if model is not None else versi_scaler
+        show_scatter(
+            data_version(dfp), ("cluster_scatter", n_clusters_default, model_tag),
+            dfp["rendah_pct"], dfp["tinggi_pct"], clusters.to_numpy(),
+            labels=dfp.index
+        )
+
+        st.markdown("""
+        Visualisasi ini menunjukkan pemisahan kelurahan berdasarkan proporsi
+        pendidikan rendah dan tinggi, dengan warna yang merepresentasikan klaster.
+        """)
+    else:
+        st.warning("Tidak dapat menampilkan visualisasi klaster karena data terlalu sedikit.")
+
+
+    # ==================================================
+    # 3b. KLASTER TINGKAT KECAMATAN (DRILL-DOWN)
+    # ==================================================
+    if os.path.exists(RAW_PATH):
+        st.markdown("---")
+        st.subheader("🏘️ Pengelompokan Tingkat Kecamatan")
+
+        with span("get_hierarchy"):
+            hierarchy = get_hierarchy()
+            kec_clusters = cluster_level(hierarchy, "kecamatan", n_clusters_default)
+
+        st.markdown("""
+        Jumlah penduduk per jenjang dijumlahkan ke tingkat kecamatan, lalu K-Means
+        yang sama dijalankan pada proporsi kecamatan. Pilih kecamatan untuk melihat
+        klaster masing-masing kelurahan di dalamnya.
+        """)
+
+        kec_table = hierarchy["kecamatan"].pct.join(kec_clusters)
+        kec_table["nama_klaster"] = kec_table["cluster"].map(
+            lambda c: CLUSTER_INFO.get(int(c), {}).get("nama", "")
+        )
+        st.dataframe(kec_table.sort_values(["cluster", "rendah_pct"]))
+
+        kecamatan = st.selectbox("Pilih Kecamatan", kec_table.index, key="kmeans_kecamatan")
+        anggota = hierarchy.drill_down("kecamatan", kecamatan)
+        if model is not None:
+            # Label anak bisa "NAMA (KECAMATAN)": klaster dicocokkan lewat kode unit
+            klaster_unit = assign_units(hierarchy, model)
+            anggota = anggota.assign(
+                cluster=klaster_unit.reindex(hierarchy.unit_key(anggota.index)).to_numpy()
+            )
+        st.dataframe(anggota)
+
+    # ==================================================
+    # 3c. LINTASAN KELURAHAN ANTAR SEMESTER
+    # ==================================================
+    if os.path.exists(RAW_PATH) and model is not None:
+        st.markdown("---")
+        st.subheader("📈 Lintasan Kelurahan Antar Semester")
+
+        with span("get_trajectory"):
+            lintasan = get_trajectory(model)
+        versi_lintasan = trajectory_version(model)
+        periode = lintasan["periods"]
+        nama_klaster = [CLUSTER_INFO.get(c, {}).get("nama", f"Klaster {c}") for c in range(model["n_clusters"])]
+
+        st.markdown(f"""
+        Setiap semester ({periode[0]} s.d. {periode[-1]}) ditugaskan ke centroid beku
+        yang sama, sehingga perpindahan klaster antar waktu dapat dibandingkan langsung.
+        Tren adalah kemiringan proporsi per tahun; titik perubahan adalah semester
+        tempat rata-rata proporsi bergeser paling jelas.
+        """)
+
+        show_figure(
+            versi_lintasan, ("period_lines", "ukuran_klaster"),
+            figures.period_lines, periode, lintasan["cluster_share"], nama_klaster, "Proporsi Kelurahan"
+        )
+
+        st.markdown(f"**Perpindahan klaster {periode[0]} → {periode[-1]}** (jumlah kelurahan)")
+        st.dataframe(
+            lintasan["transition_first_last"]
+            .rename(index=dict(enumerate(nama_klaster)), columns=dict(enumerate(nama_klaster)))
+        )
+
+        with st.expander("🔁 Matriks Transisi Antar Semester Berurutan"):
+            ke = st.selectbox("Transisi ke semester", periode[1:], key="kmeans_transisi")
+            step = periode.index(ke) - 1
+            st.dataframe(pd.DataFrame(
+                lintasan["transitions"][step],
+                index=pd.Index(nama_klaster, name=periode[step]),
+                columns=pd.Index(nama_klaster, name=ke),
+            ))
+
+        st.markdown("**Kelurahan yang paling memburuk**")
+        st.caption("Diurutkan menurut kenaikan nomor klaster, lalu tren proporsi pendidikan rendah.")
+        memburuk = lintasan["worse"]
+        st.dataframe(memburuk[
+            ["klaster_awal", "klaster_akhir", "rendah_pct_tren", "tinggi_pct_tren",
+             "rendah_pct_titik_ubah", "rendah_pct_sebelum", "rendah_pct_sesudah"]
+        ].head(10))
+
+        kelurahan = st.selectbox("Lintasan kelurahan", memburuk.index, key="kmeans_lintasan")
+        i = lintasan["labels"].index.get_loc(kelurahan)
+        show_figure(
+            versi_lintasan, ("period_lines", "kelurahan", kelurahan),
+            figures.period_lines, periode, lintasan["shares"][i],
+            ["Pendidikan Rendah", "Pendidikan Menengah", "Pendidikan Tinggi"]
+        )
+        ringkas = memburuk.loc[kelurahan]
+        if ringkas["rendah_pct_titik_ubah"] is not None:
+            st.caption(
+                f"Pendidikan rendah bergeser mulai {ringkas['rendah_pct_titik_ubah']}: "
+                f"{ringkas['rendah_pct_sebelum']:.1%} → {ringkas['rendah_pct_sesudah']:.1%}."
+            )
+        st.dataframe(lintasan["labels"].loc[[kelurahan]])
+
+    # ==================================================
+    # 4. METODOLOGI (SUPPORTING SECTION)
+    # ==================================================
+    st.markdown("---")
+    st.subheader("⚙️ Metodologi K-Means (Elbow Method)")
+
+    if len(dfp) >= 8: # Minimal 8 data untuk range 2-7 cluster
+        k_limit = min(15, len(dfp) - 1)
+        col_k, col_seed = st.columns(2)
+        with col_k:
+            k_min, k_max = st.slider("Rentang jumlah klaster (k)", 2, k_limit, (2, 7))
+        with col_seed:
+            n_seeds = st.slider("Jumlah seed per k", 1, 5, 1)
+
+        # Tiap (k, seed) di-fit paralel sekali per versi data + scaler, lalu dibaca dari cache
+        seeds = [42 + i for i in range(n_seeds)]
+        with span("get_sweep", k_min=k_min, k_max=k_max, n_seeds=n_seeds):
+            sweep_table = get_sweep(X_scaled, data_version(dfp), versi_scaler, range(k_min, k_max + 1), seeds)
+        sweep_summary = summarize_sweep(sweep_table)
+        K = sweep_summary.index
+
+        sweep_spec = (versi_scaler, k_min, k_max, n_seeds)
+        show_figure(
+            data_version(dfp), ("elbow",) + sweep_spec,
+            figures.metric_line, K, sweep_summary[("inertia", "mean")], "Inertia"
+        )
+
+        st.markdown("""
+        Elbow Method digunakan untuk menentukan jumlah klaster optimal.
+        Berdasarkan grafik, jumlah klaster **k = 3** dipilih karena memberikan
+        keseimbangan antara kompleksitas model dan interpretabilitas hasil.
+        """)
+
+        col_sil, col_db = st.columns(2)
+
+        with col_sil:
+            st.write("Silhouette Score (semakin tinggi semakin baik).")
+            show_figure(
+                data_version(dfp), ("silhouette",) + sweep_spec,
+                figures.metric_line, K, sweep_summary[("silhouette", "mean")],
+                "Silhouette", sweep_summary[("silhouette", "std")]
+            )
+
+        with col_db:
+            st.write("Davies–Bouldin Index (semakin rendah semakin baik).")
+            show_figure(
+                data_version(dfp), ("davies_bouldin",) + sweep_spec,
+                figures.metric_line, K, sweep_summary[("davies_bouldin", "mean")],
+                "Davies–Bouldin", sweep_summary[("davies_bouldin", "std")]
+            )
+
+        with st.expander("📋 Tabel metrik per k dan seed"):
+            st.dataframe(sweep_table, hide_index=True)
+    else:
+        st.warning("Tidak dapat menampilkan Elbow Method karena data terlalu sedikit.")
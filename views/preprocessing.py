@@ -0,0 +1,139 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from clustering import FEATURES, data_version
+from ingest import RAW_PATH
+from stats import get_feature_stats, outlier_rows, period_stats
+from tracing import span
+from views.common import load_data
+
+
+# =====================
+# PREPROCESSING
+# =====================
+def render():
+    with span("load_data"):
+        _, dfp = load_data(tuple(FEATURES))
+
+    st.markdown(
+        """
+        <h1 style='text-align: center;'>Preprocessing Data</h1>
+        <p style='text-align: center; font-size: 18px;'>
+        Menyamakan skala data sebelum proses clustering
+        </p>
+        """,
+        unsafe_allow_html=True
+    )
+
+    st.markdown("""
+    Sebelum dilakukan pengelompokan kelurahan menggunakan K-Means, 
+    data perlu melalui tahap **preprocessing** agar perbandingan antar 
+    kelurahan dilakukan secara adil dan seimbang.
+    """)
+
+    # ==================================================
+    # WHY PREPROCESSING
+    # ==================================================
+    st.subheader("⚖️ Mengapa Preprocessing Diperlukan?")
+    st.markdown("""
+    - Setiap variabel pendidikan memiliki rentang nilai yang berbeda.
+    - Tanpa preprocessing, variabel tertentu dapat mendominasi hasil clustering.
+    - Preprocessing membantu memastikan setiap indikator memiliki kontribusi yang setara.
+    """)
+
+    # ==================================================
+    # FEATURE OVERVIEW
+    # ==================================================
+    st.subheader("📊 Variabel yang Digunakan")
+    st.dataframe(
+        dfp[["rendah_pct", "menengah_pct", "tinggi_pct"]].head()
+    )
+
+    st.markdown("""
+    Ketiga variabel di atas digunakan untuk merepresentasikan struktur pendidikan
+    pada masing-masing kelurahan.
+    """)
+
+    # Mean, varians, kuartil & outlier seluruh kelurahan dalam satu lintasan
+    # (statistik yang sama juga menjadi parameter scaler K-Means)
+    with span("feature_stats"):
+        stats = get_feature_stats(dfp, data_version(dfp), FEATURES)
+
+    # ==================================================
+    # FEATURE STATISTICS
+    # ==================================================
+    st.subheader("📈 Statistik Variabel")
+    st.dataframe(stats.summary().drop(columns=["batas_bawah", "batas_atas", "outlier"]))
+
+    # ==================================================
+    # INTERACTIVE EXAMPLE
+    # ==================================================
+    st.subheader("🔍 Ilustrasi Dampak Preprocessing")
+
+    sample = dfp[["rendah_pct", "menengah_pct", "tinggi_pct"]].head()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Nilai Asli (Sebelum Preprocessing)**")
+        st.dataframe(sample)
+
+    # Standardisasi memakai mean & standar deviasi SELURUH kelurahan, sama
+    # seperti yang dipakai model K-Means (bukan hanya 5 baris contoh)
+    scaler = stats.to_scaler()
+    sample_scaled = pd.DataFrame(
+        scaler.transform(sample),
+        columns=sample.columns,
+        index=sample.index
+    )
+
+    with col2:
+        st.markdown("**Nilai Setelah Preprocessing (Standardisasi)**")
+        st.dataframe(sample_scaled)
+
+    st.markdown("""
+    Perbandingan ini menunjukkan bahwa preprocessing menyamakan skala antar variabel,
+    sehingga setiap indikator pendidikan memiliki kontribusi yang seimbang
+    dalam proses clustering.
+    """)
+
+    # ==================================================
+    # OUTLIER (IQR)
+    # ==================================================
+    st.subheader("🚨 Pemeriksaan Outlier (IQR)")
+
+    st.markdown("""
+    Nilai di luar rentang **Q1 − 1.5 × IQR** hingga **Q3 + 1.5 × IQR** dianggap outlier.
+    Outlier tidak dihapus, karena kelurahan ekstrem justru merupakan bagian dari
+    ketimpangan yang ingin diidentifikasi.
+    """)
+
+    st.dataframe(stats.summary()[["q1", "q3", "batas_bawah", "batas_atas", "outlier"]])
+
+    with st.expander("📋 Kelurahan dengan nilai outlier"):
+        st.dataframe(outlier_rows(dfp, stats))
+
+    if os.path.exists(RAW_PATH):
+        with span("period_stats"):
+            semester_stats = period_stats(FEATURES, RAW_PATH)
+
+        with st.expander("🗓️ Statistik seluruh kelurahan-semester"):
+            st.markdown("""
+            Statistik di bawah menggabungkan setiap pasangan kelurahan–semester.
+            Statistik tiap semester disimpan terpisah, sehingga semester baru cukup
+            dihitung sekali lalu digabungkan tanpa memindai ulang seluruh riwayat.
+            """)
+            st.dataframe(semester_stats.summary())
+
+
+    # ==================================================
+    # TAKEAWAY
+    # ==================================================
+    st.subheader("🧠 Inti Tahap Preprocessing")
+    st.markdown("""
+    - Preprocessing tidak mengubah pola dasar data.
+    - Tujuannya adalah menyamakan skala agar hasil clustering lebih stabil.
+    - Tahap ini menjadi fondasi penting sebelum proses K-Means Clustering.
+    """)
@@ -0,0 +1,83 @@
+import contextlib
+
+import streamlit as st
+
+import tracing
+
+# =====================
+# PANEL PROFIL RERUN (OPT-IN)
+# =====================
+# Diaktifkan per sesi lewat toggle di sidebar (atau untuk semua sesi dengan
+# TUBES_TRACE=1). Selama tidak aktif, tidak ada perekam sehingga semua
+# tracing.span() di halaman menjadi no-op. Toggle hanya mengukur waktu span
+# sesi itu sendiri; opsi memori (tracemalloc, berlaku untuk seluruh proses)
+# baru muncul bila server dijalankan dengan TUBES_TRACE_MEMORY=1.
+MAX_RUNS = 10
+
+
+def enabled():
+    return tracing.TRACE_ALL or st.session_state.get("trace_on", False)
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx is not None else None
+    except ImportError:
+        return None
+
+
+def recording(name, **attrs):
+    """Perekam untuk satu rerun / fragment; nullcontext bila profil tidak aktif."""
+    if not enabled():
+        return contextlib.nullcontext()
+    return tracing.recording(
+        name,
+        session=_session_id(),
+        memory=tracing.TRACE_MEMORY and st.session_state.get("trace_memory", False),
+        **attrs
+    )
+
+
+def sidebar_toggle():
+    st.sidebar.toggle("⏱️ Profil rerun", key="trace_on")
+    if st.session_state.get("trace_on") and tracing.TRACE_MEMORY:
+        st.sidebar.checkbox("Ukur memori (lebih lambat)", key="trace_memory")
+
+
+def keep(recorder, label):
+    """Menyimpan rincian span satu rerun / fragment di session state untuk panel."""
+    if recorder is None or tracing.active() is not None:
+        return
+    runs = st.session_state.setdefault("trace_runs", [])
+    runs.append((label, recorder.breakdown()))
+    del runs[:-MAX_RUNS]
+
+
+def render_panel():
+    if not enabled():
+        return
+    runs = st.session_state.get("trace_runs", [])
+    if not runs:
+        return
+
+    with st.sidebar.expander("⏱️ Rincian rerun", expanded=True):
+        labels = [f"{i + 1}. {label}" for i, (label, _) in enumerate(runs)]
+        pilihan = st.selectbox("Rerun", labels, index=len(labels) - 1, key="trace_pick")
+        _, records = runs[labels.index(pilihan)]
+
+        rows = []
+        for r in records:
+            row = {
+                "span": "  " * r["depth"] + r["span"],
+                "ms": r["ms"],
+                "cpu ms": r["cpu_ms"],
+                "info": ", ".join(f"{k}={v}" for k, v in r.get("attrs", {}).items()),
+            }
+            if "peak_mb" in r:
+                row["puncak MB"] = r["peak_mb"]
+            rows.append(row)
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        st.caption(f"Trace lengkap (satu baris per span): `{tracing.TRACE_FILE}`")
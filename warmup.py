@@ -0,0 +1,231 @@
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from cache import BASE_DIR, CACHE_DIR
+
+# =====================
+# PEMANASAN CACHE SAAT SERVER START
+# =====================
+# Setiap halaman dirender sekali di thread latar belakang TANPA sesi
+# (mode "bare" Streamlit: elemen tidak dikirim ke mana pun, widget bernilai
+# default). Karena yang dijalankan adalah kode halaman itu sendiri, semua
+# cache yang disentuh pengunjung pertama ikut terisi dengan kunci yang persis
+# sama: feature store (cache_resource), model K-Means, sweep elbow, stabilitas,
+# cube/hierarki/indeks ketimpangan/lintasan (DiskCache) dan PNG grafik (FigureCache).
+# Isi fragment (Cek Klaster, pencarian massal) tidak dijalankan pada mode bare,
+# sehingga indeks pencarian dibangun eksplisit (PAGE_EXTRAS).
+#
+# Single-flight: tiap halaman punya Event yang di-set setelah pemanasannya
+# selesai. Sesi yang membuka halaman yang sedang/akan dipanaskan menunggu
+# Event itu (paling lama SESSION_WAIT_S) lalu membaca cache, alih-alih
+# menghitung hal yang sama bersamaan dengan thread pemanasan.
+#
+#   streamlit run app.py             # dimulai saat sesi pertama masuk
+#   python warmup.py --serve         # dimulai saat proses server start
+#   python warmup.py                 # pra-deploy: isi cache disk lalu keluar
+#   python warmup.py --check         # readiness probe: kode 0 bila sudah siap
+#
+# Status dan waktu tiap halaman ditulis ke STATUS_PATH.
+PAGE_MODULES = [
+    "views.home",
+    "views.data_preparation",
+    "views.eda",
+    "views.preprocessing",
+    "views.kmeans",
+]
+STATUS_PATH = os.path.join(CACHE_DIR, "warmup.json")
+THREAD_NAME = "cache-warmup"
+RUNTIME_WAIT_S = 30
+SESSION_WAIT_S = float(os.environ.get("TUBES_WARMUP_WAIT_S", "120"))
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def _search_index():
+    # Argumen sama dengan pemanggilan di fragment Cek Klaster (views/kmeans.py)
+    from clustering import FEATURES
+    from search import get_index
+    from views.common import load_data
+
+    _, dfp = load_data(tuple(FEATURES))
+    get_index(dfp.index.tolist())
+
+
+# Langkah tambahan yang dijalankan setelah render halaman, sebelum Event-nya di-set
+PAGE_EXTRAS = {
+    "views.kmeans": [_search_index],
+}
+
+
+class _HideBareWarnings(logging.Filter):
+    # Setiap perintah st.* di thread tanpa sesi memicu peringatan
+    # "missing ScriptRunContext"; untuk thread pemanasan itu memang disengaja
+    def filter(self, record):
+        return record.threadName != THREAD_NAME
+
+
+class WarmUp(threading.Thread):
+    """Merender tiap halaman sekali; `status()` melaporkan progres dan waktu per halaman."""
+
+    def __init__(self, pages=PAGE_MODULES, status_path=STATUS_PATH, wait_for_runtime=False):
+        super().__init__(name=THREAD_NAME, daemon=True)
+        self.pages = list(pages)
+        self.status_path = status_path
+        self.wait_for_runtime = wait_for_runtime
+        self.state = "menunggu"
+        self.timings = {}
+        self.errors = {}
+        self.started_at = None
+        self.seconds = None
+        self.done = {module: threading.Event() for module in self.pages}
+
+    @property
+    def ready(self):
+        return self.state == "siap"
+
+    def wait(self, module, timeout=SESSION_WAIT_S):
+        """Menunggu pemanasan halaman `module` selesai; True bila selesai sebelum timeout."""
+        event = self.done.get(module)
+        return event is None or event.wait(timeout)
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "state": self.state,
+            "ready": self.ready,
+            "done": len(self.timings),
+            "total": len(self.pages),
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "timings": dict(self.timings),
+            "errors": dict(self.errors),
+        }
+
+    def run(self):
+        logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").addFilter(_HideBareWarnings())
+        if self.wait_for_runtime:
+            self._wait_for_runtime()
+
+        self.state = "berjalan"
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._write()
+        start = time.perf_counter()
+        for module in self.pages:
+            page_start = time.perf_counter()
+            try:
+                importlib.import_module(module).render()
+                for extra in PAGE_EXTRAS.get(module, []):
+                    extra()
+            except Exception as e:  # halaman gagal tidak boleh menghentikan pemanasan halaman lain
+                self.errors[module] = f"{type(e).__name__}: {e}"
+            finally:
+                self.done[module].set()
+            self.timings[module] = round(time.perf_counter() - page_start, 3)
+            self._write()
+
+        self.seconds = round(time.perf_counter() - start, 3)
+        # Tetap "siap" walau ada halaman gagal: halaman itu akan dihitung oleh sesi pertama
+        self.state = "siap"
+        self._write()
+
+    def _wait_for_runtime(self):
+        # Pada --serve thread dimulai sebelum Runtime Streamlit dibuat; tunggu agar
+        # st.cache_* memakai penyimpanan milik server, bukan penyimpanan sementara
+        from streamlit import runtime
+
+        deadline = time.monotonic() + RUNTIME_WAIT_S
+        while not runtime.exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def _write(self):
+        try:
+            os.makedirs(os.path.dirname(self.status_path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.status_path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp, self.status_path)
+        except OSError:
+            pass  # status file hanya pelengkap; status di memori tetap berlaku
+
+
+def ensure_started(wait_for_runtime=False):
+    """Memulai pemanasan sekali per proses (panggilan berikutnya mengembalikan thread yang sama)."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None and os.environ.get("TUBES_WARMUP", "1") != "0":
+            _warmup = WarmUp(wait_for_runtime=wait_for_runtime)
+            _warmup.start()
+        return _warmup
+
+
+def status():
+    return None if _warmup is None else _warmup.status()
+
+
+def page_ready(module):
+    """True bila halaman tidak perlu menunggu (sudah dipanaskan atau pemanasan nonaktif)."""
+    return _warmup is None or module not in _warmup.done or _warmup.done[module].is_set()
+
+
+def wait(module, timeout=SESSION_WAIT_S):
+    """Sesi menunggu pemanasan halaman `module`; setelah timeout sesi menghitung sendiri."""
+    return _warmup is None or _warmup.wait(module, timeout)
+
+
+def check(path=STATUS_PATH):
+    """Readiness dari file status: siap DAN proses penulisnya masih hidup."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        os.kill(data["pid"], 0)
+    except (OSError, ValueError, KeyError):
+        return False
+    return bool(data.get("ready"))
+
+
+def _print_report(report):
+    for module, seconds in report["timings"].items():
+        error = report["errors"].get(module)
+        print(f"{module:<24} {seconds:>8.2f} s" + (f"  GAGAL: {error}" if error else ""))
+    print(f"{'total':<24} {report['seconds']:>8.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pemanasan cache dashboard")
+    parser.add_argument("--check", action="store_true", help="keluar 0 bila server sudah siap")
+    parser.add_argument("--serve", action="store_true",
+                        help="jalankan server Streamlit dan panaskan cache sejak proses start")
+    args, streamlit_args = parser.parse_known_args()
+
+    if args.check:
+        sys.exit(0 if check() else 1)
+
+    sys.path.insert(0, BASE_DIR)
+    os.chdir(BASE_DIR)
+
+    if args.serve:
+        from streamlit.web import cli
+
+        # Lewat nama modul "warmup" (bukan __main__) agar app.py melihat thread yang sama
+        import warmup
+
+        warmup.ensure_started(wait_for_runtime=True)
+        sys.argv = ["streamlit", "run", os.path.join(BASE_DIR, "app.py")] + streamlit_args
+        sys.exit(cli.main())
+
+    # Pra-deploy: langsung di thread ini; yang bertahan setelah keluar hanya cache disk
+    job = WarmUp()
+    job.run()
+    _print_report(job.status())
+
+
+if __name__ == "__main__":
+    main()